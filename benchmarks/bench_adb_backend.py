@@ -0,0 +1,71 @@
+"""
+[ADB Backend Benchmark]
+Compares ADBHelper.execute_adb_command on the native socket backend against the
+subprocess (`adb` binary) path. Both talk to a local FakeADBServer, so no device
+is needed and the numbers isolate per-call client overhead.
+
+Run from the project root:
+    python -m benchmarks.bench_adb_backend --iterations 200
+"""
+import argparse
+import os
+import shutil
+import statistics
+import time
+from typing import Callable, List
+
+from config.global_config import GlobalConfig
+from mocks.fake_adb_server import FakeADBServer
+from utils.adb_helper import ADBHelper
+
+DEVICE = "emulator-5554"
+PACKAGES = b"".join(b"package:com.example.app%d\n" % i for i in range(300))
+
+
+def _measure(func: Callable[[], object], iterations: int) -> List[float]:
+    func()  # warm-up
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _report(name: str, samples: List[float]):
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{name:<22} mean {statistics.mean(samples):8.3f} ms | "
+          f"p50 {statistics.median(samples):8.3f} ms | p95 {p95:8.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    with FakeADBServer(devices=[DEVICE], shell={"pm list packages": PACKAGES}) as server:
+        # Both paths must reach the fake server, never a real one on 5037
+        os.environ["ANDROID_ADB_SERVER_PORT"] = str(server.port)
+        GlobalConfig.ADB_SERVER_PORT = server.port
+        ADBHelper._client = None
+
+        def call():
+            return ADBHelper.is_app_installed("com.example.app42", DEVICE)
+
+        GlobalConfig.ADB_BACKEND = "socket"
+        assert call(), "socket backend returned unexpected output"
+        socket_samples = _measure(call, args.iterations)
+        _report("socket backend", socket_samples)
+
+        if shutil.which("adb") is None:
+            print("subprocess backend     skipped (adb binary not on PATH)")
+            return
+        GlobalConfig.ADB_BACKEND = "subprocess"
+        subprocess_samples = _measure(call, args.iterations)
+        _report("subprocess backend", subprocess_samples)
+        print(f"speed-up (p50)         {statistics.median(subprocess_samples) / statistics.median(socket_samples):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
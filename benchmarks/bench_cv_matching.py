@@ -0,0 +1,87 @@
+"""
+[Template Matching Benchmark]
+Compares CVHelper.find_image_center in exhaustive mode against pyramid
+(coarse-to-fine) mode and ROI-restricted search, on synthetic screens at common
+device resolutions. Reports time per lookup and whether the match position agrees.
+
+Run from the project root:
+    python -m benchmarks.bench_cv_matching --iterations 20
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from typing import Callable, List, Tuple
+
+import cv2
+import numpy as np
+
+from utils.cv_helper import CVHelper
+
+RESOLUTIONS = [(720, 1600), (1080, 2400), (1440, 3200)]
+
+
+def make_screen(width: int, height: int, seed: int = 7) -> np.ndarray:
+    """Synthetic UI-like screen: flat panels, text-ish noise and a few icons."""
+    rng = np.random.default_rng(seed)
+    screen = np.full((height, width, 3), 235, np.uint8)
+    for _ in range(40):
+        x, y = int(rng.integers(0, width - 200)), int(rng.integers(0, height - 120))
+        color = tuple(int(c) for c in rng.integers(0, 255, 3))
+        cv2.rectangle(screen, (x, y), (x + int(rng.integers(60, 200)), y + int(rng.integers(30, 120))), color, -1)
+    for _ in range(120):
+        x, y = int(rng.integers(0, width - 100)), int(rng.integers(20, height))
+        cv2.putText(screen, "Lorem ipsum", (x, y), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (40, 40, 40), 2)
+    return screen
+
+
+def draw_icon(screen: np.ndarray, x: int, y: int, size: int):
+    cv2.rectangle(screen, (x, y), (x + size, y + size), (30, 120, 220), -1)
+    cv2.circle(screen, (x + size // 2, y + size // 2), size // 3, (250, 250, 250), -1)
+    cv2.line(screen, (x + size // 4, y + size // 2), (x + 3 * size // 4, y + size // 2), (20, 20, 20), max(size // 12, 2))
+    cv2.line(screen, (x + size // 2, y + size // 4), (x + size // 2, y + 3 * size // 4), (20, 20, 20), max(size // 12, 2))
+
+
+def _time(func: Callable[[], object], iterations: int) -> Tuple[float, object]:
+    result = func()
+    samples: List[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'resolution':<12}{'mode':<12}{'p50 ms':>10}{'position':>16}{'agrees':>8}")
+        for width, height in RESOLUTIONS:
+            screen = make_screen(width, height)
+            # Template: a distinctive 10%-wide icon in the lower third, matched against a noisy copy
+            tw, th = width // 10, width // 10
+            tx, ty = width // 3, int(height * 0.7)
+            draw_icon(screen, tx, ty, tw)
+            template_path = os.path.join(tmp, f"icon_{width}.png")
+            cv2.imwrite(template_path, screen[ty:ty + th, tx:tx + tw])
+            noisy = cv2.add(screen, np.random.default_rng(1).integers(0, 6, screen.shape, dtype=np.uint8))
+            expected = (tx + tw // 2, ty + th // 2)
+
+            modes = {
+                "exhaustive": lambda: CVHelper.find_image_center(template_path, noisy, pyramid=False),
+                "pyramid": lambda: CVHelper.find_image_center(template_path, noisy, pyramid=True),
+                "roi": lambda: CVHelper.find_image_center(template_path, noisy, pyramid=False, roi=(0, 0.6, 1, 1)),
+                "pyramid+roi": lambda: CVHelper.find_image_center(template_path, noisy, pyramid=True, roi=(0, 0.6, 1, 1)),
+            }
+            for name, func in modes.items():
+                p50, coords = _time(func, args.iterations)
+                agrees = coords is not None and abs(coords[0] - expected[0]) <= 1 and abs(coords[1] - expected[1]) <= 1
+                print(f"{width}x{height:<7}{name:<12}{p50:>10.1f}{str(coords):>16}{str(agrees):>8}")
+
+
+if __name__ == "__main__":
+    main()
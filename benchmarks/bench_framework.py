@@ -0,0 +1,122 @@
+"""
+[Framework Overhead Benchmark]
+Runs BasePage/ActionMixin operations against a local FakeAppiumServer and compares
+each with the bare Selenium calls that send the same commands. The difference is
+what the framework itself (waits, decorators, tracing, logging, metrics) adds per
+operation, independent of device latency. Logs go to a temporary directory.
+
+Run from the project root:
+    python -m benchmarks.bench_framework --iterations 200
+    python -m benchmarks.bench_framework --latency-ms 5   # add a fixed server delay per command
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple
+
+from appium.options.android import UiAutomator2Options
+from appium.webdriver.common.appiumby import AppiumBy
+from selenium.webdriver import ActionChains
+
+from drivers.driver_factory import DriverFactory
+from mocks.fake_appium_server import FakeAppiumServer
+from pages.base_page import BasePage
+from utils.logger import logger, setup_logger
+
+USER = (AppiumBy.ID, "com.example.app:id/username")
+LOGIN = (AppiumBy.ID, "com.example.app:id/login_button")
+TITLE = (AppiumBy.ID, "com.example.app:id/title")
+
+SCREENS = {
+    "login": [
+        {"id": USER[1], "class": "android.widget.EditText"},
+        {"id": "com.example.app:id/password", "class": "android.widget.EditText"},
+        {"id": LOGIN[1], "text": "Login", "class": "android.widget.Button", "goto": "login"},
+        {"id": TITLE[1], "text": "Welcome"},
+    ] + [{"id": f"com.example.app:id/item_{i}", "text": f"Item {i}"} for i in range(30)],
+}
+
+
+def _measure(func: Callable[[], object], iterations: int) -> List[float]:
+    func()  # warm-up
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _raw_tap(driver, x: int, y: int):
+    actions = ActionChains(driver)
+    actions.w3c_actions.pointer_action.move_to_location(x, y)
+    actions.w3c_actions.pointer_action.pointer_down()
+    actions.w3c_actions.pointer_action.pause(0.1)
+    actions.w3c_actions.pointer_action.release()
+    actions.perform()
+
+
+def operations(driver, page: BasePage) -> List[Tuple[str, Callable[[], object], Callable[[], object]]]:
+    """(name, framework call, bare Selenium call sending the same commands)."""
+    def raw_click():
+        element = driver.find_element(*LOGIN)
+        element.is_displayed()
+        element.is_enabled()
+        element.click()
+
+    def raw_input():
+        element = driver.find_element(*USER)
+        element.clear()
+        element.send_keys("test_user_01")
+
+    return [
+        ("find_element", lambda: page.find_element(TITLE), lambda: driver.find_element(*TITLE)),
+        ("click_element", lambda: page.click_element(LOGIN), raw_click),
+        ("input_text", lambda: page.input_text(USER, "test_user_01"), raw_input),
+        ("get_text", lambda: page.get_text(TITLE), lambda: driver.find_element(*TITLE).text),
+        ("tap_coordinates", lambda: page.tap_coordinates(540, 1200), lambda: _raw_tap(driver, 540, 1200)),
+        ("read_many", lambda: page.read_many([USER, LOGIN, TITLE], refresh=True), lambda: driver.page_source),
+    ]
+
+
+def run(iterations: int = 200, latency_ms: float = 0.0) -> Dict[str, Dict[str, float]]:
+    """Returns {operation: {framework_ms, raw_ms, overhead_ms}} with p50 timings."""
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        setup_logger(os.path.join(tmp, "run.log"), os.path.join(tmp, "error.log"), console=False, mode="sync")
+        try:
+            with FakeAppiumServer(SCREENS, latency=latency_ms / 1000) as server:
+                options = UiAutomator2Options()
+                options.platform_name = "Android"
+                driver = DriverFactory.create_session(server.url, options)
+                try:
+                    page = BasePage(driver)
+                    for name, framework_call, raw_call in operations(driver, page):
+                        framework = statistics.median(_measure(framework_call, iterations))
+                        raw = statistics.median(_measure(raw_call, iterations))
+                        results[name] = {"framework_ms": framework, "raw_ms": raw, "overhead_ms": framework - raw}
+                finally:
+                    driver.quit()
+        finally:
+            # Release the temporary sinks before the directory goes away
+            logger.remove()
+            setup_logger()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    results = run(args.iterations, args.latency_ms)
+    print(f"{'operation':<18}{'framework ms':>14}{'raw ms':>10}{'overhead ms':>13}")
+    for name, row in results.items():
+        print(f"{name:<18}{row['framework_ms']:>14.3f}{row['raw_ms']:>10.3f}{row['overhead_ms']:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
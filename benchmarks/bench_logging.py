@@ -0,0 +1,97 @@
+"""
+[Logging Overhead Benchmark]
+Per-call cost of the log statements on the BasePage/ActionMixin hot paths
+(click_element, input_text, swipe_percentage), as seen by the calling thread:
+
+- before: eager f-strings, synchronous sinks (the previous setup)
+- lazy:   loguru "{}" arguments, formatted only if some sink accepts the level
+- async:  lazy arguments plus LOG_MODE=async (background writer thread)
+
+Scenarios: runtime file sink at DEBUG; at INFO (DEBUG filtered out); and at DEBUG
+plus a console that blocks for --console-latency-us per write, like a slow CI
+log collector. Sinks write to a temporary directory. "drain ms" is the time the
+background writer then needs to flush what was queued.
+
+Run from the project root:
+    python -m benchmarks.bench_logging --iterations 5000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from appium.webdriver.common.appiumby import AppiumBy
+
+from utils.logger import flush_logs, logger, setup_logger
+
+LOCATOR = (AppiumBy.ID, "com.example.app:id/login_button")
+TEXT = "test_user_01"
+COORDS = (540, 1920, 540, 480)
+
+
+def hot_path_eager():
+    x1, y1, x2, y2 = COORDS
+    logger.info(f"Clicking element: {LOCATOR}")
+    logger.info(f"Inputting text '{TEXT}' into {LOCATOR}")
+    logger.debug(f"Swiping from ({x1}, {y1}) to ({x2}, {y2})")
+
+
+def hot_path_lazy():
+    x1, y1, x2, y2 = COORDS
+    logger.info("Clicking element: {}", LOCATOR)
+    logger.info("Inputting text '{}' into {}", TEXT, LOCATOR)
+    logger.debug("Swiping from ({}, {}) to ({}, {})", x1, y1, x2, y2)
+
+
+def _run(func, iterations: int):
+    func()  # warm-up (opens files)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = time.perf_counter() - start
+    drain_start = time.perf_counter()
+    flush_logs()
+    drain = time.perf_counter() - drain_start
+    # Three statements per hot-path call
+    return elapsed / (iterations * 3) * 1e6, drain * 1000
+
+
+class SlowConsole:
+    """Console stand-in whose writes block like a congested terminal or log pipe."""
+
+    def __init__(self, latency_us: float):
+        self.latency = latency_us / 1e6
+
+    def write(self, message):
+        time.sleep(self.latency)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--console-latency-us", type=float, default=200)
+    args = parser.parse_args()
+
+    modes = [("before", hot_path_eager, "sync"), ("lazy", hot_path_lazy, "sync"), ("async", hot_path_lazy, "async")]
+    scenarios = [("file DEBUG", "DEBUG", None), ("file INFO", "INFO", None),
+                 ("slow console", "DEBUG", SlowConsole(args.console_latency_us))]
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for scenario, file_level, console in scenarios:
+            for name, func, mode in modes:
+                run_log = os.path.join(tmp, f"run_{name}_{file_level}.log")
+                setup_logger(run_log, os.path.join(tmp, "error.log"), console=console is not None,
+                             console_sink=console, file_level=file_level, mode=mode)
+                per_call_us, drain_ms = _run(func, args.iterations)
+                results.append((scenario, name, per_call_us, drain_ms))
+        # Stops the last background writer before the temp directory goes away
+        setup_logger(os.path.join(tmp, "run.log"), os.path.join(tmp, "error.log"), console=False, mode="sync")
+        logger.remove()
+
+    print(f"{'scenario':<14}{'mode':<10}{'us/call':>10}{'drain ms':>10}")
+    for scenario, name, per_call_us, drain_ms in results:
+        print(f"{scenario:<14}{name:<10}{per_call_us:>10.2f}{drain_ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
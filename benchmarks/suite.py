@@ -0,0 +1,438 @@
+"""
+[Benchmark Suite]
+Runs the framework's hot-path benchmarks with one timing method and stores the
+results as JSON, so a run can be kept as a baseline and later runs compared to it.
+
+Covered: CVHelper.find_image_center / bytes_to_cv2 at several resolutions,
+data_loader on large YAML/CSV/XLSX files (parse, binary cache, in-process cache),
+ADBHelper output parsing (pure and over a FakeADBServer), logger hot-path
+statements, and BasePage/ActionMixin operations against a FakeAppiumServer.
+
+Run from the project root:
+    python -m benchmarks.suite list
+    python -m benchmarks.suite run -o benchmarks/baselines/ci.json           # record a baseline
+    python -m benchmarks.suite run -k cv. --baseline benchmarks/baselines/ci.json --threshold 0.15
+    python -m benchmarks.suite compare benchmarks/baselines/ci.json reports/benchmarks/latest.json
+
+`run --baseline` and `compare` exit with status 1 if any benchmark's median got
+slower than the baseline by more than the threshold (and by more than --min-delta-ms,
+which keeps sub-microsecond noise from failing the gate). Baselines are only
+comparable on the same machine class; record them where the gate runs.
+"""
+import argparse
+import csv
+import datetime
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+
+import cv2
+import numpy as np
+import yaml
+
+from config.global_config import GlobalConfig
+
+FORMAT_VERSION = 1
+DEFAULT_OUTPUT = os.path.join("reports", "benchmarks", "latest.json")
+
+# A case is a context manager factory: setup, yield the callable to time, teardown
+CaseFactory = Callable[[str], Iterator[Callable[[], object]]]
+
+
+class Case(NamedTuple):
+    name: str
+    factory: CaseFactory
+    iterations: int
+
+
+CASES: List[Case] = []
+
+
+def benchmark(name: str, iterations: int = 20):
+    """Registers a case; the decorated generator receives a scratch directory."""
+    def decorator(func):
+        CASES.append(Case(name, contextmanager(func), iterations))
+        return func
+    return decorator
+
+
+# --- CV ---
+_RESOLUTIONS = [(720, 1600), (1080, 2400), (1440, 3200)]
+
+
+def _cv_screen(tmp: str, width: int, height: int):
+    from benchmarks.bench_cv_matching import draw_icon, make_screen
+    screen = make_screen(width, height)
+    size = width // 10
+    x, y = width // 3, int(height * 0.7)
+    draw_icon(screen, x, y, size)
+    template_path = os.path.join(tmp, f"icon_{width}.png")
+    cv2.imwrite(template_path, screen[y:y + size, x:x + size])
+    noisy = cv2.add(screen, np.random.default_rng(1).integers(0, 6, screen.shape, dtype=np.uint8))
+    return template_path, noisy
+
+
+def _register_cv(width: int, height: int):
+    resolution = f"{width}x{height}"
+
+    @benchmark(f"cv.find_image_center.{resolution}", iterations=10)
+    def find_center(tmp):
+        from utils.cv_helper import CVHelper
+        template_path, screen = _cv_screen(tmp, width, height)
+        png = cv2.imencode(".png", screen)[1].tobytes()
+        yield lambda: CVHelper.find_image_center(template_path, png)
+
+    @benchmark(f"cv.find_image_center_pyramid.{resolution}", iterations=10)
+    def find_center_pyramid(tmp):
+        from utils.cv_helper import CVHelper
+        template_path, screen = _cv_screen(tmp, width, height)
+        yield lambda: CVHelper.find_image_center(template_path, screen, pyramid=True)
+
+    @benchmark(f"cv.bytes_to_cv2.{resolution}", iterations=20)
+    def decode(tmp):
+        from benchmarks.bench_cv_matching import make_screen
+        from utils.cv_helper import CVHelper
+        png = cv2.imencode(".png", make_screen(width, height))[1].tobytes()
+        yield lambda: CVHelper.bytes_to_cv2(png)
+
+
+for _width, _height in _RESOLUTIONS:
+    _register_cv(_width, _height)
+
+
+# --- Data files ---
+_ROWS = 5000
+
+
+def _rows(count: int) -> List[Dict[str, Any]]:
+    return [{"case_id": f"TC_{i:05d}", "username": f"user_{i}", "password": f"pw_{i}",
+             "amount": i * 1.5, "enabled": i % 2 == 0, "note": "Lorem ipsum dolor sit amet"}
+            for i in range(count)]
+
+
+def _write_data_file(tmp: str, kind: str) -> str:
+    rows = _rows(_ROWS)
+    if kind == "yaml":
+        path = os.path.join(tmp, "large.yaml")
+        with open(path, "w", encoding="utf-8") as f:
+            yaml.safe_dump({"cases": rows}, f, allow_unicode=True, sort_keys=False)
+    elif kind == "csv":
+        path = os.path.join(tmp, "large.csv")
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        import openpyxl
+        path = os.path.join(tmp, "large.xlsx")
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.append(list(rows[0]))
+        for row in rows:
+            sheet.append(list(row.values()))
+        workbook.save(path)
+    return path
+
+
+@contextmanager
+def _isolated_data_cache(tmp: str):
+    """Points the binary data cache at the scratch directory."""
+    from utils import data_loader
+    previous = GlobalConfig.CACHE_DIR, GlobalConfig.DATA_CACHE_ENABLED
+    GlobalConfig.CACHE_DIR = Path(tmp) / "cache"
+    GlobalConfig.DATA_CACHE_ENABLED = True
+    data_loader.clear_cache()
+    try:
+        yield
+    finally:
+        data_loader.clear_cache()
+        GlobalConfig.CACHE_DIR, GlobalConfig.DATA_CACHE_ENABLED = previous
+
+
+def _register_data(kind: str, loader_name: str, iterations: int):
+    @benchmark(f"data.{kind}.parse", iterations=iterations)
+    def parse(tmp):
+        from utils import data_loader
+        path = _write_data_file(tmp, kind)
+        yield lambda: data_loader.PARSERS[kind](path, None)
+
+    @benchmark(f"data.{kind}.binary_cache", iterations=iterations)
+    def binary_cache(tmp):
+        from utils import data_loader
+        path = _write_data_file(tmp, kind)
+        load = getattr(data_loader, loader_name)
+        with _isolated_data_cache(tmp):
+            load(path)  # writes the binary entry
+
+            def cold_process():
+                data_loader.clear_cache()  # drop the in-process cache, as in a new worker
+                return load(path)
+            yield cold_process
+
+    @benchmark(f"data.{kind}.warm", iterations=50)
+    def warm(tmp):
+        from utils import data_loader
+        path = _write_data_file(tmp, kind)
+        load = getattr(data_loader, loader_name)
+        with _isolated_data_cache(tmp):
+            yield lambda: load(path)
+
+
+_register_data("yaml", "load_yaml", 5)
+_register_data("csv", "load_csv", 10)
+_register_data("excel", "load_excel", 3)
+
+
+# --- ADB ---
+_DEVICES_OUTPUT = "List of devices attached\n" + "".join(
+    f"emulator-{5554 + 2 * i}\t{'device' if i % 5 else 'offline'}\n" for i in range(64))
+_IME_OUTPUT = "".join(
+    f"com.example.ime{i}/.Service:\n  mId=com.example.ime{i}/.Service mSettingsActivityName=null\n"
+    f"  mIsDefaultResId=0x0\n  Service:\n    priority=0 preferredOrder=0\n" for i in range(40))
+
+
+@benchmark("adb.parse_devices", iterations=50)
+def adb_parse_devices(tmp):
+    from utils.adb_helper import ADBHelper
+    yield lambda: ADBHelper.parse_devices(_DEVICES_OUTPUT)
+
+
+@benchmark("adb.parse_ime_list", iterations=50)
+def adb_parse_ime_list(tmp):
+    from utils.adb_helper import ADBHelper
+    yield lambda: ADBHelper.parse_ime_list(_IME_OUTPUT)
+
+
+@benchmark("adb.is_app_installed.socket", iterations=50)
+def adb_is_app_installed(tmp):
+    from benchmarks.bench_adb_backend import DEVICE, PACKAGES
+    from mocks.fake_adb_server import FakeADBServer
+    from utils.adb_helper import ADBHelper
+    previous = GlobalConfig.ADB_SERVER_PORT, GlobalConfig.ADB_BACKEND
+    with FakeADBServer(devices=[DEVICE], shell={"pm list packages": PACKAGES}) as server:
+        GlobalConfig.ADB_SERVER_PORT, GlobalConfig.ADB_BACKEND = server.port, "socket"
+        ADBHelper._client = None
+        try:
+            yield lambda: ADBHelper.is_app_installed("com.example.app42", DEVICE)
+        finally:
+            GlobalConfig.ADB_SERVER_PORT, GlobalConfig.ADB_BACKEND = previous
+            ADBHelper._client = None
+
+
+# --- Logging ---
+@contextmanager
+def _temporary_logs(tmp: str, file_level: str = "DEBUG"):
+    from utils.logger import logger, setup_logger
+    setup_logger(os.path.join(tmp, "run.log"), os.path.join(tmp, "error.log"), console=False,
+                 file_level=file_level, mode="sync")
+    try:
+        yield
+    finally:
+        logger.remove()
+        setup_logger()
+
+
+@benchmark("logging.hot_path.file_debug", iterations=50)
+def logging_hot_path(tmp):
+    from benchmarks.bench_logging import hot_path_lazy
+    with _temporary_logs(tmp):
+        yield hot_path_lazy
+
+
+@benchmark("logging.hot_path.filtered", iterations=50)
+def logging_hot_path_filtered(tmp):
+    from benchmarks.bench_logging import hot_path_lazy
+    with _temporary_logs(tmp, file_level="INFO"):
+        yield hot_path_lazy
+
+
+# --- Page operations ---
+def _register_page(index: int, name: str):
+    @benchmark(f"page.{name}", iterations=30)
+    def page_operation(tmp):
+        from appium.options.android import UiAutomator2Options
+        from benchmarks.bench_framework import SCREENS, operations
+        from drivers.driver_factory import DriverFactory
+        from mocks.fake_appium_server import FakeAppiumServer
+        from pages.base_page import BasePage
+        with _temporary_logs(tmp), FakeAppiumServer(SCREENS) as server:
+            options = UiAutomator2Options()
+            options.platform_name = "Android"
+            driver = DriverFactory.create_session(server.url, options)
+            try:
+                yield operations(driver, BasePage(driver))[index][1]
+            finally:
+                driver.quit()
+
+
+for _index, _name in enumerate(["find_element", "click_element", "input_text", "get_text",
+                                "tap_coordinates", "read_many"]):
+    _register_page(_index, _name)
+
+
+# --- Timing ---
+def measure(func: Callable[[], object], iterations: int, min_sample_ms: float = 2.0) -> Dict[str, Any]:
+    """
+    Times `iterations` samples after a warm-up call. Fast functions are batched so
+    each sample lasts at least `min_sample_ms` (timer resolution and loop overhead
+    then stay negligible); results are per call.
+    """
+    start = time.perf_counter()
+    func()
+    single_ms = (time.perf_counter() - start) * 1000
+    number = max(1, int(min_sample_ms / single_ms)) if single_ms > 0 else 1000
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) * 1000 / number)
+    return {
+        "median_ms": statistics.median(samples),
+        "min_ms": min(samples),
+        "mean_ms": statistics.mean(samples),
+        "stdev_ms": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "iterations": iterations,
+        "batch": number,
+    }
+
+
+def select(patterns: Optional[List[str]]) -> List[Case]:
+    """Substring or glob match on case names; no pattern selects everything."""
+    if not patterns:
+        return list(CASES)
+    return [case for case in CASES
+            if any(p in case.name or fnmatch.fnmatchcase(case.name, p) for p in patterns)]
+
+
+def run(cases: List[Case], iterations: Optional[int] = None, verbose: bool = True) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    for case in cases:
+        with tempfile.TemporaryDirectory() as tmp:
+            with case.factory(tmp) as func:
+                results[case.name] = measure(func, iterations or case.iterations)
+        if verbose:
+            row = results[case.name]
+            print(f"{case.name:<44}{row['median_ms']:>12.4f} ms  (min {row['min_ms']:.4f}, "
+                  f"stdev {row['stdev_ms']:.4f}, n={row['iterations']}x{row['batch']})", flush=True)
+    return {"version": FORMAT_VERSION, "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "machine": machine_info(), "results": results}
+
+
+def machine_info() -> Dict[str, Any]:
+    return {"python": platform.python_version(), "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(), "cpus": os.cpu_count(),
+            "opencv": cv2.__version__, "numpy": np.__version__}
+
+
+# --- Baselines ---
+def save(report: Dict[str, Any], path: str):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        report = json.load(f)
+    if report.get("version") != FORMAT_VERSION:
+        raise SystemExit(f"{path}: unsupported benchmark file version {report.get('version')}")
+    return report
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.15,
+            min_delta_ms: float = 0.005) -> List[Dict[str, Any]]:
+    """
+    [Regression Gate]
+    Compares medians of the benchmarks present in both reports. A row regresses if it
+    is slower by more than `threshold` (0.15 = 15%) and by more than `min_delta_ms`.
+    """
+    rows = []
+    for name, row in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            rows.append({"name": name, "baseline_ms": None, "current_ms": row["median_ms"],
+                         "change": None, "status": "new"})
+            continue
+        base_ms, current_ms = base["median_ms"], row["median_ms"]
+        change = (current_ms - base_ms) / base_ms if base_ms else 0.0
+        if change > threshold and current_ms - base_ms > min_delta_ms:
+            status = "REGRESSED"
+        elif change < -threshold and base_ms - current_ms > min_delta_ms:
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append({"name": name, "baseline_ms": base_ms, "current_ms": current_ms,
+                     "change": change, "status": status})
+    return rows
+
+
+def print_comparison(rows: List[Dict[str, Any]], baseline: Dict[str, Any], current: Dict[str, Any]) -> int:
+    """Prints the table and returns the number of regressions."""
+    if baseline.get("machine") != current.get("machine"):
+        print("warning: baseline was recorded on a different machine/toolchain; differences may not be code changes")
+    print(f"{'benchmark':<44}{'baseline ms':>13}{'current ms':>13}{'change':>9}  status")
+    for row in rows:
+        base = f"{row['baseline_ms']:.4f}" if row["baseline_ms"] is not None else "-"
+        change = f"{row['change']:+.1%}" if row["change"] is not None else "-"
+        print(f"{row['name']:<44}{base:>13}{row['current_ms']:>13.4f}{change:>9}  {row['status']}")
+    regressions = sum(row["status"] == "REGRESSED" for row in rows)
+    print(f"{len(rows)} compared, {regressions} regressed, "
+          f"{sum(row['status'] == 'improved' for row in rows)} improved")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = sub.add_parser("list", help="List benchmark names")
+    list_parser.add_argument("-k", dest="patterns", action="append", help="Substring or glob filter (repeatable)")
+
+    run_parser = sub.add_parser("run", help="Run benchmarks and write a JSON report")
+    run_parser.add_argument("-k", dest="patterns", action="append", help="Substring or glob filter (repeatable)")
+    run_parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT)
+    run_parser.add_argument("--iterations", type=int, help="Override every case's sample count")
+    run_parser.add_argument("--baseline", help="Compare against this report after running")
+
+    compare_parser = sub.add_parser("compare", help="Compare a report against a baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current", nargs="?", default=DEFAULT_OUTPUT)
+
+    for p in (run_parser, compare_parser):
+        p.add_argument("--threshold", type=float, default=0.15, help="Allowed slowdown ratio (default 0.15)")
+        p.add_argument("--min-delta-ms", type=float, default=0.005, help="Ignore absolute changes below this")
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        for case in select(args.patterns):
+            print(case.name)
+        return 0
+
+    if args.command == "run":
+        cases = select(args.patterns)
+        if not cases:
+            raise SystemExit(f"No benchmarks match {args.patterns}")
+        current = run(cases, args.iterations)
+        save(current, args.output)
+        print(f"Results written to {args.output}")
+        if not args.baseline:
+            return 0
+        baseline = load(args.baseline)
+    else:
+        baseline, current = load(args.baseline), load(args.current)
+
+    rows = compare(baseline, current, args.threshold, args.min_delta_ms)
+    return 1 if print_comparison(rows, baseline, current) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
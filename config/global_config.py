@@ -8,6 +8,8 @@ load_dotenv()
 class GlobalConfig:
     # Project Root
     PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+    # Project-local cache (learned stats, compiled data); safe to delete
+    CACHE_DIR = PROJECT_ROOT / ".cache"
 
     # Appium Config
     APPIUM_HOST = os.getenv("APPIUM_HOST", "127.0.0.1")
@@ -24,10 +26,80 @@ class GlobalConfig:
     APP_ACTIVITY = os.getenv("APP_ACTIVITY", "")
     APP_PATH = os.getenv("APP_PATH", "")
 
+    # ADB Config
+    # ADB_BACKEND: "socket" talks to the adb server directly, "subprocess" spawns the adb binary
+    ADB_BACKEND = os.getenv("ADB_BACKEND", "socket").lower()
+    ADB_SERVER_HOST = os.getenv("ADB_SERVER_HOST", "127.0.0.1")
+    ADB_SERVER_PORT = int(os.getenv("ADB_SERVER_PORT", os.getenv("ANDROID_ADB_SERVER_PORT", 5037)))
+
+    # Computer Vision Config
+    # CAPTURE_BACKEND: "appium" (PNG screenshot) or "adb" (raw exec-out screencap)
+    CAPTURE_BACKEND = os.getenv("CAPTURE_BACKEND", "appium").lower()
+    TEMPLATE_CACHE_MAX_MB = int(os.getenv("TEMPLATE_CACHE_MAX_MB", 256))
+    TEMPLATE_PRELOAD = os.getenv("TEMPLATE_PRELOAD", "false").lower() == "true"
+    # Threads for batch template matching (0 = min(8, CPU count))
+    CV_MATCH_WORKERS = int(os.getenv("CV_MATCH_WORKERS", 0))
+    # Coarse-to-fine template matching (downscaled grayscale search, full-res refinement)
+    CV_PYRAMID = os.getenv("CV_PYRAMID", "false").lower() == "true"
+    CV_PYRAMID_SCALE = float(os.getenv("CV_PYRAMID_SCALE", 0.25))
+    CV_PYRAMID_MIN_TEMPLATE = int(os.getenv("CV_PYRAMID_MIN_TEMPLATE", 12))
+    CV_PYRAMID_CANDIDATES = int(os.getenv("CV_PYRAMID_CANDIDATES", 3))
+    CV_PYRAMID_MARGIN = float(os.getenv("CV_PYRAMID_MARGIN", 0.15))
+    # Perceptual-hash screen identification (reference screenshots: <dir>/<screen_name>/*.png)
+    SCREEN_INDEX_DIR = os.getenv("SCREEN_INDEX_DIR", str(PROJECT_ROOT / "data" / "screens"))
+    SCREEN_INDEX_MAX_DISTANCE = int(os.getenv("SCREEN_INDEX_MAX_DISTANCE", 10))
+
     # Wait Config
     IMPLICIT_WAIT = int(os.getenv("IMPLICIT_WAIT", 10))
     EXPLICIT_WAIT = int(os.getenv("EXPLICIT_WAIT", 20))
 
+    # Data Config: compiled binary cache of parsed data files under CACHE_DIR/data
+    DATA_CACHE_ENABLED = os.getenv("DATA_CACHE_ENABLED", "true").lower() == "true"
+
+    # Adaptive Wait Config (timeouts/poll intervals learned from recorded latencies)
+    ADAPTIVE_WAIT = os.getenv("ADAPTIVE_WAIT", "false").lower() == "true"
+    ADAPTIVE_WAIT_MIN_SAMPLES = int(os.getenv("ADAPTIVE_WAIT_MIN_SAMPLES", 5))
+    ADAPTIVE_WAIT_SAFETY_FACTOR = float(os.getenv("ADAPTIVE_WAIT_SAFETY_FACTOR", 2.0))
+    ADAPTIVE_WAIT_MIN_TIMEOUT = float(os.getenv("ADAPTIVE_WAIT_MIN_TIMEOUT", 2.0))
+    # Consecutive misses at the learned timeout before it is doubled per further miss
+    ADAPTIVE_WAIT_MISS_STREAK = int(os.getenv("ADAPTIVE_WAIT_MISS_STREAK", 3))
+
+    # Command Metrics: per-command WebDriver latency/payload histograms (per test and per run)
+    COMMAND_METRICS_ENABLED = os.getenv("COMMAND_METRICS_ENABLED", "true").lower() == "true"
+
+    # Timeline Tracing: nested spans per test, written to reports/traces (Chrome trace format on export)
+    TRACE_ENABLED = os.getenv("TRACE_ENABLED", "false").lower() == "true"
+    TRACE_BUFFER_SIZE = int(os.getenv("TRACE_BUFFER_SIZE", 200000))
+
+    # Retry / Circuit Breaker: per device, fail fast after N consecutive outages until the cooldown ends
+    CIRCUIT_BREAKER_THRESHOLD = int(os.getenv("CIRCUIT_BREAKER_THRESHOLD", 5))
+    CIRCUIT_BREAKER_COOLDOWN = float(os.getenv("CIRCUIT_BREAKER_COOLDOWN", 30))
+    SESSION_START_ATTEMPTS = int(os.getenv("SESSION_START_ATTEMPTS", 2))
+
+    # Notifications: webhook (Lark/DingTalk) delivered by a background dispatcher
+    WEBHOOK_URL = os.getenv("WEBHOOK_URL", "")
+    NOTIFY_ASYNC = os.getenv("NOTIFY_ASYNC", "true").lower() == "true"
+    NOTIFY_PROGRESS_EVERY = int(os.getenv("NOTIFY_PROGRESS_EVERY", 0))
+    NOTIFY_MIN_INTERVAL = float(os.getenv("NOTIFY_MIN_INTERVAL", 2.0))
+    NOTIFY_QUEUE_SIZE = int(os.getenv("NOTIFY_QUEUE_SIZE", 100))
+    NOTIFY_TIMEOUT = float(os.getenv("NOTIFY_TIMEOUT", 5.0))
+    NOTIFY_MAX_ATTEMPTS = int(os.getenv("NOTIFY_MAX_ATTEMPTS", 4))
+    NOTIFY_FLUSH_TIMEOUT = float(os.getenv("NOTIFY_FLUSH_TIMEOUT", 15.0))
+    NOTIFY_SPILL_FILE = os.getenv("NOTIFY_SPILL_FILE", str(CACHE_DIR / "notify_spill.jsonl"))
+
+    # Session Pool Config
+    SESSION_POOL_ENABLED = os.getenv("SESSION_POOL_ENABLED", "false").lower() == "true"
+    SESSION_MAX_AGE = int(os.getenv("SESSION_MAX_AGE", 1800))
+    SESSION_MAX_IDLE = int(os.getenv("SESSION_MAX_IDLE", 600))
+    SESSION_RESET_APP = os.getenv("SESSION_RESET_APP", "true").lower() == "true"
+
+    # Parallel Execution Config (pytest-xdist, one device per worker)
+    PARALLEL_MODE = os.getenv("PARALLEL_MODE", "false").lower() == "true"
+    PARALLEL_DEVICES = os.getenv("PARALLEL_DEVICES", "")
+    PARALLEL_APPIUM_PORT_STEP = int(os.getenv("PARALLEL_APPIUM_PORT_STEP", 1))
+    SYSTEM_PORT_BASE = int(os.getenv("SYSTEM_PORT_BASE", 8200))
+    MJPEG_PORT_BASE = int(os.getenv("MJPEG_PORT_BASE", 7810))
+
     @classmethod
     def get_appium_url(cls) -> str:
         return f"http://{cls.APPIUM_HOST}:{cls.APPIUM_PORT}"
@@ -1,6 +1,10 @@
+import os
 from datetime import datetime
+from dotenv import load_dotenv
 from utils.file_helper import resolve_path
 
+load_dotenv()
+
 class LoggingConfig:
     # Log Directory
     LOG_DIR = resolve_path("logs")
@@ -14,8 +18,14 @@ class LoggingConfig:
     RETENTION = "7 days"
     
     # Log Levels
-    CONSOLE_LEVEL = "INFO"
-    FILE_LEVEL = "DEBUG"
+    CONSOLE_LEVEL = os.getenv("LOG_CONSOLE_LEVEL", "INFO").upper()
+    FILE_LEVEL = os.getenv("LOG_FILE_LEVEL", "DEBUG").upper()
+
+    # Mode: "sync" writes in the calling thread; "async" queues records and a
+    # background thread formats and writes them (high-throughput runs)
+    LOG_MODE = os.getenv("LOG_MODE", "sync").lower()
+    # Dump local variable values into error tracebacks. Slow and may leak secrets; opt-in.
+    DIAGNOSE = os.getenv("LOG_DIAGNOSE", "false").lower() == "true"
 
     # Format
     LOG_FORMAT = "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
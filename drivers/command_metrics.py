@@ -0,0 +1,235 @@
+import bisect
+import glob
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from utils.logger import logger
+from utils.tracer import tracer
+
+# Latency bucket upper bounds in ms: 0.1 ms .. ~150 s, ratio 1.25 (<= 12.5% error per percentile)
+_BUCKET_BOUNDS: List[float] = []
+_bound = 0.1
+while _bound < 150_000:
+    _BUCKET_BOUNDS.append(round(_bound, 4))
+    _bound *= 1.25
+
+
+class LatencyHistogram:
+    """
+    [Histogram]
+    Fixed log-scale buckets: O(log n) record, constant memory, and histograms from
+    different tests or xdist workers merge by adding counts.
+    """
+    __slots__ = ("counts", "count", "total_ms", "max_ms", "request_bytes", "response_bytes", "errors")
+
+    def __init__(self):
+        self.counts = [0] * (len(_BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.errors = 0
+
+    def add(self, ms: float, request_bytes: int, response_bytes: int, error: bool):
+        self.counts[bisect.bisect_left(_BUCKET_BOUNDS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+        self.request_bytes += request_bytes
+        self.response_bytes += response_bytes
+        self.errors += error
+
+    def merge(self, other: "LatencyHistogram"):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+        self.request_bytes += other.request_bytes
+        self.response_bytes += other.response_bytes
+        self.errors += other.errors
+
+    def percentile(self, pct: float) -> float:
+        """Upper bound of the bucket holding the pct-th sample (capped at the observed max)."""
+        if not self.count:
+            return 0.0
+        rank = max(1, int(round(pct / 100 * self.count)))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                bound = _BUCKET_BOUNDS[index] if index < len(_BUCKET_BOUNDS) else self.max_ms
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50), 2),
+            "p95_ms": round(self.percentile(95), 2),
+            "p99_ms": round(self.percentile(99), 2),
+            "max_ms": round(self.max_ms, 2),
+            "total_ms": round(self.total_ms, 1),
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Raw (mergeable) form used in worker export files."""
+        return {k: getattr(self, k) for k in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        histogram = cls()
+        for key in cls.__slots__:
+            setattr(histogram, key, data[key])
+        return histogram
+
+
+def _value_size(value: Any) -> int:
+    """Approximate response payload size; exact for the large string values (screenshots, page source)."""
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return len(value)
+    try:
+        return len(json.dumps(value, separators=(",", ":")))
+    except (TypeError, ValueError):
+        return 0
+
+
+class CommandMetrics:
+    """
+    [Command Instrumentation]
+    Records latency and payload size of every W3C command sent through an
+    instrumented driver, aggregated per command into per-run and per-test
+    histograms. Recording is a couple of perf_counter calls, a bisect and a lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._run: Dict[str, LatencyHistogram] = {}
+        self._test: Dict[str, LatencyHistogram] = {}
+        self._tests: Dict[str, Dict[str, Any]] = {}
+        self._local = threading.local()
+
+    # --- Instrumentation ---
+    def instrument(self, driver):
+        """
+        Wraps the driver's command executor (instance attributes only; the class and
+        other sessions are untouched). Safe to call twice.
+        """
+        executor = driver.command_executor
+        if getattr(executor, "_maf_instrumented", False):
+            return driver
+        original_execute = executor.execute
+        original_request = executor._request
+        local = self._local
+
+        def _request(method, url, body=None):
+            local.request_bytes = len(body) if body else 0
+            return original_request(method, url, body=body)
+
+        def execute(command, params):
+            local.request_bytes = 0
+            start_ns = time.perf_counter_ns()
+            error = True
+            response = None
+            try:
+                response = original_execute(command, params)
+                error = bool(response and response.get("status") not in (None, 0))
+                return response
+            finally:
+                elapsed_ns = time.perf_counter_ns() - start_ns
+                response_bytes = _value_size(response.get("value")) if isinstance(response, dict) else 0
+                self.record(command, elapsed_ns / 1e6, local.request_bytes, response_bytes, error)
+                tracer.complete(command, "driver", start_ns, elapsed_ns)
+
+        executor._request = _request
+        executor.execute = execute
+        executor._maf_instrumented = True
+        return driver
+
+    def record(self, command: str, ms: float, request_bytes: int = 0, response_bytes: int = 0,
+               error: bool = False):
+        with self._lock:
+            for bucket in (self._run, self._test):
+                histogram = bucket.get(command)
+                if histogram is None:
+                    histogram = bucket[command] = LatencyHistogram()
+                histogram.add(ms, request_bytes, response_bytes, error)
+
+    # --- Test scoping ---
+    def start_test(self):
+        with self._lock:
+            self._test = {}
+
+    def end_test(self, test_id: str) -> Dict[str, Any]:
+        """Closes the current test's histograms and returns their summary."""
+        with self._lock:
+            histograms, self._test = self._test, {}
+        summary = self._summarize(histograms)
+        if histograms:
+            self._tests[test_id] = summary
+        return summary
+
+    # --- Reporting ---
+    @staticmethod
+    def _summarize(histograms: Dict[str, LatencyHistogram]) -> Dict[str, Any]:
+        total = LatencyHistogram()
+        for histogram in histograms.values():
+            total.merge(histogram)
+        commands = {name: h.summary() for name, h in
+                    sorted(histograms.items(), key=lambda item: item[1].total_ms, reverse=True)}
+        return {"total": total.summary(), "commands": commands}
+
+    def run_summary(self) -> Dict[str, Any]:
+        with self._lock:
+            histograms = {k: LatencyHistogram.from_dict(v.to_dict()) for k, v in self._run.items()}
+        return self._summarize(histograms)
+
+    def export(self, path: str):
+        """
+        [Export]
+        Writes this process's raw histograms and per-test summaries; an xdist
+        controller merges the worker files with merge_exports().
+        """
+        with self._lock:
+            data = {"run": {k: v.to_dict() for k, v in self._run.items()}, "tests": dict(self._tests)}
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+
+    @classmethod
+    def merge_exports(cls, pattern: str, report_path: str) -> Optional[Dict[str, Any]]:
+        """Merges raw export files into one report with per-run and per-test percentiles."""
+        run: Dict[str, LatencyHistogram] = {}
+        tests: Dict[str, Any] = {}
+        for path in sorted(glob.glob(pattern)):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable command metrics file {path}: {e}")
+                continue
+            for command, raw in data.get("run", {}).items():
+                run.setdefault(command, LatencyHistogram()).merge(LatencyHistogram.from_dict(raw))
+            tests.update(data.get("tests", {}))
+        if not run:
+            return None
+        report = {"run": cls._summarize(run), "tests": tests}
+        os.makedirs(os.path.dirname(os.path.abspath(report_path)), exist_ok=True)
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        total = report["run"]["total"]
+        logger.info(f"WebDriver commands: {total['count']} calls, p50 {total['p50_ms']}ms, "
+                    f"p95 {total['p95_ms']}ms, p99 {total['p99_ms']}ms -> {report_path}")
+        return report
+
+
+command_metrics = CommandMetrics()
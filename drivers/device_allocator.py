@@ -0,0 +1,87 @@
+import os
+import re
+from typing import List, Optional
+
+from config.global_config import GlobalConfig
+from utils.adb_helper import ADBHelper
+from utils.logger import logger
+
+
+class WorkerAssignment:
+    """
+    Device and port allocation for a single pytest-xdist worker.
+    """
+
+    def __init__(self, worker_index: int, device_id: str, appium_port: int,
+                 system_port: int, mjpeg_server_port: int):
+        self.worker_index = worker_index
+        self.device_id = device_id
+        self.appium_port = appium_port
+        self.system_port = system_port
+        self.mjpeg_server_port = mjpeg_server_port
+
+    def __repr__(self) -> str:
+        return (f"WorkerAssignment(worker={self.worker_index}, device={self.device_id}, "
+                f"appium={self.appium_port}, systemPort={self.system_port}, "
+                f"mjpegServerPort={self.mjpeg_server_port})")
+
+
+class DeviceAllocator:
+    """
+    [Parallel Mode]
+    Maps each pytest-xdist worker (gw0, gw1, ...) to its own device, Appium port
+    and UiAutomator2 systemPort/mjpegServerPort so workers never collide.
+    Every worker sees the same sorted device list, so the mapping is deterministic
+    without any cross-process coordination.
+    """
+
+    _assignment: Optional[WorkerAssignment] = None
+
+    @staticmethod
+    def is_parallel() -> bool:
+        return GlobalConfig.PARALLEL_MODE and DeviceAllocator.get_worker_index() is not None
+
+    @staticmethod
+    def get_worker_index() -> Optional[int]:
+        """[Worker Id] Parses PYTEST_XDIST_WORKER ('gw3' -> 3); None outside xdist."""
+        worker = os.getenv("PYTEST_XDIST_WORKER")
+        if not worker:
+            return None
+        match = re.search(r"(\d+)$", worker)
+        return int(match.group(1)) if match else None
+
+    @staticmethod
+    def discover_devices() -> List[str]:
+        """
+        [Device Discovery]
+        Uses PARALLEL_DEVICES if set, otherwise every device reported by adb.
+        """
+        if GlobalConfig.PARALLEL_DEVICES:
+            return [d.strip() for d in GlobalConfig.PARALLEL_DEVICES.split(",") if d.strip()]
+        return sorted(ADBHelper.get_connected_devices())
+
+    @classmethod
+    def get_assignment(cls) -> Optional[WorkerAssignment]:
+        """
+        [Allocation]
+        Returns this worker's assignment, or None when not running in parallel mode.
+        """
+        if not cls.is_parallel():
+            return None
+        if cls._assignment is None:
+            index = cls.get_worker_index()
+            devices = cls.discover_devices()
+            if index >= len(devices):
+                raise RuntimeError(
+                    f"Worker gw{index} has no device: only {len(devices)} connected ({devices}). "
+                    f"Run pytest with -n {len(devices)} or fewer."
+                )
+            cls._assignment = WorkerAssignment(
+                worker_index=index,
+                device_id=devices[index],
+                appium_port=GlobalConfig.APPIUM_PORT + index * GlobalConfig.PARALLEL_APPIUM_PORT_STEP,
+                system_port=GlobalConfig.SYSTEM_PORT_BASE + index,
+                mjpeg_server_port=GlobalConfig.MJPEG_PORT_BASE + index,
+            )
+            logger.info(f"Parallel mode: {cls._assignment}")
+        return cls._assignment
@@ -1,56 +1,154 @@
+from typing import Optional
 from appium import webdriver
 from appium.options.android import UiAutomator2Options
 from appium.options.ios import XCUITestOptions
 from config.global_config import GlobalConfig
+from drivers.command_metrics import command_metrics
+from drivers.device_allocator import DeviceAllocator
+from drivers.session_pool import SessionPool
 from utils.logger import logger
+from utils.retry_policy import RetryPolicy, get_circuit_breaker, is_outage
 
 class DriverFactory:
+    _session_pool: Optional[SessionPool] = None
+
+    @staticmethod
+    def build_options(platform_name: str = "Android"):
+        """
+        Builds the Appium options for the given platform from GlobalConfig.
+        """
+        if platform_name.lower() == "android":
+            options = UiAutomator2Options()
+            options.platform_name = "Android"
+            options.automation_name = "UiAutomator2"
+            options.device_name = GlobalConfig.DEVICE_NAME
+
+            if GlobalConfig.APP_PACKAGE:
+                options.app_package = GlobalConfig.APP_PACKAGE
+            if GlobalConfig.APP_ACTIVITY:
+                options.app_activity = GlobalConfig.APP_ACTIVITY
+            if GlobalConfig.APP_PATH:
+                options.app = GlobalConfig.APP_PATH
+            if GlobalConfig.UDID:
+                options.udid = GlobalConfig.UDID
+            if GlobalConfig.PLATFORM_VERSION:
+                options.platform_version = GlobalConfig.PLATFORM_VERSION
+
+            # Auto Grant Permissions
+            options.auto_grant_permissions = True
+
+            # Parallel mode: pin this worker to its own device and ports
+            assignment = DeviceAllocator.get_assignment()
+            if assignment:
+                options.device_name = assignment.device_id
+                options.udid = assignment.device_id
+                options.system_port = assignment.system_port
+                options.mjpeg_server_port = assignment.mjpeg_server_port
+            return options
+
+        elif platform_name.lower() == "ios":
+             # Future Implementation for iOS
+             raise NotImplementedError("iOS Driver not yet implemented")
+        else:
+            raise ValueError(f"Unsupported Platform: {platform_name}")
+
+    @staticmethod
+    def get_command_executor() -> str:
+        """
+        Returns the Appium server URL, honouring the worker's port in parallel mode.
+        """
+        assignment = DeviceAllocator.get_assignment()
+        if assignment:
+            return f"http://{GlobalConfig.APPIUM_HOST}:{assignment.appium_port}"
+        return GlobalConfig.get_appium_url()
+
+    @staticmethod
+    def create_session(command_executor: str, options) -> webdriver.Remote:
+        """
+        Opens a new Appium session.
+        """
+        logger.debug(f"Connecting to Appium Server at: {command_executor}")
+        logger.opt(lazy=True).debug("Capabilities: {}", options.to_capabilities)
+
+        driver = webdriver.Remote(command_executor=command_executor, options=options)
+        if GlobalConfig.COMMAND_METRICS_ENABLED:
+            command_metrics.instrument(driver)
+        logger.success("Driver initialized successfully!")
+        return driver
+
+    @staticmethod
+    def _start_guarded(options, start, *args) -> webdriver.Remote:
+        """
+        [Outage Guard]
+        Runs a session start through the device's circuit breaker, retrying only
+        outage errors (server/device unreachable) with backoff. While the breaker is
+        open, starts for that device fail at once with CircuitOpenError.
+        """
+        breaker = get_circuit_breaker(str(options.udid or options.device_name))
+        policy = RetryPolicy(max_attempts=GlobalConfig.SESSION_START_ATTEMPTS, base_delay=2.0,
+                             jitter=0.5, deadline=60.0, retry_if=is_outage)
+        return policy.call(start, args, breaker=breaker, name="start session")
+
     @staticmethod
     def start_driver(platform_name: str = "Android") -> webdriver.Remote:
         """
         Initializes the Appium Driver based on platform.
         """
         logger.info(f"Initializing Driver for Platform: {platform_name}")
-        
-        try:
-            if platform_name.lower() == "android":
-                options = UiAutomator2Options()
-                options.platform_name = "Android"
-                options.automation_name = "UiAutomator2"
-                options.device_name = GlobalConfig.DEVICE_NAME
-                
-                if GlobalConfig.APP_PACKAGE:
-                    options.app_package = GlobalConfig.APP_PACKAGE
-                if GlobalConfig.APP_ACTIVITY:
-                    options.app_activity = GlobalConfig.APP_ACTIVITY
-                if GlobalConfig.APP_PATH:
-                    options.app = GlobalConfig.APP_PATH
-                if GlobalConfig.UDID:
-                    options.udid = GlobalConfig.UDID
-                if GlobalConfig.PLATFORM_VERSION:
-                    options.platform_version = GlobalConfig.PLATFORM_VERSION
-                
-                # Auto Grant Permissions
-                options.auto_grant_permissions = True
-                
-                command_executor = GlobalConfig.get_appium_url()
-                logger.debug(f"Connecting to Appium Server at: {command_executor}")
-                logger.debug(f"Capabilities: {options.to_capabilities()}")
-
-                driver = webdriver.Remote(command_executor=command_executor, options=options)
-                logger.success("Driver initialized successfully!")
-                return driver
-            
-            elif platform_name.lower() == "ios":
-                 # Future Implementation for iOS
-                 raise NotImplementedError("iOS Driver not yet implemented")
-            else:
-                raise ValueError(f"Unsupported Platform: {platform_name}")
 
+        try:
+            options = DriverFactory.build_options(platform_name)
+            return DriverFactory._start_guarded(
+                options, DriverFactory.create_session, DriverFactory.get_command_executor(), options)
         except Exception as e:
             logger.error(f"Failed to initialize driver: {e}")
             raise e
 
+    @classmethod
+    def get_session_pool(cls) -> SessionPool:
+        """
+        Returns the process-wide session pool, creating it on first use.
+        """
+        if cls._session_pool is None:
+            cls._session_pool = SessionPool(
+                factory=cls.create_session,
+                max_age=GlobalConfig.SESSION_MAX_AGE,
+                max_idle=GlobalConfig.SESSION_MAX_IDLE,
+                reset_app=GlobalConfig.SESSION_RESET_APP,
+            )
+        return cls._session_pool
+
+    @classmethod
+    def acquire_driver(cls, platform_name: str = "Android") -> webdriver.Remote:
+        """
+        Leases a warm session from the pool (or starts one if none is available).
+        """
+        logger.info(f"Leasing pooled Driver for Platform: {platform_name}")
+        try:
+            options = cls.build_options(platform_name)
+            return cls._start_guarded(options, cls.get_session_pool().acquire, cls.get_command_executor(), options)
+        except Exception as e:
+            logger.error(f"Failed to lease driver: {e}")
+            raise e
+
+    @classmethod
+    def release_driver(cls, driver: webdriver.Remote, reset: bool = True):
+        """
+        Returns a leased session to the pool, resetting the app state.
+        """
+        if driver and cls._session_pool:
+            cls._session_pool.release(driver, reset=reset)
+
+    @classmethod
+    def close_session_pool(cls):
+        """
+        Quits all pooled sessions. Call once at the end of the run.
+        """
+        if cls._session_pool:
+            logger.info(f"Session pool stats: {cls._session_pool.stats()}")
+            cls._session_pool.close_all()
+            cls._session_pool = None
+
     @staticmethod
     def quit_driver(driver: webdriver.Remote):
         """
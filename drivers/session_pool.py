@@ -0,0 +1,226 @@
+import json
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from utils.adb_helper import ADBHelper
+from utils.logger import logger
+
+
+class PooledSession:
+    """
+    Bookkeeping for one live Appium session owned by the pool.
+    """
+
+    def __init__(self, driver: WebDriver, key: str, capabilities: dict):
+        self.driver = driver
+        self.key = key
+        self.capabilities = capabilities
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.lease_count = 0
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.created_at
+
+    @property
+    def idle_time(self) -> float:
+        return time.monotonic() - self.last_used
+
+
+class SessionPool:
+    """
+    [Warm Session Reuse]
+    Keeps Appium sessions alive between tests, keyed by server URL + capability set.
+    A leased session is health-checked before it is handed out and its app state is
+    reset on release instead of tearing the whole session down.
+    """
+
+    def __init__(self,
+                 factory: Callable[[str, object], WebDriver],
+                 max_age: float = 1800,
+                 max_idle: float = 600,
+                 max_idle_per_key: int = 1,
+                 reset_app: bool = True):
+        """
+        :param factory: Callable(command_executor, options) creating a new session.
+        :param max_age: Seconds after which a session is retired regardless of health.
+        :param max_idle: Seconds an unused session may sit in the pool before eviction.
+        :param max_idle_per_key: Idle sessions kept per capability set.
+        :param reset_app: Force-stop and relaunch the app under test on release.
+        """
+        self._factory = factory
+        self.max_age = max_age
+        self.max_idle = max_idle
+        self.max_idle_per_key = max_idle_per_key
+        self.reset_app = reset_app
+
+        self._idle: Dict[str, List[PooledSession]] = {}
+        self._leased: Dict[int, PooledSession] = {}
+        self._lock = threading.Lock()
+
+        self.created = 0
+        self.reused = 0
+        self.evicted = 0
+
+    @staticmethod
+    def make_key(command_executor: str, capabilities: dict) -> str:
+        """[Pool Key] Stable key for a server URL + capability set."""
+        return f"{command_executor}|{json.dumps(capabilities, sort_keys=True, default=str)}"
+
+    def acquire(self, command_executor: str, options) -> WebDriver:
+        """
+        [Lease]
+        Returns a healthy session for the given options, creating one if none is idle.
+        """
+        capabilities = options.to_capabilities()
+        key = self.make_key(command_executor, capabilities)
+
+        while True:
+            candidate = self._pop_idle(key)
+            if candidate is None:
+                break
+            if self._is_expired(candidate):
+                self._discard(candidate, "expired")
+                continue
+            if not self.health_check(candidate.driver):
+                self._discard(candidate, "failed health check")
+                continue
+            self.reused += 1
+            logger.info(f"Reusing pooled session {candidate.driver.session_id} "
+                        f"(age {candidate.age:.0f}s, leases {candidate.lease_count})")
+            return self._lease(candidate)
+
+        logger.info("No warm session available, starting a new one.")
+        driver = self._factory(command_executor, options)
+        self.created += 1
+        return self._lease(PooledSession(driver, key, capabilities))
+
+    def release(self, driver: WebDriver, reset: bool = True):
+        """
+        [Return]
+        Hands a leased session back to the pool. The app state is reset first;
+        sessions that cannot be reset, or exceed the idle quota, are quit.
+        """
+        with self._lock:
+            pooled = self._leased.pop(id(driver), None)
+        if pooled is None:
+            logger.warning("Released driver is not owned by the pool, quitting it.")
+            self._quit(driver)
+            return
+
+        pooled.last_used = time.monotonic()
+        if self._is_expired(pooled):
+            self._discard(pooled, "expired")
+            return
+        if reset and self.reset_app and not self.reset_app_state(pooled):
+            self._discard(pooled, "app reset failed")
+            return
+
+        with self._lock:
+            bucket = self._idle.setdefault(pooled.key, [])
+            if len(bucket) < self.max_idle_per_key:
+                bucket.append(pooled)
+                return
+        self._discard(pooled, "idle quota reached")
+
+    def evict(self, driver: WebDriver):
+        """[Evict] Drops a leased session, e.g. after it crashed mid-test."""
+        with self._lock:
+            pooled = self._leased.pop(id(driver), None)
+        if pooled:
+            self._discard(pooled, "evicted by caller")
+        else:
+            self._quit(driver)
+
+    def prune(self):
+        """[Eviction Sweep] Quits idle sessions that are too old or idle too long."""
+        with self._lock:
+            stale = []
+            for key, bucket in self._idle.items():
+                stale.extend(s for s in bucket if self._is_expired(s))
+                self._idle[key] = [s for s in bucket if not self._is_expired(s)]
+        for pooled in stale:
+            self._discard(pooled, "expired")
+
+    def close_all(self):
+        """[Shutdown] Quits every session, idle or leased."""
+        with self._lock:
+            sessions = [s for bucket in self._idle.values() for s in bucket]
+            sessions.extend(self._leased.values())
+            self._idle.clear()
+            self._leased.clear()
+        for pooled in sessions:
+            self._quit(pooled.driver)
+        if sessions:
+            logger.info(f"Session pool closed ({len(sessions)} sessions quit).")
+
+    def stats(self) -> dict:
+        with self._lock:
+            idle = sum(len(bucket) for bucket in self._idle.values())
+            leased = len(self._leased)
+        return {"created": self.created, "reused": self.reused, "evicted": self.evicted,
+                "idle": idle, "leased": leased}
+
+    @staticmethod
+    def health_check(driver: WebDriver) -> bool:
+        """
+        [Liveness Probe]
+        Issues one cheap command that round-trips to the device.
+        """
+        try:
+            driver.get_window_size()
+            return True
+        except Exception as e:
+            logger.warning(f"Pooled session {driver.session_id} is dead: {e}")
+            return False
+
+    @staticmethod
+    def reset_app_state(pooled: PooledSession) -> bool:
+        """
+        [App Reset]
+        Force-stops the app under test via ADB and relaunches it in the same session.
+        """
+        caps = pooled.capabilities
+        package = caps.get("appium:appPackage")
+        if not package:
+            return True
+        driver = pooled.driver
+        device_id = (driver.capabilities or {}).get("udid") or caps.get("appium:udid")
+        try:
+            ADBHelper.stop_app(package, device_id)
+            driver.activate_app(package)
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to reset app {package}: {e}")
+            return False
+
+    def _is_expired(self, pooled: PooledSession) -> bool:
+        return pooled.age > self.max_age or pooled.idle_time > self.max_idle
+
+    def _pop_idle(self, key: str) -> Optional[PooledSession]:
+        with self._lock:
+            bucket = self._idle.get(key)
+            return bucket.pop() if bucket else None
+
+    def _lease(self, pooled: PooledSession) -> WebDriver:
+        pooled.lease_count += 1
+        pooled.last_used = time.monotonic()
+        with self._lock:
+            self._leased[id(pooled.driver)] = pooled
+        return pooled.driver
+
+    def _discard(self, pooled: PooledSession, reason: str):
+        logger.info(f"Evicting session {pooled.driver.session_id}: {reason}")
+        self.evicted += 1
+        self._quit(pooled.driver)
+
+    @staticmethod
+    def _quit(driver: WebDriver):
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.debug(f"Ignoring error while quitting session: {e}")
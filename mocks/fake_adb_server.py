@@ -0,0 +1,182 @@
+import socketserver
+import struct
+import threading
+from typing import Callable, Dict, List, Optional, Union
+
+# Reply for shell:/exec: commands: static bytes or a callable(cmd) -> bytes.
+# A callable returning None closes the stream without output (device lost mid-command).
+ShellReply = Union[bytes, Callable[[str], Optional[bytes]]]
+
+
+class FakeADBServer:
+    """
+    [Local adb Stand-in]
+    Minimal adb host-protocol server for benchmarks and offline runs.
+    Speaks enough of the protocol for both utils.adb_client and the real `adb`
+    binary (started with ANDROID_ADB_SERVER_PORT pointing here):
+    host:version/features/devices, host:transport*, shell:, exec: and sync: SEND/RECV.
+
+    Usage:
+        server = FakeADBServer(devices=["emulator-5554"], shell={"echo hi": b"hi\\n"})
+        server.start()
+        ...
+        server.stop()
+    """
+
+    ADB_SERVER_VERSION = 41
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 devices: Optional[List[str]] = None,
+                 shell: Optional[Dict[str, ShellReply]] = None,
+                 default_reply: ShellReply = b""):
+        self.devices = devices or ["emulator-5554"]
+        self.shell_replies: Dict[str, ShellReply] = shell or {}
+        self.default_reply = default_reply
+        self.files: Dict[str, bytes] = {}
+        self.commands: List[str] = []
+
+        fake = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                fake._handle(self.request)
+
+        self._server = socketserver.ThreadingTCPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self) -> "FakeADBServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # --- Protocol ---
+    def _reply_for(self, cmd: str) -> Optional[bytes]:
+        reply = self.shell_replies.get(cmd, self.default_reply)
+        return reply(cmd) if callable(reply) else reply
+
+    @staticmethod
+    def _recv_exact(sock, size: int) -> Optional[bytes]:
+        buf = b""
+        while len(buf) < size:
+            chunk = sock.recv(size - len(buf))
+            if not chunk:
+                return None
+            buf += chunk
+        return buf
+
+    @staticmethod
+    def _okay_string(sock, text: str):
+        data = text.encode("utf-8")
+        sock.sendall(b"OKAY" + b"%04x" % len(data) + data)
+
+    @staticmethod
+    def _fail(sock, message: str):
+        data = message.encode("utf-8")
+        sock.sendall(b"FAIL" + b"%04x" % len(data) + data)
+
+    def _parse_transport(self, service: str) -> Optional[str]:
+        for prefix in ("host:transport:", "host:tport:serial:"):
+            if service.startswith(prefix):
+                return service[len(prefix):]
+        # host:transport-any / host:tport:any (and -usb/-local variants)
+        return self.devices[0] if self.devices else None
+
+    def _handle(self, sock):
+        transport: Optional[str] = None
+        while True:
+            header = self._recv_exact(sock, 4)
+            if header is None:
+                return
+            request = self._recv_exact(sock, int(header, 16))
+            if request is None:
+                return
+            service = request.decode("utf-8")
+            self.commands.append(service)
+
+            if service == "host:version":
+                self._okay_string(sock, "%04x" % self.ADB_SERVER_VERSION)
+                return
+            if service == "host:features" or service.endswith(":features"):
+                self._okay_string(sock, "")
+                return
+            if service in ("host:devices", "host:devices-l"):
+                self._okay_string(sock, "".join(f"{d}\tdevice\n" for d in self.devices))
+                return
+            if service.startswith(("host:transport", "host:tport")):
+                serial = self._parse_transport(service)
+                if serial not in self.devices:
+                    self._fail(sock, f"device '{serial}' not found")
+                    return
+                transport = serial
+                sock.sendall(b"OKAY")
+                if service.startswith("host:tport"):
+                    sock.sendall(struct.pack("<Q", 1))
+                continue
+            if transport is None:
+                self._fail(sock, f"unknown host service: {service}")
+                return
+            if service.startswith(("shell:", "exec:")):
+                # Like adbd, accept the command first and stream its output afterwards
+                sock.sendall(b"OKAY")
+                reply = self._reply_for(service.split(":", 1)[1])
+                if reply is not None:
+                    sock.sendall(reply)
+                return
+            if service == "sync:":
+                sock.sendall(b"OKAY")
+                self._handle_sync(sock)
+                return
+            self._fail(sock, f"unsupported service: {service}")
+            return
+
+    def _handle_sync(self, sock):
+        while True:
+            header = self._recv_exact(sock, 8)
+            if header is None:
+                return
+            packet_id, length = struct.unpack("<4sI", header)
+            if packet_id == b"QUIT":
+                return
+            payload = self._recv_exact(sock, length) or b""
+            if packet_id == b"SEND":
+                path = payload.decode("utf-8").rsplit(",", 1)[0]
+                chunks = []
+                while True:
+                    packet_id, length = struct.unpack("<4sI", self._recv_exact(sock, 8))
+                    if packet_id == b"DATA":
+                        chunks.append(self._recv_exact(sock, length))
+                    elif packet_id == b"DONE":
+                        break
+                self.files[path] = b"".join(chunks)
+                sock.sendall(b"OKAY" + struct.pack("<I", 0))
+            elif packet_id == b"RECV":
+                path = payload.decode("utf-8")
+                if path not in self.files:
+                    message = b"No such file or directory"
+                    sock.sendall(b"FAIL" + struct.pack("<I", len(message)) + message)
+                    return
+                data = self.files[path]
+                for offset in range(0, len(data), 64 * 1024):
+                    chunk = data[offset:offset + 64 * 1024]
+                    sock.sendall(b"DATA" + struct.pack("<I", len(chunk)) + chunk)
+                sock.sendall(b"DONE" + struct.pack("<I", 0))
+            else:
+                # STAT/LIST are not modelled
+                message = b"unsupported sync request"
+                sock.sendall(b"FAIL" + struct.pack("<I", len(message)) + message)
+                return
@@ -0,0 +1,376 @@
+import base64
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple, Union
+from xml.sax.saxutils import quoteattr
+import cv2
+import numpy as np
+from utils.page_snapshot import PageSnapshot, UnsupportedLocatorError
+
+# Injected latency: seconds for every command, or {command_name: seconds} ("*" = default)
+Latency = Union[float, Dict[str, float]]
+
+
+class FakeAppiumError(Exception):
+    """Raised inside handlers; becomes a W3C error response."""
+
+    def __init__(self, status: int, error: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.error = error
+        self.message = message
+
+
+class FakeElement:
+    """One element of the scripted UI. Click on it navigates to `goto` if set."""
+
+    def __init__(self, screen: str, index: int, spec: Dict[str, Any], bounds: Tuple[int, int, int, int]):
+        self.screen = screen
+        self.index = index
+        self.element_id = f"el-{screen}-{index}"
+        self.resource_id = spec.get("id", "")
+        self.text = spec.get("text", "")
+        self.desc = spec.get("desc", "")
+        self.class_name = spec.get("class", "android.widget.TextView")
+        self.goto = spec.get("goto")
+        self.enabled = spec.get("enabled", True)
+        # Seconds after entering the screen before the element exists (exercises waits)
+        self.appear_after = float(spec.get("appear_after", 0))
+        self.bounds = bounds
+        self.value = self.text
+
+    def attributes(self) -> Dict[str, str]:
+        x1, y1, x2, y2 = self.bounds
+        return {
+            "index": str(self.index),
+            "text": self.value,
+            "resource-id": self.resource_id,
+            "content-desc": self.desc,
+            "class": self.class_name,
+            "clickable": "true" if self.goto else "false",
+            "enabled": "true" if self.enabled else "false",
+            "displayed": "true",
+            "bounds": f"[{x1},{y1}][{x2},{y2}]",
+        }
+
+
+class FakeAppiumServer:
+    """
+    [Local Appium Stand-in]
+    W3C/Appium HTTP server backed by a scripted UI model, for measuring framework
+    overhead (BasePage, ActionMixin, decorators, logging) without devices.
+    Serves session, find element(s) (id, accessibility id, class name, xpath),
+    click/clear/value/text/attribute/rect/displayed/enabled, W3C actions (taps hit
+    elements), screenshot (generated PNG), page source and window rect. Other
+    /appium/* extension endpoints and `mobile:` scripts (execute/sync, e.g.
+    activate_app) succeed with null.
+
+    Usage:
+        screens = {
+            "login": [{"id": "com.app:id/user", "class": "android.widget.EditText"},
+                      {"id": "com.app:id/login", "text": "Login", "goto": "home"}],
+            "home": [{"id": "com.app:id/title", "text": "Welcome", "appear_after": 0.3}],
+        }
+        with FakeAppiumServer(screens, latency={"*": 0.005, "screenshot": 0.05}) as server:
+            driver = webdriver.Remote(server.url, options=options)
+
+    :param latency: Injected delay per command (see Latency); `jitter` adds up to that many seconds.
+    :param failure_rate: {command_name: probability} of answering with a W3C "unknown error".
+    """
+
+    def __init__(self, screens: Dict[str, List[Dict[str, Any]]], start: Optional[str] = None,
+                 host: str = "127.0.0.1", port: int = 0, window_size: Tuple[int, int] = (1080, 2400),
+                 latency: Latency = 0.0, jitter: float = 0.0,
+                 failure_rate: Optional[Dict[str, float]] = None, seed: int = 0):
+        if not screens:
+            raise ValueError("FakeAppiumServer needs at least one screen")
+        self.width, self.height = window_size
+        self.screens: Dict[str, List[FakeElement]] = {
+            name: self._layout(name, specs) for name, specs in screens.items()}
+        self.start_screen = start or next(iter(screens))
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate or {}
+        self.commands: List[str] = []
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self._screenshots: Dict[Tuple[str, tuple], str] = {}
+
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like a real Appium server
+            disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+            def do_GET(self):
+                fake._handle(self, "GET")
+
+            def do_POST(self):
+                fake._handle(self, "POST")
+
+            def do_DELETE(self):
+                fake._handle(self, "DELETE")
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    # --- Lifecycle ---
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    @property
+    def url(self) -> str:
+        return f"http://{self._server.server_address[0]}:{self.port}"
+
+    def start(self) -> "FakeAppiumServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # --- UI model ---
+    def _layout(self, screen: str, specs: List[Dict[str, Any]]) -> List[FakeElement]:
+        """Elements without explicit `bounds` are stacked as full-width rows."""
+        elements = []
+        for index, spec in enumerate(specs):
+            top = 200 + index * 150
+            bounds = tuple(spec.get("bounds") or (40, top, self.width - 40, top + 120))
+            elements.append(FakeElement(screen, index, spec, bounds))
+        return elements
+
+    def current_screen(self, session_id: str) -> str:
+        return self._session(session_id)["screen"]
+
+    def _session(self, session_id: str) -> Dict[str, Any]:
+        session = self._sessions.get(session_id)
+        if session is None:
+            raise FakeAppiumError(404, "invalid session id", f"Session {session_id} does not exist")
+        return session
+
+    def _visible(self, session: Dict[str, Any]) -> List[FakeElement]:
+        elapsed = time.monotonic() - session["entered_at"]
+        return [e for e in self.screens[session["screen"]] if e.appear_after <= elapsed]
+
+    def _navigate(self, session: Dict[str, Any], screen: str):
+        if screen not in self.screens:
+            raise FakeAppiumError(500, "unknown error", f"Scripted screen '{screen}' does not exist")
+        session["screen"] = screen
+        session["entered_at"] = time.monotonic()
+
+    def page_source(self, session: Dict[str, Any]) -> str:
+        nodes = []
+        for element in self._visible(session):
+            attrs = " ".join(f"{k}={quoteattr(v)}" for k, v in element.attributes().items())
+            nodes.append(f"<{element.class_name} {attrs}/>")
+        return ("<?xml version='1.0' encoding='UTF-8' standalone='yes' ?>"
+                f"<hierarchy index=\"0\" class=\"hierarchy\" width=\"{self.width}\" height=\"{self.height}\">"
+                f"<android.widget.FrameLayout index=\"0\" class=\"android.widget.FrameLayout\" "
+                f"bounds=\"[0,0][{self.width},{self.height}]\">{''.join(nodes)}</android.widget.FrameLayout>"
+                "</hierarchy>")
+
+    def _find(self, session: Dict[str, Any], using: str, value: str) -> List[FakeElement]:
+        visible = self._visible(session)
+        snapshot = PageSnapshot(self.page_source(session))
+        try:
+            found = snapshot.find_all((using, value))
+        except UnsupportedLocatorError as e:
+            raise FakeAppiumError(400, "invalid selector", str(e))
+        by_index = {str(e.index): e for e in visible}
+        return [by_index[f.get_attribute("index")] for f in found if f.get_attribute("index") in by_index]
+
+    def _element(self, session: Dict[str, Any], element_id: str) -> FakeElement:
+        for element in self._visible(session):
+            if element.element_id == element_id:
+                return element
+        raise FakeAppiumError(404, "stale element reference", f"Element {element_id} is no longer on screen")
+
+    def _screenshot(self, session: Dict[str, Any]) -> str:
+        visible = self._visible(session)
+        key = (session["screen"], tuple((e.index, e.value) for e in visible))
+        cached = self._screenshots.get(key)
+        if cached is None:
+            image = np.full((self.height, self.width, 3), 245, np.uint8)
+            for element in visible:
+                x1, y1, x2, y2 = element.bounds
+                color = (200, 120, 30) if element.goto else (90, 90, 90)
+                cv2.rectangle(image, (x1, y1), (x2, y2), color, 3)
+                cv2.putText(image, element.value or element.resource_id.split("/")[-1], (x1 + 20, y1 + 70),
+                            cv2.FONT_HERSHEY_SIMPLEX, 1.5, (20, 20, 20), 3)
+            cached = base64.b64encode(cv2.imencode(".png", image)[1].tobytes()).decode("ascii")
+            self._screenshots[key] = cached
+        return cached
+
+    def _tap(self, session: Dict[str, Any], x: float, y: float):
+        for element in reversed(self._visible(session)):
+            x1, y1, x2, y2 = element.bounds
+            if x1 <= x <= x2 and y1 <= y <= y2:
+                if element.goto:
+                    self._navigate(session, element.goto)
+                return
+
+    def _perform_actions(self, session: Dict[str, Any], actions: List[Dict[str, Any]]):
+        """Pointer down/up without movement in between counts as a tap."""
+        for source in actions:
+            if source.get("type") != "pointer":
+                continue
+            x = y = 0.0
+            down_at = None
+            for action in source.get("actions", []):
+                kind = action.get("type")
+                if kind == "pointerMove":
+                    x, y = action.get("x", x), action.get("y", y)
+                elif kind == "pointerDown":
+                    down_at = (x, y)
+                elif kind == "pointerUp" and down_at is not None:
+                    if abs(down_at[0] - x) < 10 and abs(down_at[1] - y) < 10:
+                        self._tap(session, x, y)
+                    down_at = None
+
+    # --- HTTP ---
+    _ROUTES = [
+        ("POST", r"/session", "newSession"),
+        ("GET", r"/status", "status"),
+        ("DELETE", r"/session/(?P<sid>[^/]+)", "deleteSession"),
+        ("POST", r"/session/(?P<sid>[^/]+)/element", "findElement"),
+        ("POST", r"/session/(?P<sid>[^/]+)/elements", "findElements"),
+        ("POST", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/element", "findChildElement"),
+        ("POST", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/click", "clickElement"),
+        ("POST", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/clear", "clearElement"),
+        ("POST", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/value", "sendKeysToElement"),
+        ("GET", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/text", "getElementText"),
+        ("GET", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/attribute/(?P<name>[^/]+)", "getElementAttribute"),
+        ("GET", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/rect", "getElementRect"),
+        ("GET", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/displayed", "isElementDisplayed"),
+        ("GET", r"/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/enabled", "isElementEnabled"),
+        ("POST", r"/session/(?P<sid>[^/]+)/actions", "w3cActions"),
+        ("DELETE", r"/session/(?P<sid>[^/]+)/actions", "w3cReleaseActions"),
+        ("GET", r"/session/(?P<sid>[^/]+)/screenshot", "screenshot"),
+        ("GET", r"/session/(?P<sid>[^/]+)/source", "getPageSource"),
+        ("GET", r"/session/(?P<sid>[^/]+)/window/rect", "getWindowRect"),
+        ("POST", r"/session/(?P<sid>[^/]+)/timeouts", "setTimeouts"),
+        ("POST", r"/session/(?P<sid>[^/]+)/appium/device/activate_app", "activateApp"),
+        ("POST", r"/session/(?P<sid>[^/]+)/execute/sync", "executeScript"),
+        ("GET", r"/session/(?P<sid>[^/]+)/appium/.*", "appiumExtension"),
+        ("POST", r"/session/(?P<sid>[^/]+)/appium/.*", "appiumExtension"),
+    ]
+    _COMPILED = [(method, re.compile(f"^{pattern}$"), name) for method, pattern, name in _ROUTES]
+
+    def _route(self, method: str, path: str) -> Tuple[str, Dict[str, str]]:
+        path = re.sub(r"^/wd/hub", "", path.split("?", 1)[0]).rstrip("/") or "/"
+        for route_method, pattern, name in self._COMPILED:
+            if route_method == method:
+                match = pattern.match(path)
+                if match:
+                    return name, match.groupdict()
+        raise FakeAppiumError(404, "unknown command", f"{method} {path} is not implemented by FakeAppiumServer")
+
+    def _inject(self, command: str):
+        delay = self.latency.get(command, self.latency.get("*", 0.0)) if isinstance(self.latency, dict) else self.latency
+        if self.jitter:
+            delay += self._random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        rate = self.failure_rate.get(command, self.failure_rate.get("*", 0.0))
+        if rate and self._random.random() < rate:
+            raise FakeAppiumError(500, "unknown error", f"Injected failure for {command}")
+
+    def _handle(self, handler: BaseHTTPRequestHandler, method: str):
+        length = int(handler.headers.get("Content-Length") or 0)
+        raw = handler.rfile.read(length) if length else b""
+        try:
+            command, params = self._route(method, handler.path)
+            with self._lock:
+                self.commands.append(command)
+            self._inject(command)
+            body = json.loads(raw) if raw else {}
+            with self._lock:
+                value = self._dispatch(command, params, body)
+            status, payload = 200, {"value": value}
+        except FakeAppiumError as e:
+            status, payload = e.status, {"value": {"error": e.error, "message": e.message, "stacktrace": ""}}
+        data = json.dumps(payload).encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json; charset=utf-8")
+        handler.send_header("Content-Length", str(len(data)))
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    def _dispatch(self, command: str, params: Dict[str, str], body: Dict[str, Any]) -> Any:
+        if command == "status":
+            return {"ready": True, "message": "FakeAppiumServer"}
+        if command == "newSession":
+            session_id = uuid.uuid4().hex
+            caps = body.get("capabilities", {}).get("alwaysMatch", {})
+            # Like Appium, answer with the vendor prefixes stripped ("appium:udid" -> "udid")
+            caps = {name.split(":", 1)[-1]: value for name, value in caps.items()}
+            self._sessions[session_id] = {"screen": self.start_screen, "entered_at": time.monotonic()}
+            return {"sessionId": session_id, "capabilities": {**caps, "platformName": caps.get("platformName", "Android")}}
+
+        session = self._session(params["sid"])
+        if command == "deleteSession":
+            del self._sessions[params["sid"]]
+            return None
+        if command in ("findElement", "findElements", "findChildElement"):
+            found = self._find(session, body.get("using"), body.get("value"))
+            refs = [{"element-6066-11e4-a52e-4f735466cecf": e.element_id, "ELEMENT": e.element_id} for e in found]
+            if command == "findElements":
+                return refs
+            if not refs:
+                raise FakeAppiumError(404, "no such element", f"No element for {body.get('using')}={body.get('value')}")
+            return refs[0]
+        if command == "getPageSource":
+            return self.page_source(session)
+        if command == "screenshot":
+            return self._screenshot(session)
+        if command == "getWindowRect":
+            return {"x": 0, "y": 0, "width": self.width, "height": self.height}
+        if command == "w3cActions":
+            self._perform_actions(session, body.get("actions", []))
+            return None
+        if command in ("w3cReleaseActions", "setTimeouts", "activateApp", "executeScript", "appiumExtension"):
+            return None
+
+        element = self._element(session, params["eid"])
+        if command == "clickElement":
+            if element.goto:
+                self._navigate(session, element.goto)
+            return None
+        if command == "clearElement":
+            element.value = ""
+            return None
+        if command == "sendKeysToElement":
+            element.value += body.get("text", "")
+            return None
+        if command == "getElementText":
+            return element.value
+        if command == "getElementAttribute":
+            return element.attributes().get(params["name"], None)
+        if command == "getElementRect":
+            x1, y1, x2, y2 = element.bounds
+            return {"x": x1, "y": y1, "width": x2 - x1, "height": y2 - y1}
+        if command == "isElementDisplayed":
+            return True
+        if command == "isElementEnabled":
+            return element.enabled
+        raise FakeAppiumError(404, "unknown command", command)
@@ -0,0 +1,90 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+# Scripted reply: (HTTP status, JSON body)
+Reply = Tuple[int, Dict[str, Any]]
+
+
+class FakeWebhookServer:
+    """
+    [Local Webhook Stand-in]
+    Lark/DingTalk-style webhook endpoint for exercising NotificationDispatcher
+    offline. Records every received payload; replies come from `replies` in order
+    (then `default_reply`), each after `latency` seconds.
+
+    Usage:
+        with FakeWebhookServer(replies=[(500, {}), (200, {"code": 9499, "msg": "too many request"})]) as hook:
+            NotifyHelper.send_test_report(summary, webhook_url=hook.url)
+            ...
+            assert hook.received[-1]["msg_type"] == "interactive"
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, replies: Optional[List[Reply]] = None,
+                 default_reply: Reply = (200, {"code": 0, "msg": "success"}), latency: float = 0.0):
+        self.replies: List[Reply] = list(replies or [])
+        self.default_reply = default_reply
+        self.latency = latency
+        self.received: List[Dict[str, Any]] = []
+        self.requests = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with fake._lock:
+                    fake.connections += 1
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                if fake.latency:
+                    time.sleep(fake.latency)
+                with fake._lock:
+                    fake.requests += 1
+                    status, reply = fake.replies.pop(0) if fake.replies else fake.default_reply
+                    if status == 200 and not reply.get("code") and not reply.get("errcode"):
+                        fake.received.append(json.loads(body or b"{}"))
+                data = json.dumps(reply).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    @property
+    def url(self) -> str:
+        return f"http://{self._server.server_address[0]}:{self.port}/open-apis/bot/v2/hook/lark-test"
+
+    def start(self) -> "FakeWebhookServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -1,5 +1,7 @@
 import time
-from typing import Optional, List
+from typing import Dict, Optional, List
+import cv2
+import numpy as np
 from appium.webdriver.common.appiumby import AppiumBy
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.remote.webelement import WebElement
@@ -9,6 +11,10 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException,
 
 from config.global_config import GlobalConfig
 from utils.logger import logger
+from utils.tracer import tracer
+from utils.wait_stats import get_wait_stats
+from utils.screen_frame import ScreenFrame, capture_frame
+from utils.page_snapshot import PageSnapshot, SnapshotElement, UnsupportedLocatorError
 from pages.mixins.action_mixin import ActionMixin
 
 class BasePage(ActionMixin):
@@ -21,6 +27,7 @@ class BasePage(ActionMixin):
         super().__init__(driver)
         self.driver = driver
         self.wait = WebDriverWait(self.driver, GlobalConfig.EXPLICIT_WAIT)
+        self._raw_capture = True
 
     def find_element(self, locator: tuple, timeout: Optional[int] = None) -> WebElement:
         """
@@ -28,13 +35,45 @@ class BasePage(ActionMixin):
         :param locator: Tuple (By, "value") e.g., (AppiumBy.ID, "com.example:id/btn")
         :param timeout: Optional override for timeout
         """
-        wait = WebDriverWait(self.driver, timeout) if timeout else self.wait
         try:
-            return wait.until(EC.presence_of_element_located(locator))
+            return self._wait_until(locator, EC.presence_of_element_located(locator), timeout)
         except TimeoutException:
             logger.error(f"Element not found within timeout: {locator}")
             raise
 
+    @tracer.traced(category="wait")
+    def _wait_until(self, locator: tuple, condition, timeout: Optional[float] = None):
+        """
+        Runs an explicit wait for `condition`. With ADAPTIVE_WAIT, the timeout and poll
+        interval come from the locator's recorded latencies (unless `timeout` is given)
+        and every appearance/miss is recorded.
+        """
+        if not GlobalConfig.ADAPTIVE_WAIT:
+            wait = WebDriverWait(self.driver, timeout) if timeout else self.wait
+            return wait.until(condition)
+
+        stats = get_wait_stats()
+        page = type(self).__name__
+        device = self._device_key()
+        learned_timeout, poll = stats.get_wait(page, device, locator)
+        wait = WebDriverWait(self.driver, timeout or learned_timeout, poll_frequency=poll)
+        start = time.monotonic()
+        try:
+            result = wait.until(condition)
+        except TimeoutException:
+            # Only misses under the learned timeout count towards backing it off
+            stats.record_miss(page, device, locator, learned=not timeout)
+            raise
+        stats.record(page, device, locator, time.monotonic() - start)
+        return result
+
+    def _device_id(self) -> Optional[str]:
+        caps = getattr(self.driver, "capabilities", None) or {}
+        return caps.get("udid") or caps.get("deviceUDID") or caps.get("deviceName")
+
+    def _device_key(self) -> str:
+        return str(self._device_id() or "unknown")
+
     def find_elements(self, locator: tuple, timeout: Optional[int] = None) -> List[WebElement]:
         """
         Finds multiple elements.
@@ -46,24 +85,26 @@ class BasePage(ActionMixin):
             logger.warning(f"No elements found for: {locator}")
             return []
 
+    @tracer.traced(category="page")
     def click_element(self, locator: tuple):
         """
         Waits for element to be clickable and clicks it.
         """
-        logger.info(f"Clicking element: {locator}")
+        logger.info("Clicking element: {}", locator)
         try:
-            element = self.wait.until(EC.element_to_be_clickable(locator))
+            element = self._wait_until(locator, EC.element_to_be_clickable(locator))
             element.click()
         except Exception as e:
             logger.error(f"Failed to click element {locator}: {e}")
             raise
 
+    @tracer.traced(category="page")
     def input_text(self, locator: tuple, text: str, clear: bool = True):
         """
          inputs text into an element.
         :param clear: If True, clears the field before typing.
         """
-        logger.info(f"Inputting text '{text}' into {locator}")
+        logger.info("Inputting text '{}' into {}", text, locator)
         try:
             element = self.find_element(locator)
             if clear:
@@ -74,6 +115,7 @@ class BasePage(ActionMixin):
             logger.error(f"Failed to input text into {locator}: {e}")
             raise
 
+    @tracer.traced(category="page")
     def get_text(self, locator: tuple) -> str:
         """
         Retrieves text from an element, falling back to content-desc if text is empty.
@@ -100,6 +142,47 @@ class BasePage(ActionMixin):
             logger.error(f"Failed to get attribute {attribute} from {locator}: {e}")
             return ""
 
+    @tracer.traced(category="page")
+    def take_snapshot(self, refresh: bool = False) -> PageSnapshot:
+        """
+        Returns the cached page-source snapshot, fetching a new one if needed.
+        The cache belongs to the driver: any UI-changing command sent through it, from
+        any page object (clicks, text input, gestures, back, key codes, app switches),
+        makes the next call fetch again.
+        """
+        snapshot = None if refresh else self._snapshots.get()
+        if snapshot is None:
+            generation = self._snapshots.generation
+            snapshot = PageSnapshot(self.driver.page_source)
+            self._snapshots.put(generation, snapshot)
+        return snapshot
+
+    @tracer.traced(category="page")
+    def read_many(self, locators: List[tuple], refresh: bool = False) -> Dict[tuple, Optional[SnapshotElement]]:
+        """
+        Resolves many locators from a single page-source fetch.
+        Returns {locator: SnapshotElement or None}; each element exposes .text, .bounds,
+        .center and .get_attribute(). No waiting is done - elements must already be on screen.
+        Locators the snapshot cannot evaluate fall back to a live lookup.
+        """
+        snapshot = self.take_snapshot(refresh=refresh)
+        results = {}
+        for locator in locators:
+            try:
+                results[locator] = snapshot.find(locator)
+            except UnsupportedLocatorError:
+                results[locator] = self._read_live(locator)
+        return results
+
+    def _read_live(self, locator: tuple) -> Optional[SnapshotElement]:
+        elements = self.driver.find_elements(*locator)
+        if not elements:
+            return None
+        element = elements[0]
+        attributes = {name: element.get_attribute(name) or ""
+                      for name in ("text", "content-desc", "resource-id", "class", "bounds")}
+        return SnapshotElement(attributes["class"] or "live", attributes)
+
     def is_element_exist(self, locator: tuple, timeout: int = 3) -> bool:
         """
         Checks if an element exists without raising exception.
@@ -110,6 +193,41 @@ class BasePage(ActionMixin):
         except (TimeoutException, NoSuchElementException):
             return False
 
+    @tracer.traced(category="wait")
+    def wait_for_any(self, locators: List[tuple], timeout: Optional[float] = None,
+                     poll_interval: float = 0.25) -> Optional[tuple]:
+        """
+        Waits until any of the locators is present and returns the one that matched.
+        All candidates are checked against one page-source fetch per tick, so the worst
+        case is a single timeout instead of N x timeout.
+        If several match in the same tick, the earliest in `locators` wins.
+        Returns None on timeout.
+        """
+        timeout = GlobalConfig.EXPLICIT_WAIT if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                snapshot = self.take_snapshot(refresh=True)
+            except Exception as e:
+                # Page source can fail transiently during transitions
+                logger.debug(f"wait_for_any: page source unavailable ({e})")
+                snapshot = None
+
+            for locator in locators:
+                try:
+                    found = snapshot.find(locator) if snapshot else bool(self.driver.find_elements(*locator))
+                except UnsupportedLocatorError:
+                    found = bool(self.driver.find_elements(*locator))
+                if found:
+                    logger.debug("wait_for_any matched: {}", locator)
+                    return locator
+
+            if time.monotonic() >= deadline:
+                logger.warning(f"None of {len(locators)} locators appeared within {timeout}s: {locators}")
+                return None
+            time.sleep(min(poll_interval, max(deadline - time.monotonic(), 0)))
+
+    @tracer.traced(category="capture")
     def save_screenshot(self, name: str):
         """
         Saves a screenshot to the reports directory.
@@ -131,6 +249,70 @@ class BasePage(ActionMixin):
         except Exception as e:
             logger.error(f"Failed to save screenshot: {e}")
 
+    @tracer.traced(category="capture")
+    def capture_frame(self) -> ScreenFrame:
+        """
+        Captures the screen as a ScreenFrame using GlobalConfig.CAPTURE_BACKEND
+        ("appium" screenshot or raw "adb" screencap).
+        """
+        return capture_frame(self.driver, GlobalConfig.CAPTURE_BACKEND, self._device_id())
+
+    def _capture_cheapest(self) -> ScreenFrame:
+        """
+        Raw adb screencap when the device id is known (no PNG encode, base64 or decode),
+        else an Appium screenshot, whatever CAPTURE_BACKEND says. After one failed adb
+        capture the page sticks to Appium screenshots.
+        """
+        device_id = self._device_id()
+        if device_id and self._raw_capture:
+            try:
+                return ScreenFrame.capture_adb(device_id)
+            except Exception as e:
+                logger.debug(f"Raw adb capture unavailable for {device_id}, using Appium screenshots: {e}")
+                self._raw_capture = False
+        return ScreenFrame.from_png(self.driver.get_screenshot_as_png())
+
+    @tracer.traced(category="wait")
+    def wait_until_stable(self, region: Optional[tuple] = None, threshold: float = 0.005,
+                          timeout: float = 5.0, scale: float = 0.125, stable_frames: int = 1) -> float:
+        """
+        Waits until the screen stops changing (animations, transitions, scroll inertia)
+        instead of a fixed time.sleep.
+        Captures small grayscale frames back to back (raw adb screencap when possible)
+        and returns as soon as `stable_frames` consecutive pairs differ by less than
+        `threshold` (mean absolute difference, 0.0-1.0).
+        :param region: Optional percent rectangle (left, top, right, bottom) to watch.
+        :return: Seconds the screen took to settle (a UI latency metric).
+        :raises TimeoutException: If the screen is still changing after `timeout` seconds.
+        """
+        from utils.cv_helper import CVHelper
+
+        def grab() -> np.ndarray:
+            small = self._capture_cheapest().downscale(scale)
+            if region:
+                x, y, w, h = CVHelper.roi_to_rect(region, small.shape[1], small.shape[0])
+                small = small[y:y + h, x:x + w]
+            return small
+
+        start = time.monotonic()
+        previous = grab()
+        stable = 0
+        while True:
+            current = grab()
+            elapsed = time.monotonic() - start
+            diff = float(cv2.absdiff(current, previous).mean()) / 255.0 if current.shape == previous.shape else 1.0
+            if diff < threshold:
+                stable += 1
+                if stable >= stable_frames:
+                    logger.debug(f"Screen settled in {elapsed:.2f}s (diff {diff:.4f})")
+                    return elapsed
+            else:
+                stable = 0
+            if elapsed >= timeout:
+                logger.warning(f"Screen did not settle within {timeout}s (last diff {diff:.4f})")
+                raise TimeoutException(f"Screen did not settle within {timeout}s (last diff {diff:.4f})")
+            previous = current
+
     def tap_by_coordinates(self, x_pct: float, y_pct: float):
         """
         Taps at coordinates specified as percentages of screen width and height.
@@ -139,31 +321,62 @@ class BasePage(ActionMixin):
         y = int(self.height * y_pct)
         self.tap_coordinates(x, y)
 
-    def find_image_element(self, template_name: str, threshold: float = 0.8):
+    @tracer.traced(category="cv")
+    def find_image_element(self, template_name: str, threshold: float = 0.8,
+                           roi: Optional[tuple] = None, pyramid: Optional[bool] = None):
         """
         Finds an element by image template matching.
         Returns an object that has a .click() method to simulate element-like behavior.
+        :param roi: Optional percent rectangle (left, top, right, bottom), e.g. (0, 0.8, 1, 1) for the bottom bar.
+        :param pyramid: Coarse-to-fine matching; defaults to GlobalConfig.CV_PYRAMID.
         """
         from utils.cv_helper import CVHelper
         from utils.file_helper import FileHelper
         
         template_path = str(GlobalConfig.PROJECT_ROOT / "data" / "templates" / template_name)
-        screenshot_bytes = self.driver.get_screenshot_as_png()
-        
-        coords = CVHelper.find_image_center(template_path, screenshot_bytes, threshold)
+        frame = self.capture_frame()
+
+        coords = CVHelper.find_image_center(template_path, frame, threshold, roi=roi, pyramid=pyramid)
         if coords:
-            class MockElement:
-                def __init__(self, page, x, y):
-                    self.page = page
-                    self.x = x
-                    self.y = y
-                def click(self):
-                    self.page.tap_coordinates(self.x, self.y)
-            
-            return MockElement(self, coords[0], coords[1])
+            return ImageElement(self, coords[0], coords[1])
         else:
             raise NoSuchElementException(f"Could not find image template: {template_name}")
-    
+
+    @tracer.traced(category="cv")
+    def find_image_elements(self, template_names: List[str], threshold: float = 0.8,
+                            roi: Optional[tuple] = None, pyramid: Optional[bool] = None) -> Dict[str, Optional["ImageElement"]]:
+        """
+        Finds several image templates on one screenshot.
+        The frame is captured and decoded once, then all templates are matched in parallel.
+        Returns {template_name: ImageElement or None}.
+        """
+        from utils.cv_helper import CVHelper
+
+        template_dir = GlobalConfig.PROJECT_ROOT / "data" / "templates"
+        paths = {name: str(template_dir / name) for name in template_names}
+        frame = self.capture_frame()
+
+        matches = CVHelper.find_images(list(paths.values()), frame, threshold, roi=roi, pyramid=pyramid)
+        results = {}
+        for name, path in paths.items():
+            coords = matches.get(path)
+            results[name] = ImageElement(self, coords[0], coords[1]) if coords else None
+        return results
+
+    @tracer.traced(category="cv")
+    def identify_screen(self, max_distance: Optional[int] = None) -> Optional[str]:
+        """
+        Identifies the current screen from a single capture by perceptual hash
+        (see utils.screen_index). Cheaper than probing several locators or templates
+        when a workflow needs to route or recover.
+        Returns the screen name, or None if it matches no reference screenshot.
+        """
+        from utils.cv_helper import CVHelper
+
+        screen = CVHelper.identify_screen(self.capture_frame(), max_distance)
+        logger.info(f"Current screen: {screen or 'unknown'}")
+        return screen
+
     def format_locator(self, locator: tuple, *args) -> tuple:
         """
         Formats a dynamic locator with arguments.
@@ -171,3 +384,14 @@ class BasePage(ActionMixin):
         return (locator[0], locator[1].format(*args))
 
 
+class ImageElement:
+    """
+    Element-like result of image matching: exposes the match center and a .click().
+    """
+    def __init__(self, page: BasePage, x: int, y: int):
+        self.page = page
+        self.x = x
+        self.y = y
+
+    def click(self):
+        self.page.tap_coordinates(self.x, self.y)
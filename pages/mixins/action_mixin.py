@@ -6,6 +6,8 @@ from selenium.webdriver.common.actions.action_builder import ActionBuilder
 from selenium.webdriver.common.actions.pointer_input import PointerInput
 from selenium.webdriver.remote.webdriver import WebDriver
 from utils.logger import logger
+from utils.page_snapshot import SnapshotCache, snapshot_cache
+from utils.tracer import tracer
 
 class ActionMixin:
     """
@@ -16,6 +18,16 @@ class ActionMixin:
         self.driver = driver
         # Screen dimensions cache
         self._window_size = None
+        # Page-source snapshot cache, shared per driver (see BasePage.read_many)
+        self._snapshots: SnapshotCache = snapshot_cache(driver)
+
+    def invalidate_snapshot(self):
+        """
+        Drops the driver's cached page-source snapshot. Commands sent through the
+        driver do this by themselves; call it after changing the screen another way
+        (e.g. adb input).
+        """
+        self._snapshots.invalidate()
 
     @property
     def window_size(self) -> dict:
@@ -31,6 +43,7 @@ class ActionMixin:
     def height(self) -> int:
         return self.window_size.get('height', 0)
 
+    @tracer.traced(category="action")
     def swipe_percentage(self, start_x: float, start_y: float, end_x: float, end_y: float, duration_ms: int = 500):
         """
         Swipe from start percentage to end percentage of screen size.
@@ -41,7 +54,7 @@ class ActionMixin:
         x_end = int(self.width * end_x)
         y_end = int(self.height * end_y)
 
-        logger.debug(f"Swiping from ({x_start}, {y_start}) to ({x_end}, {y_end})")
+        logger.debug("Swiping from ({}, {}) to ({}, {})", x_start, y_start, x_end, y_end)
 
         actions = ActionChains(self.driver)
         # The w3c_actions attribute is already an ActionBuilder instance
@@ -68,9 +81,10 @@ class ActionMixin:
         """Swipe from left to right"""
         self.swipe_percentage(0.1, 0.5, 0.9, 0.5, duration_ms)
 
+    @tracer.traced(category="action")
     def tap_coordinates(self, x: int, y: int):
         """Tap at specific x, y coordinates"""
-        logger.debug(f"Tapping at ({x}, {y})")
+        logger.debug("Tapping at ({}, {})", x, y)
         actions = ActionChains(self.driver)
         # The w3c_actions attribute is already an ActionBuilder instance
         actions.w3c_actions.pointer_action.move_to_location(x, y)
@@ -0,0 +1,140 @@
+import json
+import os
+import allure
+import pytest
+
+from config.global_config import GlobalConfig
+from drivers.command_metrics import command_metrics, CommandMetrics
+from drivers.driver_factory import DriverFactory
+from utils.tracer import tracer
+from utils.logger import flush_logs
+from utils.notify_helper import NotifyHelper, RunProgress, close_dispatcher
+
+# Outcome counts for webhook notifications (controller process only)
+_run_progress = RunProgress()
+
+
+@pytest.fixture(scope="function")
+def driver():
+    """
+    Provides an Appium driver per test.
+    With SESSION_POOL_ENABLED a warm session is leased and returned to the pool afterwards.
+    """
+    if GlobalConfig.SESSION_POOL_ENABLED:
+        driver = DriverFactory.acquire_driver(GlobalConfig.PLATFORM_NAME)
+        yield driver
+        DriverFactory.release_driver(driver)
+    else:
+        driver = DriverFactory.start_driver(GlobalConfig.PLATFORM_NAME)
+        yield driver
+        DriverFactory.quit_driver(driver)
+
+
+@pytest.fixture(autouse=True)
+def webdriver_command_metrics(request):
+    """
+    Scopes WebDriver command histograms to the test and attaches them to Allure.
+    """
+    if not GlobalConfig.COMMAND_METRICS_ENABLED:
+        yield
+        return
+    command_metrics.start_test()
+    yield
+    summary = command_metrics.end_test(request.node.nodeid)
+    if summary["total"]["count"]:
+        allure.attach(json.dumps(summary, indent=2), name="WebDriver command latency",
+                      attachment_type=allure.attachment_type.JSON)
+
+
+@pytest.fixture(autouse=True)
+def trace_timeline(request):
+    """
+    With TRACE_ENABLED, records the test's spans (steps, waits, driver commands)
+    and writes them to reports/traces/<test>.trace.json.
+    """
+    if not tracer.enabled:
+        yield
+        return
+    tracer.start_test(request.node.nodeid)
+    with tracer.span(request.node.nodeid, "test"):
+        yield
+    tracer.flush_test(str(GlobalConfig.PROJECT_ROOT / "reports" / "traces"))
+
+
+def _command_metrics_dir():
+    return GlobalConfig.PROJECT_ROOT / "reports" / "command_metrics"
+
+
+def pytest_configure(config):
+    # One clock for every "%Y%m%d"-style data value in this run; xdist workers
+    # are spawned after this and inherit it through the environment.
+    if not hasattr(config, "workerinput"):
+        from utils.data_template import freeze_run_clock
+        freeze_run_clock()
+        # Drop raw command metrics of a previous run before workers start exporting
+        for stale in _command_metrics_dir().glob("*.json"):
+            stale.unlink(missing_ok=True)
+
+
+def pytest_collection_finish(session):
+    _run_progress.total = len(session.items)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_node_collection_finished(node, ids):
+    # Under xdist the controller does not collect; every worker reports the full id list
+    _run_progress.total = len(ids)
+
+
+def pytest_runtest_logreport(report):
+    """
+    Counts outcomes on the controller (xdist forwards worker reports) and, with
+    NOTIFY_PROGRESS_EVERY, queues a progress message every N finished tests.
+    """
+    if not GlobalConfig.WEBHOOK_URL or os.getenv("PYTEST_XDIST_WORKER"):
+        return
+    if not _run_progress.record(report.when, report.outcome):
+        return
+    every = GlobalConfig.NOTIFY_PROGRESS_EVERY
+    if every and _run_progress.done % every == 0 and _run_progress.done < _run_progress.total:
+        NotifyHelper.send_progress({**_run_progress.summary(), "done": _run_progress.done})
+
+
+def pytest_sessionstart(session):
+    if GlobalConfig.TEMPLATE_PRELOAD:
+        from utils.cv_helper import CVHelper
+        CVHelper.preload_templates()
+
+
+def pytest_sessionfinish(session, exitstatus):
+    DriverFactory.close_session_pool()
+    if GlobalConfig.ADAPTIVE_WAIT:
+        from utils.wait_stats import get_wait_stats
+        stats = get_wait_stats()
+        stats.save()
+        # Under xdist only the controller writes the report, after all workers saved
+        if not hasattr(session.config, "workerinput"):
+            stats.write_report(str(GlobalConfig.PROJECT_ROOT / "reports" / "wait_stats_report.json"))
+    if GlobalConfig.COMMAND_METRICS_ENABLED:
+        workerinput = getattr(session.config, "workerinput", None)
+        worker = workerinput["workerid"] if workerinput else "main"
+        command_metrics.export(str(_command_metrics_dir() / f"{worker}.json"))
+        if workerinput is None:
+            CommandMetrics.merge_exports(str(_command_metrics_dir() / "*.json"),
+                                         str(GlobalConfig.PROJECT_ROOT / "reports" / "command_metrics.json"))
+    if GlobalConfig.WEBHOOK_URL and not hasattr(session.config, "workerinput"):
+        NotifyHelper.send_test_report(_run_progress.summary())
+        # Bounded by NOTIFY_FLUSH_TIMEOUT; what is left goes to the spill file
+        close_dispatcher()
+    # Drain queued records (LOG_MODE=async) before the process exits
+    flush_logs()
+
+
+def pytest_xdist_auto_num_workers(config):
+    """
+    With PARALLEL_MODE, `pytest -n auto` starts one worker per connected device.
+    """
+    if GlobalConfig.PARALLEL_MODE:
+        from drivers.device_allocator import DeviceAllocator
+        return max(len(DeviceAllocator.discover_devices()), 1)
+    return None
@@ -0,0 +1,108 @@
+import subprocess
+import time
+
+import allure
+import pytest
+
+from config.global_config import GlobalConfig
+from mocks.fake_adb_server import FakeADBServer
+from utils.adb_client import ADBClient, ADBConnectError, ADBError
+from utils.adb_helper import ADBHelper
+
+DEVICE = "emulator-5554"
+
+
+@pytest.fixture
+def adb_server():
+    with FakeADBServer(devices=[DEVICE], shell={
+        "echo hi": b"hi\n",
+        "pm install /data/local/tmp/app.apk": lambda cmd: time.sleep(0.5) or b"Success\n",
+        "reboot": lambda cmd: None,  # device drops the connection mid-command
+    }) as server:
+        yield server
+
+
+@pytest.fixture
+def socket_backend(adb_server, monkeypatch):
+    """Routes ADBHelper through the fake server; any subprocess fallback is recorded."""
+    fallbacks = []
+
+    def fake_check_output(cmd, *args, **kwargs):
+        fallbacks.append(cmd)
+        return b"from adb binary"
+
+    monkeypatch.setattr(GlobalConfig, "ADB_BACKEND", "socket")
+    monkeypatch.setattr(ADBHelper, "_client", ADBClient(port=adb_server.port, timeout=0.2))
+    monkeypatch.setattr(subprocess, "check_output", fake_check_output)
+    yield fallbacks
+    ADBHelper._client.close()
+
+
+@allure.feature("ADB Socket Backend")
+class TestADBClient:
+
+    @allure.story("Host and shell services")
+    def test_devices_and_shell(self, adb_server):
+        client = ADBClient(port=adb_server.port)
+        assert client.devices() == [(DEVICE, "device")]
+        assert client.shell("echo hi", DEVICE) == b"hi\n"
+        assert adb_server.commands[-2:] == [f"host:transport:{DEVICE}", "shell:echo hi"]
+
+    @allure.story("Sync sessions are pooled")
+    def test_push_pull_reuses_sync_connection(self, adb_server):
+        client = ADBClient(port=adb_server.port)
+        payload = bytes(range(256)) * 1024
+        client.push_bytes(payload, "/sdcard/a.bin", DEVICE)
+        client.push_bytes(b"second", "/sdcard/b.bin", DEVICE)
+        assert client.pull_bytes("/sdcard/a.bin", DEVICE) == payload
+        assert adb_server.commands.count("sync:") == 1
+        client.close()
+
+    @allure.story("Protocol errors")
+    def test_unknown_device_raises_adb_error(self, adb_server):
+        with pytest.raises(ADBError, match="not found"):
+            ADBClient(port=adb_server.port).shell("echo hi", "emulator-9999")
+
+    @allure.story("Protocol errors")
+    def test_unreachable_server_raises_connect_error(self, adb_server):
+        port = adb_server.port
+        adb_server.stop()
+        with pytest.raises(ADBConnectError):
+            ADBClient(port=port, timeout=0.5).shell("echo hi", DEVICE)
+
+
+@allure.feature("ADB Socket Backend")
+class TestADBHelperFallback:
+
+    @allure.story("Socket path")
+    def test_commands_use_socket(self, socket_backend):
+        assert ADBHelper.execute_adb_command("shell echo hi", DEVICE) == "hi"
+        assert ADBHelper.get_connected_devices() == [DEVICE]
+        assert socket_backend == []
+
+    @allure.story("Fallback")
+    def test_falls_back_when_server_unreachable(self, socket_backend, adb_server):
+        adb_server.stop()
+        assert ADBHelper.execute_adb_command("shell echo hi", DEVICE) == "from adb binary"
+        assert ADBHelper.exec_out_bytes("screencap", DEVICE) == b"from adb binary"
+        assert len(socket_backend) == 2
+
+    @allure.story("Long-running commands")
+    def test_slow_command_returns_output(self, socket_backend):
+        # The reply takes longer than the client timeout, which only bounds connect/handshake
+        assert ADBHelper.execute_adb_command("shell pm install /data/local/tmp/app.apk", DEVICE) == "Success"
+        assert ADBHelper.exec_out_bytes("pm install /data/local/tmp/app.apk", DEVICE) == b"Success\n"
+        assert socket_backend == []
+
+    @allure.story("Fallback")
+    def test_sent_command_is_never_rerun(self, socket_backend, adb_server):
+        # The connection drops after the command was sent: it may have run already
+        assert ADBHelper.execute_adb_command("shell reboot", DEVICE) == ""
+        assert ADBHelper.exec_out_bytes("reboot", DEVICE) == b""
+        assert socket_backend == []
+        assert adb_server.commands.count("shell:reboot") == 1
+
+    @allure.story("Fallback")
+    def test_device_error_is_not_retried_via_subprocess(self, socket_backend):
+        assert ADBHelper.execute_adb_command("shell echo hi", "emulator-9999") == ""
+        assert socket_backend == []
@@ -0,0 +1,124 @@
+import asyncio
+import threading
+import time
+
+import allure
+import pytest
+
+from config.global_config import GlobalConfig
+from mocks.fake_adb_server import FakeADBServer
+from utils.async_adb_helper import AsyncADBHelper
+
+DEVICES = ["emulator-5554", "emulator-5556", "emulator-5558", "emulator-5560"]
+IME = "com.example.ime/.Keyboard"
+
+
+class ConcurrencyProbe:
+    """Fake shell reply that records how many commands the server runs at once."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, cmd: str) -> bytes:
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return b"done\n"
+
+
+@pytest.fixture
+def probe():
+    return ConcurrencyProbe(delay=0.1)
+
+
+@pytest.fixture
+def adb_server(probe, monkeypatch):
+    with FakeADBServer(devices=DEVICES, shell={
+        "work": probe,
+        "sleep 5": lambda cmd: time.sleep(1) or b"",
+        "reboot": lambda cmd: None,  # device drops the connection mid-command
+        f"ime set {IME}": f"Input method {IME} selected for user #0\n".encode(),
+        "ime set bad/.Ime": b"Unknown input method bad/.Ime cannot be selected for user #0\n",
+        "svc wifi enable": b"",
+        "svc wifi disable": b"Unknown command: disable\n",
+    }) as server:
+        monkeypatch.setattr(GlobalConfig, "ADB_BACKEND", "socket")
+        monkeypatch.setattr(GlobalConfig, "ADB_SERVER_PORT", server.port)
+        yield server
+
+
+@pytest.fixture
+def subprocess_calls(monkeypatch):
+    """Records commands that fall back to the adb binary instead of running it."""
+    calls = []
+
+    async def fake_subprocess(cmd, device_id):
+        calls.append((cmd, device_id))
+        return "from adb binary"
+
+    monkeypatch.setattr(AsyncADBHelper, "_execute_via_subprocess", staticmethod(fake_subprocess))
+    return calls
+
+
+@allure.feature("Async Fleet Operations (FakeADBServer)")
+class TestFanOut:
+
+    @allure.story("Bounded concurrency")
+    def test_concurrency_is_bounded(self, adb_server, probe):
+        fleet = AsyncADBHelper(concurrency=2)
+        results = asyncio.run(fleet.run_on_all("shell work"))
+        assert results.ok
+        assert results.values_by_device() == {d: "done" for d in DEVICES}
+        assert probe.peak == 2
+
+    @allure.story("Per-device timeout")
+    def test_slow_device_times_out_alone(self, adb_server):
+        fleet = AsyncADBHelper(timeout=0.3)
+
+        async def op(device_id: str) -> str:
+            cmd = "shell sleep 5" if device_id == DEVICES[0] else "shell work"
+            return await fleet.execute_adb_command(cmd, device_id)
+
+        results = asyncio.run(fleet.fan_out(op, DEVICES))
+        assert results.failed == {DEVICES[0]: "timed out after 0.3s"}
+        assert results.succeeded == DEVICES[1:]
+        assert results[DEVICES[0]].duration < 0.6
+
+    @allure.story("Per-device errors")
+    def test_failing_device_among_healthy_ones(self, adb_server):
+        results = asyncio.run(AsyncADBHelper().run_on_all("shell work", DEVICES + ["emulator-9999"]))
+        assert results.succeeded == DEVICES
+        assert "not found" in results.failed["emulator-9999"]
+        with pytest.raises(RuntimeError, match="1 device"):
+            results.raise_for_failures()
+
+    @allure.story("Per-device errors")
+    def test_error_replies_are_failures(self, adb_server):
+        fleet = AsyncADBHelper()
+        assert asyncio.run(fleet.set_ime(IME, DEVICES)).ok
+        assert asyncio.run(fleet.toggle_wifi(True, DEVICES)).ok
+
+        results = asyncio.run(fleet.set_ime("bad/.Ime", DEVICES))
+        assert results.succeeded == []
+        assert "Unknown input method" in results.failed[DEVICES[0]]
+        assert not asyncio.run(fleet.toggle_wifi(False, DEVICES)).ok
+
+    @allure.story("Fallback")
+    def test_unreachable_server_falls_back_to_subprocess(self, adb_server, subprocess_calls):
+        adb_server.stop()
+        results = asyncio.run(AsyncADBHelper().run_on_all("shell work", DEVICES[:2]))
+        assert results.values_by_device() == {d: "from adb binary" for d in DEVICES[:2]}
+        assert subprocess_calls == [("shell work", d) for d in DEVICES[:2]]
+
+    @allure.story("Fallback")
+    def test_sent_command_is_never_rerun(self, adb_server, subprocess_calls):
+        results = asyncio.run(AsyncADBHelper().run_on_all("shell reboot", DEVICES[:1]))
+        assert results.ok
+        assert subprocess_calls == []
+        assert adb_server.commands.count("shell:reboot") == 1
@@ -0,0 +1,37 @@
+from datetime import datetime
+
+import allure
+import pytest
+
+from utils import data_template
+from utils.data_template import CompiledTemplate
+
+CLOCK = datetime(2026, 3, 5, 7, 8, 9)
+
+
+@allure.feature("Data Templates")
+class TestDynamicValues:
+
+    @allure.story("Directives")
+    @pytest.mark.parametrize("value, rendered", [
+        ("User_%Y%m%d", "User_20260305"),
+        ("%T", "07:08:09"),
+        ("%D", "03/05/26"),
+        ("%e", " 5"),
+        ("%-d.%-m.", "5.3."),
+        ("%s", str(int(CLOCK.timestamp()))),
+        ("50% off", "50% off"),
+        ("100%%", "100%"),
+    ])
+    def test_render(self, value, rendered):
+        assert CompiledTemplate({"v": value}).render(CLOCK) == {"v": rendered}
+
+    @allure.story("Directives")
+    def test_unknown_directive_stays_literal_and_warns_once(self, monkeypatch):
+        warnings = []
+        monkeypatch.setattr(data_template.logger, "warning", warnings.append)
+        monkeypatch.setattr(data_template, "_warned_values", set())
+        for _ in range(2):
+            assert CompiledTemplate(["code_%q_%Y"]).render(CLOCK) == ["code_%q_2026"]
+        assert len(warnings) == 1
+        assert "%q" in warnings[0]
@@ -0,0 +1,88 @@
+import allure
+import pytest
+
+from config.global_config import GlobalConfig
+from drivers.device_allocator import DeviceAllocator
+from testcases.conftest import pytest_xdist_auto_num_workers
+from utils.adb_helper import ADBHelper
+
+CONNECTED = ["emulator-5556", "R58M123ABC", "emulator-5554"]
+
+
+@pytest.fixture(autouse=True)
+def parallel(monkeypatch):
+    """PARALLEL_MODE on, devices from adb, fixed port bases and no cached assignment."""
+    monkeypatch.setattr(GlobalConfig, "PARALLEL_MODE", True)
+    monkeypatch.setattr(GlobalConfig, "PARALLEL_DEVICES", "")
+    monkeypatch.setattr(GlobalConfig, "APPIUM_PORT", 4723)
+    monkeypatch.setattr(GlobalConfig, "PARALLEL_APPIUM_PORT_STEP", 2)
+    monkeypatch.setattr(GlobalConfig, "SYSTEM_PORT_BASE", 8200)
+    monkeypatch.setattr(GlobalConfig, "MJPEG_PORT_BASE", 7810)
+    monkeypatch.setattr(ADBHelper, "get_connected_devices", staticmethod(lambda: list(CONNECTED)))
+    monkeypatch.setattr(DeviceAllocator, "_assignment", None)
+    monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+    return monkeypatch
+
+
+@allure.feature("Parallel Device Allocation")
+class TestDeviceAllocator:
+
+    @allure.story("Worker index")
+    @pytest.mark.parametrize("worker, index", [("gw0", 0), ("gw3", 3), ("gw12", 12), ("master", None)])
+    def test_worker_index(self, parallel, worker, index):
+        parallel.setenv("PYTEST_XDIST_WORKER", worker)
+        assert DeviceAllocator.get_worker_index() == index
+
+    @allure.story("Assignment")
+    @pytest.mark.parametrize("worker, device, appium, system, mjpeg", [
+        ("gw0", "R58M123ABC", 4723, 8200, 7810),
+        ("gw1", "emulator-5554", 4725, 8201, 7811),
+        ("gw2", "emulator-5556", 4727, 8202, 7812),
+    ])
+    def test_worker_gets_device_and_ports(self, parallel, worker, device, appium, system, mjpeg):
+        parallel.setenv("PYTEST_XDIST_WORKER", worker)
+        assignment = DeviceAllocator.get_assignment()
+        assert (assignment.device_id, assignment.appium_port, assignment.system_port,
+                assignment.mjpeg_server_port) == (device, appium, system, mjpeg)
+        assert DeviceAllocator.get_assignment() is assignment
+
+    @allure.story("Assignment")
+    def test_parallel_devices_overrides_adb(self, parallel):
+        parallel.setattr(GlobalConfig, "PARALLEL_DEVICES", " 10.0.0.5:5555, emulator-5554 ,")
+        parallel.setattr(ADBHelper, "get_connected_devices", staticmethod(lambda: pytest.fail("adb queried")))
+        parallel.setenv("PYTEST_XDIST_WORKER", "gw1")
+        assert DeviceAllocator.get_assignment().device_id == "emulator-5554"
+
+    @allure.story("Assignment")
+    def test_more_workers_than_devices_raises(self, parallel):
+        parallel.setenv("PYTEST_XDIST_WORKER", "gw3")
+        with pytest.raises(RuntimeError, match="gw3 has no device: only 3 connected"):
+            DeviceAllocator.get_assignment()
+
+    @allure.story("Serial runs")
+    def test_no_assignment_outside_xdist(self):
+        assert DeviceAllocator.get_assignment() is None
+
+    @allure.story("Serial runs")
+    def test_no_assignment_with_parallel_mode_off(self, parallel):
+        parallel.setattr(GlobalConfig, "PARALLEL_MODE", False)
+        parallel.setenv("PYTEST_XDIST_WORKER", "gw0")
+        assert DeviceAllocator.get_assignment() is None
+
+
+@allure.feature("Parallel Device Allocation")
+class TestAutoNumWorkers:
+
+    @allure.story("pytest -n auto")
+    def test_one_worker_per_device(self):
+        assert pytest_xdist_auto_num_workers(None) == 3
+
+    @allure.story("pytest -n auto")
+    def test_at_least_one_worker_without_devices(self, parallel):
+        parallel.setattr(ADBHelper, "get_connected_devices", staticmethod(lambda: []))
+        assert pytest_xdist_auto_num_workers(None) == 1
+
+    @allure.story("pytest -n auto")
+    def test_defers_to_xdist_with_parallel_mode_off(self, parallel):
+        parallel.setattr(GlobalConfig, "PARALLEL_MODE", False)
+        assert pytest_xdist_auto_num_workers(None) is None
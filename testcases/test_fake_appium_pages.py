@@ -0,0 +1,152 @@
+import struct
+
+import allure
+import pytest
+from appium.options.android import UiAutomator2Options
+from appium.webdriver.common.appiumby import AppiumBy
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from config.global_config import GlobalConfig
+from drivers.driver_factory import DriverFactory
+from mocks.fake_adb_server import FakeADBServer
+from mocks.fake_appium_server import FakeAppiumServer
+from pages.base_page import BasePage
+from utils.adb_client import ADBClient
+from utils.adb_helper import ADBHelper
+
+USER = (AppiumBy.ID, "com.example.app:id/username")
+LOGIN = (AppiumBy.ID, "com.example.app:id/login_button")
+TITLE = (AppiumBy.ID, "com.example.app:id/title")
+BANNER = (AppiumBy.ACCESSIBILITY_ID, "promo")
+MISSING = (AppiumBy.ID, "com.example.app:id/missing")
+
+SCREENS = {
+    "login": [
+        {"id": USER[1], "class": "android.widget.EditText"},
+        {"id": LOGIN[1], "text": "Login", "class": "android.widget.Button", "goto": "home"},
+    ],
+    "home": [
+        {"id": TITLE[1], "text": "Welcome", "appear_after": 0.3},
+        {"desc": BANNER[1], "text": "Sale", "appear_after": 0.1},
+    ],
+}
+
+
+@pytest.fixture
+def appium_server():
+    with FakeAppiumServer(SCREENS) as server:
+        yield server
+
+
+@pytest.fixture
+def fake_driver(appium_server):
+    options = UiAutomator2Options()
+    options.platform_name = "Android"
+    driver = DriverFactory.create_session(appium_server.url, options)
+    yield driver
+    driver.quit()
+
+
+@allure.feature("Page Operations (FakeAppiumServer)")
+class TestBasePageOperations:
+
+    @allure.story("Input and click")
+    def test_input_click_and_wait_for_next_screen(self, appium_server, fake_driver):
+        page = BasePage(fake_driver)
+        page.input_text(USER, "test_user_01")
+        assert page.get_text(USER) == "test_user_01"
+
+        page.click_element(LOGIN)
+        assert appium_server.current_screen(fake_driver.session_id) == "home"
+        # Title appears 0.3s after navigation; find_element waits for it
+        assert page.get_text(TITLE) == "Welcome"
+
+    @allure.story("Waits")
+    def test_wait_for_any_returns_first_to_appear(self, fake_driver):
+        page = BasePage(fake_driver)
+        page.click_element(LOGIN)
+        assert page.wait_for_any([TITLE, BANNER], timeout=2) == BANNER
+        assert page.wait_for_any([MISSING], timeout=0.3) is None
+        assert page.is_element_exist(MISSING, timeout=1) is False
+
+    @allure.story("Gestures")
+    def test_tap_coordinates_hits_element(self, appium_server, fake_driver):
+        page = BasePage(fake_driver)
+        login = page.read_many([LOGIN])[LOGIN]
+        page.tap_coordinates(*login.center)
+        assert appium_server.current_screen(fake_driver.session_id) == "home"
+
+    @allure.story("Snapshot reads")
+    def test_read_many_uses_one_page_source(self, appium_server, fake_driver):
+        page = BasePage(fake_driver)
+        results = page.read_many([USER, LOGIN, MISSING])
+        assert results[LOGIN].text == "Login"
+        assert results[MISSING] is None
+        page.read_many([USER])
+        assert appium_server.commands.count("getPageSource") == 1
+
+    @allure.story("Snapshot reads")
+    def test_snapshot_is_invalidated_by_other_pages_and_driver_commands(self, appium_server, fake_driver):
+        reader, actor = BasePage(fake_driver), BasePage(fake_driver)
+
+        def fetches():
+            return appium_server.commands.count("getPageSource")
+
+        assert reader.read_many([LOGIN])[LOGIN] is not None
+
+        actor.click_element(LOGIN)
+        assert reader.read_many([LOGIN])[LOGIN] is None
+        assert fetches() == 2
+
+        fake_driver.find_elements(*TITLE)
+        fake_driver.get_window_size()
+        reader.read_many([LOGIN])
+        assert fetches() == 2  # reads do not invalidate
+
+        fake_driver.activate_app("com.example.app")
+        reader.read_many([LOGIN])
+        assert fetches() == 3
+
+    @allure.story("Screen stability")
+    def test_wait_until_stable(self, fake_driver):
+        page = BasePage(fake_driver)
+        assert page.wait_until_stable(timeout=2) < 2
+        with pytest.raises(TimeoutException):
+            # A negative threshold can never be met
+            page.wait_until_stable(threshold=-1, timeout=0.2)
+
+    @allure.story("Screen stability")
+    def test_wait_until_stable_prefers_raw_adb_capture(self, appium_server, monkeypatch):
+        # 8x8 RGBA_8888 screencap: 12-byte header, then 4 bytes per pixel
+        raw_frame = struct.pack("<III", 8, 8, 1) + bytes(8 * 8 * 4)
+        options = UiAutomator2Options()
+        options.platform_name = "Android"
+        options.udid = "emulator-5554"
+        driver = DriverFactory.create_session(appium_server.url, options)
+        try:
+            with FakeADBServer(devices=[options.udid], shell={"screencap": raw_frame}) as adb:
+                monkeypatch.setattr(GlobalConfig, "ADB_BACKEND", "socket")
+                monkeypatch.setattr(ADBHelper, "_client", ADBClient(port=adb.port))
+                BasePage(driver).wait_until_stable(timeout=2)
+            assert adb.commands.count("exec:screencap") >= 2
+            assert "screenshot" not in appium_server.commands
+
+            page = BasePage(driver)  # adb server gone: falls back to Appium screenshots
+            page.wait_until_stable(timeout=2)
+            assert page._raw_capture is False
+            assert "screenshot" in appium_server.commands
+        finally:
+            driver.quit()
+
+    @allure.story("Injected failures")
+    def test_injected_failure_surfaces_as_webdriver_error(self):
+        with FakeAppiumServer(SCREENS, failure_rate={"clickElement": 1.0}) as server:
+            options = UiAutomator2Options()
+            options.platform_name = "Android"
+            driver = DriverFactory.create_session(server.url, options)
+            try:
+                with pytest.raises(WebDriverException, match="Injected failure"):
+                    BasePage(driver).click_element(LOGIN)
+                assert server.current_screen(driver.session_id) == "login"
+            finally:
+                driver.quit()
@@ -0,0 +1,123 @@
+import json
+import time
+
+import allure
+import pytest
+
+from config.global_config import GlobalConfig
+from mocks.fake_webhook_server import FakeWebhookServer
+from utils import notify_helper
+from utils.notify_helper import NotificationDispatcher, NotifyHelper
+
+RATE_LIMITED = (200, {"code": 9499, "msg": "too many request"})
+
+
+def make_dispatcher(spill_path, **kwargs) -> NotificationDispatcher:
+    options = {"timeout": 2.0, "min_interval": 0.0, "max_attempts": 3, "base_delay": 0.01,
+               "spill_path": str(spill_path)}
+    options.update(kwargs)
+    return NotificationDispatcher(**options)
+
+
+def read_spill(spill_path):
+    if not spill_path.exists():
+        return []
+    return [json.loads(line) for line in spill_path.read_text(encoding="utf-8").splitlines()]
+
+
+@pytest.fixture
+def spill_path(tmp_path):
+    return tmp_path / "notify_spill.jsonl"
+
+
+@allure.feature("Webhook Dispatcher (FakeWebhookServer)")
+class TestNotificationDispatcher:
+
+    @allure.story("Delivery")
+    def test_messages_share_one_connection(self, spill_path):
+        with FakeWebhookServer() as hook:
+            dispatcher = make_dispatcher(spill_path)
+            for n in range(3):
+                assert dispatcher.submit(hook.url, {"n": n})
+            assert dispatcher.flush(5)
+            dispatcher.close()
+        assert [m["n"] for m in hook.received] == [0, 1, 2]
+        assert hook.connections == 1
+        assert dispatcher.stats["sent"] == 3
+
+    @allure.story("Retry")
+    def test_server_errors_and_rate_limits_are_retried(self, spill_path):
+        with FakeWebhookServer(replies=[(500, {}), RATE_LIMITED]) as hook:
+            dispatcher = make_dispatcher(spill_path)
+            dispatcher.submit(hook.url, {"n": 1})
+            assert dispatcher.flush(5)
+            dispatcher.close()
+        assert hook.requests == 3
+        assert hook.received == [{"n": 1}]
+        assert read_spill(spill_path) == []
+
+    @allure.story("Retry")
+    def test_client_errors_are_not_retried(self, spill_path):
+        with FakeWebhookServer(replies=[(400, {})]) as hook:
+            dispatcher = make_dispatcher(spill_path)
+            dispatcher.submit(hook.url, {"n": 1})
+            assert dispatcher.flush(5)
+            dispatcher.close()
+        assert hook.requests == 1
+        assert [e["payload"] for e in read_spill(spill_path)] == [{"n": 1}]
+
+    @allure.story("Coalescing")
+    def test_queued_progress_updates_coalesce(self, spill_path):
+        with FakeWebhookServer(latency=0.3) as hook:
+            dispatcher = make_dispatcher(spill_path)
+            dispatcher.submit(hook.url, {"done": 1}, key="progress", persist=False)
+            while not hook.connections:  # wait until the worker is sending the first update
+                time.sleep(0.01)
+            dispatcher.submit(hook.url, {"done": 2}, key="progress", persist=False)
+            dispatcher.submit(hook.url, {"done": 3}, key="progress", persist=False)
+            assert dispatcher.flush(5)
+            dispatcher.close()
+        assert [m["done"] for m in hook.received] == [1, 3]
+        assert dispatcher.stats["coalesced"] == 1
+
+    @allure.story("Spill file")
+    def test_undelivered_report_is_spilled_and_replayed(self, spill_path):
+        with FakeWebhookServer(default_reply=(503, {})) as down:
+            dispatcher = make_dispatcher(spill_path, max_attempts=2)
+            dispatcher.submit(down.url, {"report": 1})
+            assert dispatcher.flush(5)
+            dispatcher.close()
+        assert len(read_spill(spill_path)) == 1
+
+        with FakeWebhookServer() as hook:
+            entry = read_spill(spill_path)[0]
+            entry["url"] = hook.url  # same webhook, back up on a new port
+            spill_path.write_text(json.dumps(entry) + "\n", encoding="utf-8")
+            dispatcher = make_dispatcher(spill_path)
+            assert dispatcher.flush(5)
+            dispatcher.close()
+        assert hook.received == [{"report": 1}]
+        assert dispatcher.stats["replayed"] == 1
+        assert not spill_path.exists()
+
+    @allure.story("Spill file")
+    def test_close_spills_message_still_in_flight(self, spill_path):
+        with FakeWebhookServer(latency=1.0) as slow:
+            dispatcher = make_dispatcher(spill_path)
+            dispatcher.submit(slow.url, {"report": 1})
+            dispatcher.submit(slow.url, {"report": 2})
+            dispatcher.close(timeout=0.2)
+            assert [e["payload"] for e in read_spill(spill_path)] == [{"report": 1}, {"report": 2}]
+
+
+@allure.feature("Webhook Dispatcher (FakeWebhookServer)")
+class TestNotifyHelperSync:
+
+    @allure.story("Synchronous mode")
+    def test_sync_report_does_not_start_dispatcher(self, monkeypatch):
+        monkeypatch.setattr(GlobalConfig, "NOTIFY_ASYNC", False)
+        monkeypatch.setattr(notify_helper, "_dispatcher", None)
+        with FakeWebhookServer() as hook:
+            assert NotifyHelper.send_test_report({"total": 2, "passed": 2, "failed": 0}, webhook_url=hook.url)
+        assert hook.received[0]["msg_type"] == "interactive"
+        assert notify_helper._dispatcher is None
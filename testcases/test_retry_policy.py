@@ -0,0 +1,222 @@
+import allure
+import pytest
+
+from config.global_config import GlobalConfig
+from utils.decorators import retry
+from utils.retry_policy import (CircuitBreaker, CircuitOpenError, RetryPolicy, get_circuit_breaker,
+                                is_outage, reset_circuit_breakers)
+
+
+class FakeClock:
+    """Monotonic clock that only moves when the code under test sleeps (or the test advances it)."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class Failing:
+    """Callable that raises the given errors in order, then returns "ok"."""
+
+    def __init__(self, *errors: BaseException):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def make_policy(clock: FakeClock, **kwargs) -> RetryPolicy:
+    options = {"max_attempts": 3, "base_delay": 1.0, "multiplier": 2.0, "jitter": 0.0}
+    options.update(kwargs)
+    return RetryPolicy(clock=clock, sleep=clock.sleep, **options)
+
+
+@allure.feature("Retry Policy")
+class TestRetryPolicy:
+
+    @allure.story("Backoff")
+    def test_backoff_doubles_up_to_max_delay(self, clock):
+        policy = make_policy(clock, max_attempts=6, max_delay=5.0)
+        func = Failing(*[ConnectionError("refused")] * 6)
+        with pytest.raises(ConnectionError):
+            policy.call(func)
+        assert func.calls == 6
+        assert clock.sleeps == [1.0, 2.0, 4.0, 5.0, 5.0]
+
+    @allure.story("Backoff")
+    def test_jitter_only_shortens_delays(self):
+        policy = RetryPolicy(base_delay=1.0, multiplier=2.0, jitter=0.5)
+        for attempt in range(4):
+            full = 2.0 ** attempt
+            assert all(full / 2 <= policy.compute_delay(attempt) <= full for _ in range(50))
+
+    @allure.story("Backoff")
+    def test_success_after_retries_returns_value(self, clock):
+        func = Failing(TimeoutError(), ConnectionError())
+        assert make_policy(clock).call(func) == "ok"
+        assert func.calls == 3
+
+    @allure.story("Deadline")
+    def test_deadline_stops_before_oversleeping(self, clock):
+        policy = make_policy(clock, max_attempts=10, deadline=4.0)
+        func = Failing(*[ConnectionError()] * 10)
+        with pytest.raises(ConnectionError):
+            policy.call(func)
+        # Slept 1 + 2; the next 4s delay would end past the 4s deadline
+        assert clock.sleeps == [1.0, 2.0]
+        assert func.calls == 3
+
+    @allure.story("Classification")
+    @pytest.mark.parametrize("error", [AssertionError("bad"), ValueError("bad"), KeyError("bad")])
+    def test_fatal_errors_are_not_retried(self, clock, error):
+        func = Failing(error)
+        with pytest.raises(type(error)):
+            make_policy(clock).call(func)
+        assert func.calls == 1
+        assert clock.sleeps == []
+
+    @allure.story("Classification")
+    def test_explicitly_named_fatal_error_is_retried(self, clock):
+        func = Failing(ValueError("flaky parse"))
+        assert make_policy(clock, retry_on=(ValueError,)).call(func) == "ok"
+        assert func.calls == 2
+
+    @allure.story("Classification")
+    def test_retry_on_limits_retried_types(self, clock):
+        func = Failing(RuntimeError("boom"))
+        with pytest.raises(RuntimeError):
+            make_policy(clock, retry_on=(ConnectionError,)).call(func)
+        assert func.calls == 1
+
+    @allure.story("Classification")
+    def test_retry_if_outage_only(self, clock):
+        policy = make_policy(clock, retry_if=is_outage)
+        assert policy.call(Failing(RuntimeError("error: device offline"))) == "ok"
+        with pytest.raises(RuntimeError):
+            policy.call(Failing(RuntimeError("element not interactable")))
+
+    @allure.story("Arguments")
+    def test_func_keywords_do_not_collide_with_policy_keywords(self, clock):
+        def func(value, name=None, breaker=None):
+            return value, name, breaker
+        result = make_policy(clock).call(func, (1,), {"name": "n", "breaker": "b"}, name="call")
+        assert result == (1, "n", "b")
+
+
+@allure.feature("Retry Policy")
+class TestCircuitBreaker:
+
+    @allure.story("State machine")
+    def test_open_half_open_probe_then_close(self, clock):
+        breaker = CircuitBreaker("emulator-5554", failure_threshold=2, cooldown=10.0, clock=clock)
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                breaker.call(Failing(ConnectionError()))
+        assert breaker.state == CircuitBreaker.OPEN
+
+        func = Failing()
+        with pytest.raises(CircuitOpenError) as info:
+            breaker.call(func)
+        assert func.calls == 0
+        assert info.value.retry_after == 10.0
+
+        clock.now += 10.0
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        breaker.before_call()  # the single probe
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    @allure.story("State machine")
+    def test_failed_probe_reopens(self, clock):
+        breaker = CircuitBreaker("emulator-5554", failure_threshold=1, cooldown=10.0, clock=clock)
+        with pytest.raises(ConnectionError):
+            breaker.call(Failing(ConnectionError()))
+        clock.now += 10.0
+        with pytest.raises(ConnectionError):
+            breaker.call(Failing(ConnectionError()))
+        assert breaker.state == CircuitBreaker.OPEN
+        clock.now += 9.0
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+    @allure.story("State machine")
+    def test_non_outage_errors(self, clock):
+        breaker = CircuitBreaker("emulator-5554", failure_threshold=1, cooldown=10.0, clock=clock)
+        with pytest.raises(ValueError):
+            breaker.call(Failing(ValueError()))
+        assert breaker.state == CircuitBreaker.CLOSED
+
+        with pytest.raises(ConnectionError):
+            breaker.call(Failing(ConnectionError()))
+        clock.now += 10.0
+        # A probe that reaches the device closes the circuit even if the call itself fails
+        with pytest.raises(ValueError):
+            breaker.call(Failing(ValueError()))
+        assert breaker.state == CircuitBreaker.CLOSED
+
+
+class FakeDriver:
+    def __init__(self, udid: str):
+        self.capabilities = {"udid": udid}
+
+
+class FlakyPage:
+    def __init__(self, udid: str):
+        self.driver = FakeDriver(udid)
+        self.calls = 0
+
+    @retry(max_attempts=3, delay=0, breaker="device")
+    def tap(self):
+        self.calls += 1
+        raise ConnectionError("device offline")
+
+
+@allure.feature("Retry Policy")
+class TestRetryDecoratorBreaker:
+
+    @pytest.fixture(autouse=True)
+    def breakers(self, monkeypatch):
+        monkeypatch.setattr(GlobalConfig, "CIRCUIT_BREAKER_THRESHOLD", 3)
+        monkeypatch.setattr(GlobalConfig, "CIRCUIT_BREAKER_COOLDOWN", 60.0)
+        reset_circuit_breakers()
+        yield
+        reset_circuit_breakers()
+
+    @allure.story("Per-device breaker")
+    def test_pages_on_one_device_share_a_breaker(self):
+        first = FlakyPage("emulator-5554")
+        with pytest.raises(ConnectionError):
+            first.tap()
+        assert first.calls == 3
+        assert get_circuit_breaker("emulator-5554").state == CircuitBreaker.OPEN
+
+        # Another page object on the same device fails fast without touching it
+        second = FlakyPage("emulator-5554")
+        with pytest.raises(CircuitOpenError):
+            second.tap()
+        assert second.calls == 0
+
+        # Other devices are unaffected
+        other = FlakyPage("emulator-5556")
+        with pytest.raises(ConnectionError):
+            other.tap()
+        assert other.calls == 3
+        assert get_circuit_breaker("emulator-5556") is not get_circuit_breaker("emulator-5554")
@@ -0,0 +1,64 @@
+import os
+
+import allure
+import cv2
+import numpy as np
+import pytest
+
+from config.global_config import GlobalConfig
+from utils.screen_index import ScreenIndex
+
+
+def write_references(root, seed: int, screens=("home", "login")):
+    """Random-noise reference screenshots, one per screen, different for every seed."""
+    rng = np.random.default_rng(seed)
+    for screen in screens:
+        os.makedirs(root / screen, exist_ok=True)
+        cv2.imwrite(str(root / screen / "v1.png"), rng.integers(0, 256, (64, 64), dtype=np.uint8))
+    return str(root)
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(GlobalConfig, "CACHE_DIR", tmp_path / "cache")
+    return tmp_path / "cache"
+
+
+@allure.feature("Screen Index")
+class TestScreenIndexCache:
+
+    @allure.story("Incremental update")
+    def test_reload_rehashes_nothing(self, tmp_path, cache_dir):
+        refs = write_references(tmp_path / "refs", seed=1)
+        assert ScreenIndex(refs).update()["added"] == 2
+        assert ScreenIndex(refs).update() == {"added": 0, "updated": 0, "removed": 0, "unchanged": 2}
+
+    @allure.story("Separate reference directories")
+    def test_directories_keep_separate_index_files(self, tmp_path, cache_dir):
+        phone = write_references(tmp_path / "phone", seed=1)
+        tablet = write_references(tmp_path / "tablet", seed=2)
+        first, second = ScreenIndex(phone), ScreenIndex(tablet)
+        assert first.index_path != second.index_path
+        first.update()
+        second.update()
+        assert ScreenIndex(phone).update()["unchanged"] == 2
+        assert ScreenIndex(tablet).update()["unchanged"] == 2
+
+    @allure.story("Separate reference directories")
+    def test_index_built_for_another_directory_is_ignored(self, tmp_path, cache_dir):
+        phone = write_references(tmp_path / "phone", seed=1)
+        tablet = write_references(tmp_path / "tablet", seed=2)
+        # Same relative paths, and mtimes/sizes that would match the other directory's entries
+        for screen in ("home", "login"):
+            source = os.path.join(phone, screen, "v1.png")
+            target = os.path.join(tablet, screen, "v1.png")
+            assert os.path.getsize(source) == os.path.getsize(target)
+            os.utime(target, ns=(os.stat(source).st_atime_ns, os.stat(source).st_mtime_ns))
+        shared_path = str(cache_dir / "shared.json")
+        ScreenIndex(phone, index_path=shared_path).update()
+
+        index = ScreenIndex(tablet, index_path=shared_path)
+        assert len(index) == 0
+        assert index.update()["added"] == 2
+        tablet_home = os.path.join(tablet, "home", "v1.png")
+        assert index.nearest(tablet_home, k=1) == [("home", 0)]
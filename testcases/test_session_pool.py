@@ -0,0 +1,147 @@
+import time
+
+import allure
+import pytest
+import requests
+from appium.options.android import UiAutomator2Options
+
+from config.global_config import GlobalConfig
+from drivers.driver_factory import DriverFactory
+from drivers.session_pool import SessionPool
+from mocks.fake_adb_server import FakeADBServer
+from mocks.fake_appium_server import FakeAppiumServer
+from utils.adb_client import ADBClient
+from utils.adb_helper import ADBHelper
+
+DEVICE = "emulator-5554"
+PACKAGE = "com.example.app"
+SCREENS = {"home": [{"id": f"{PACKAGE}:id/title", "text": "Welcome"}]}
+
+
+def make_options(**caps) -> UiAutomator2Options:
+    options = UiAutomator2Options()
+    options.platform_name = "Android"
+    options.udid = DEVICE
+    for name, value in caps.items():
+        setattr(options, name, value)
+    return options
+
+
+@pytest.fixture
+def appium_server():
+    with FakeAppiumServer(SCREENS) as server:
+        yield server
+
+
+@pytest.fixture
+def pool():
+    pool = SessionPool(factory=DriverFactory.create_session, reset_app=False)
+    yield pool
+    pool.close_all()
+
+
+@pytest.fixture
+def adb_server(monkeypatch):
+    """App resets force-stop the package through ADBHelper; serve them from a fake adb server."""
+    with FakeADBServer(devices=[DEVICE]) as server:
+        monkeypatch.setattr(GlobalConfig, "ADB_BACKEND", "socket")
+        monkeypatch.setattr(ADBHelper, "_client", ADBClient(port=server.port))
+        yield server
+
+
+@allure.feature("Session Pool (FakeAppiumServer)")
+class TestSessionPool:
+
+    @allure.story("Warm reuse")
+    def test_released_session_is_reused(self, appium_server, pool):
+        driver = pool.acquire(appium_server.url, make_options())
+        session_id = driver.session_id
+        pool.release(driver)
+
+        again = pool.acquire(appium_server.url, make_options())
+        assert again.session_id == session_id
+        assert appium_server.commands.count("newSession") == 1
+        assert pool.stats() == {"created": 1, "reused": 1, "evicted": 0, "idle": 0, "leased": 1}
+
+    @allure.story("Warm reuse")
+    def test_capability_sets_get_separate_sessions(self, appium_server, pool):
+        first = pool.acquire(appium_server.url, make_options())
+        pool.release(first)
+        other = pool.acquire(appium_server.url, make_options(language="fr"))
+        assert other.session_id != first.session_id
+        assert pool.stats()["created"] == 2
+
+    @allure.story("Health check")
+    def test_dead_session_is_replaced(self, appium_server, pool):
+        driver = pool.acquire(appium_server.url, make_options())
+        dead_id = driver.session_id
+        pool.release(driver)
+        # The server loses the session while it sits idle (e.g. Appium restarted)
+        requests.delete(f"{appium_server.url}/session/{dead_id}", timeout=5)
+
+        fresh = pool.acquire(appium_server.url, make_options())
+        assert fresh.session_id != dead_id
+        assert pool.stats()["evicted"] == 1
+        assert fresh.get_window_size()["width"] == appium_server.width
+
+    @allure.story("Eviction")
+    def test_idle_session_expires(self, appium_server):
+        pool = SessionPool(factory=DriverFactory.create_session, max_idle=0.05, reset_app=False)
+        try:
+            driver = pool.acquire(appium_server.url, make_options())
+            pool.release(driver)
+            time.sleep(0.1)
+            pool.prune()
+            assert pool.stats()["idle"] == 0
+            assert appium_server.commands.count("deleteSession") == 1
+        finally:
+            pool.close_all()
+
+    @allure.story("Eviction")
+    def test_idle_quota_quits_extra_sessions(self, appium_server, pool):
+        first = pool.acquire(appium_server.url, make_options())
+        second = pool.acquire(appium_server.url, make_options())
+        pool.release(first)
+        pool.release(second)
+        assert pool.stats()["idle"] == 1
+        assert pool.stats()["evicted"] == 1
+
+    @allure.story("App reset")
+    def test_release_resets_app(self, appium_server, adb_server):
+        pool = SessionPool(factory=DriverFactory.create_session)
+        try:
+            driver = pool.acquire(appium_server.url, make_options(app_package=PACKAGE))
+            pool.release(driver)
+            assert f"shell:am force-stop {PACKAGE}" in adb_server.commands
+            assert "executeScript" in appium_server.commands  # mobile: activateApp
+            assert pool.stats()["idle"] == 1
+        finally:
+            pool.close_all()
+
+    @allure.story("App reset")
+    def test_failed_reset_discards_session(self, adb_server):
+        with FakeAppiumServer(SCREENS, failure_rate={"executeScript": 1.0}) as server:
+            pool = SessionPool(factory=DriverFactory.create_session)
+            try:
+                driver = pool.acquire(server.url, make_options(app_package=PACKAGE))
+                pool.release(driver)
+                assert pool.stats()["idle"] == 0
+                assert server.commands.count("deleteSession") == 1
+            finally:
+                pool.close_all()
+
+    @allure.story("Ownership")
+    def test_foreign_driver_is_quit(self, appium_server, pool):
+        driver = DriverFactory.create_session(appium_server.url, make_options())
+        pool.release(driver)
+        assert appium_server.commands.count("deleteSession") == 1
+        assert pool.stats()["idle"] == 0
+
+    @allure.story("Shutdown")
+    def test_close_all_quits_idle_and_leased(self, appium_server, pool):
+        idle = pool.acquire(appium_server.url, make_options())
+        pool.acquire(appium_server.url, make_options())
+        pool.release(idle)
+        pool.close_all()
+        assert appium_server.commands.count("deleteSession") == 2
+        assert pool.stats() == {"created": 2, "reused": 0, "evicted": 0, "idle": 0, "leased": 0}
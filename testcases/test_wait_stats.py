@@ -0,0 +1,55 @@
+import allure
+import pytest
+
+from utils.wait_stats import WaitStats
+
+PAGE, DEVICE, POPUP = "HomePage", "emulator-5554", ("id", "com.example.app:id/promo")
+
+
+@pytest.fixture
+def stats(tmp_path):
+    stats = WaitStats(str(tmp_path / "wait_stats.json"), min_samples=5, safety_factor=2.0,
+                      min_timeout=0.5, max_timeout=20.0, miss_streak=3)
+    for _ in range(5):
+        stats.record(PAGE, DEVICE, POPUP, 0.5)
+    return stats
+
+
+@allure.feature("Adaptive Wait")
+class TestWaitStats:
+
+    @allure.story("Learned timeout")
+    def test_timeout_is_learned_from_samples(self, stats):
+        assert stats.get_wait(PAGE, DEVICE, POPUP) == (1.0, 0.125)
+
+    @allure.story("Misses")
+    def test_occasional_misses_stay_fail_fast(self, stats):
+        for _ in range(2):
+            stats.record_miss(PAGE, DEVICE, POPUP)
+        assert stats.get_wait(PAGE, DEVICE, POPUP)[0] == 1.0
+        assert stats.report()[WaitStats.make_key(PAGE, DEVICE, POPUP)]["samples"] == 5
+
+    @allure.story("Misses")
+    def test_miss_streak_backs_off_until_next_appearance(self, stats):
+        timeouts = []
+        for _ in range(8):
+            stats.record_miss(PAGE, DEVICE, POPUP)
+            timeouts.append(stats.get_wait(PAGE, DEVICE, POPUP)[0])
+        assert timeouts == [1.0, 1.0, 2.0, 4.0, 8.0, 16.0, 20.0, 20.0]
+
+        stats.record(PAGE, DEVICE, POPUP, 0.5)
+        assert stats.get_wait(PAGE, DEVICE, POPUP)[0] == 1.0
+
+    @allure.story("Misses")
+    def test_misses_with_explicit_timeout_do_not_back_off(self, stats):
+        for _ in range(5):
+            stats.record_miss(PAGE, DEVICE, POPUP, learned=False)
+        assert stats.get_wait(PAGE, DEVICE, POPUP)[0] == 1.0
+
+    @allure.story("Persistence")
+    def test_samples_and_misses_survive_save(self, stats):
+        stats.record_miss(PAGE, DEVICE, POPUP)
+        stats.save()
+        reloaded = WaitStats(stats.path, min_samples=5, min_timeout=0.5)
+        entry = reloaded.report()[WaitStats.make_key(PAGE, DEVICE, POPUP)]
+        assert (entry["samples"], entry["misses"]) == (5, 1)
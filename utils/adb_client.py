@@ -0,0 +1,254 @@
+import socket
+import struct
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class ADBError(Exception):
+    """Raised when the adb server answers FAIL or breaks the protocol."""
+
+
+class ADBConnectError(ConnectionError):
+    """
+    Raised when the adb server cannot be reached or the transport handshake breaks,
+    i.e. before any command was sent, so running it another way is safe.
+    """
+
+
+class ADBConnection:
+    """
+    [Wire Level]
+    A single TCP connection to the adb server speaking the host protocol:
+    requests are "%04x" length-prefixed, replies start with OKAY or FAIL.
+    """
+
+    def __init__(self, host: str, port: int, timeout: float):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def send_request(self, service: str):
+        data = service.encode("utf-8")
+        self.sock.sendall(b"%04x" % len(data) + data)
+        self.read_status()
+
+    def read_status(self):
+        status = self.read_exact(4)
+        if status == b"OKAY":
+            return
+        if status == b"FAIL":
+            raise ADBError(self.read_string())
+        raise ADBError(f"Unexpected adb status: {status!r}")
+
+    def read_string(self) -> str:
+        length = int(self.read_exact(4), 16)
+        return self.read_exact(length).decode("utf-8", errors="replace")
+
+    def read_exact(self, size: int) -> bytes:
+        buf = bytearray(size)
+        view = memoryview(buf)
+        received = 0
+        while received < size:
+            n = self.sock.recv_into(view[received:], size - received)
+            if n == 0:
+                raise ConnectionError(f"adb connection closed after {received}/{size} bytes")
+            received += n
+        return bytes(buf)
+
+    def read_all(self) -> bytes:
+        chunks = []
+        while True:
+            chunk = self.sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    def close(self):
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class ADBClient:
+    """
+    [Native Backend]
+    Talks to the adb server (default localhost:5037) directly instead of spawning
+    an `adb` client process per command.
+
+    The adb protocol dedicates a connection to one service, so `shell:`/`exec:`
+    connections are opened per call (a local TCP connect costs microseconds).
+    Sync sessions can serve many push/pull requests and are pooled per device.
+
+    `timeout` bounds connecting and each protocol reply. Once a `shell:`/`exec:`
+    command is accepted its output is read without a time limit, like the adb binary,
+    so long-running commands (screenrecord, pm install) are not cut off.
+    """
+
+    SYNC_CHUNK = 64 * 1024
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 5037, timeout: float = 30,
+                 max_idle_per_device: int = 2):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.max_idle_per_device = max_idle_per_device
+        self._sync_pool: Dict[str, List[ADBConnection]] = {}
+        self._lock = threading.Lock()
+
+    # --- Host Services ---
+    def host_command(self, service: str) -> str:
+        """[Host Query] Runs a host:* service that answers with a length-prefixed string."""
+        conn = self._connect()
+        try:
+            conn.send_request(service)
+            return conn.read_string()
+        finally:
+            conn.close()
+
+    def devices(self) -> List[Tuple[str, str]]:
+        """Returns [(serial, state), ...] like `adb devices`."""
+        output = self.host_command("host:devices")
+        result = []
+        for line in output.splitlines():
+            if "\t" in line:
+                serial, state = line.split("\t", 1)
+                result.append((serial, state))
+        return result
+
+    # --- Device Services ---
+    def shell(self, cmd: str, device_id: Optional[str] = None) -> bytes:
+        """[shell:] Runs a command through the device shell, stdout and stderr merged."""
+        return self._run_service(f"shell:{cmd}", device_id)
+
+    def exec_out(self, cmd: str, device_id: Optional[str] = None) -> bytes:
+        """[exec:] Runs a command with a raw, binary-safe stdout stream."""
+        return self._run_service(f"exec:{cmd}", device_id)
+
+    def push(self, local_path: str, remote_path: str, device_id: Optional[str] = None, mode: int = 0o644):
+        """[sync: SEND] Uploads a local file to the device."""
+        with open(local_path, "rb") as f:
+            data = f.read()
+        self.push_bytes(data, remote_path, device_id, mode)
+
+    def push_bytes(self, data: bytes, remote_path: str, device_id: Optional[str] = None, mode: int = 0o644):
+        def send(conn: ADBConnection):
+            header = f"{remote_path},{mode | 0o100000}".encode("utf-8")
+            packets = [b"SEND", struct.pack("<I", len(header)), header]
+            view = memoryview(data)
+            for offset in range(0, len(data), self.SYNC_CHUNK):
+                chunk = view[offset:offset + self.SYNC_CHUNK]
+                packets.extend((b"DATA", struct.pack("<I", len(chunk)), chunk))
+            packets.extend((b"DONE", struct.pack("<I", int(time.time()))))
+            conn.sock.sendall(b"".join(packets))
+            self._read_sync_status(conn)
+        self._with_sync(device_id, send)
+
+    def pull(self, remote_path: str, local_path: str, device_id: Optional[str] = None):
+        """[sync: RECV] Downloads a device file to the local machine."""
+        data = self.pull_bytes(remote_path, device_id)
+        with open(local_path, "wb") as f:
+            f.write(data)
+
+    def pull_bytes(self, remote_path: str, device_id: Optional[str] = None) -> bytes:
+        def recv(conn: ADBConnection) -> bytes:
+            path = remote_path.encode("utf-8")
+            conn.sock.sendall(b"RECV" + struct.pack("<I", len(path)) + path)
+            chunks = []
+            while True:
+                packet_id, length = struct.unpack("<4sI", conn.read_exact(8))
+                if packet_id == b"DATA":
+                    chunks.append(conn.read_exact(length))
+                elif packet_id == b"DONE":
+                    return b"".join(chunks)
+                elif packet_id == b"FAIL":
+                    raise ADBError(conn.read_exact(length).decode("utf-8", errors="replace"))
+                else:
+                    raise ADBError(f"Unexpected sync packet: {packet_id!r}")
+        return self._with_sync(device_id, recv)
+
+    def close(self):
+        """Closes every pooled sync connection."""
+        with self._lock:
+            conns = [c for bucket in self._sync_pool.values() for c in bucket]
+            self._sync_pool.clear()
+        for conn in conns:
+            try:
+                conn.sock.sendall(b"QUIT" + struct.pack("<I", 0))
+            except OSError:
+                pass
+            conn.close()
+
+    # --- Internals ---
+    def _connect(self) -> ADBConnection:
+        try:
+            return ADBConnection(self.host, self.port, self.timeout)
+        except OSError as e:
+            raise ADBConnectError(f"adb server {self.host}:{self.port} not reachable: {e}") from e
+
+    def _open_transport(self, device_id: Optional[str]) -> ADBConnection:
+        conn = self._connect()
+        try:
+            target = f"host:transport:{device_id}" if device_id else "host:transport-any"
+            conn.send_request(target)
+        except OSError as e:
+            conn.close()
+            raise ADBConnectError(f"adb transport handshake failed: {e}") from e
+        except Exception:
+            conn.close()
+            raise
+        return conn
+
+    def _run_service(self, service: str, device_id: Optional[str]) -> bytes:
+        conn = self._open_transport(device_id)
+        try:
+            conn.send_request(service)
+            conn.sock.settimeout(None)
+            return conn.read_all()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _read_sync_status(conn: ADBConnection):
+        packet_id, length = struct.unpack("<4sI", conn.read_exact(8))
+        if packet_id == b"OKAY":
+            return
+        if packet_id == b"FAIL":
+            raise ADBError(conn.read_exact(length).decode("utf-8", errors="replace"))
+        raise ADBError(f"Unexpected sync reply: {packet_id!r}")
+
+    def _with_sync(self, device_id: Optional[str], operation):
+        key = device_id or ""
+        with self._lock:
+            bucket = self._sync_pool.get(key)
+            conn = bucket.pop() if bucket else None
+
+        if conn is not None:
+            try:
+                result = operation(conn)
+            except OSError:
+                # Pooled session went stale (server restarted / device dropped); retry fresh
+                conn.close()
+                conn = None
+            except Exception:
+                conn.close()
+                raise
+
+        if conn is None:
+            conn = self._open_transport(device_id)
+            try:
+                conn.send_request("sync:")
+                result = operation(conn)
+            except Exception:
+                # A FAIL packet or broken stream leaves the sync session unusable
+                conn.close()
+                raise
+
+        with self._lock:
+            bucket = self._sync_pool.setdefault(key, [])
+            if len(bucket) < self.max_idle_per_device:
+                bucket.append(conn)
+                return result
+        conn.close()
+        return result
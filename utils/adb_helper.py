@@ -1,5 +1,8 @@
+import shlex
 import subprocess
 from typing import List, Optional
+from config.global_config import GlobalConfig
+from utils.adb_client import ADBClient, ADBConnectError, ADBError
 from utils.logger import logger
 
 class ADBHelper:
@@ -8,12 +11,30 @@ class ADBHelper:
     Handles operations that Appium Driver cannot perform directly.
     """
 
+    _client: Optional[ADBClient] = None
+
+    @staticmethod
+    def get_client() -> ADBClient:
+        """
+        [Native Backend]
+        Shared adb-server socket client (see utils.adb_client).
+        """
+        if ADBHelper._client is None:
+            ADBHelper._client = ADBClient(GlobalConfig.ADB_SERVER_HOST, GlobalConfig.ADB_SERVER_PORT)
+        return ADBHelper._client
+
     @staticmethod
     def execute_adb_command(cmd: str, device_id: Optional[str] = None) -> str:
         """
         [Low-level Wrapper]
         Executes an ADB command and returns the output.
+        Uses the adb-server socket backend when enabled, falling back to the `adb` binary.
         """
+        if GlobalConfig.ADB_BACKEND == "socket":
+            output = ADBHelper._execute_via_socket(cmd, device_id)
+            if output is not None:
+                return output
+
         target = f"-s {device_id} " if device_id else ""
         full_cmd = f"adb {target}{cmd}"
         
@@ -28,6 +49,61 @@ class ADBHelper:
             logger.error(f"ADB Unknown Error: {e}")
             return ""
 
+    @staticmethod
+    def exec_out_bytes(cmd: str, device_id: Optional[str] = None) -> bytes:
+        """
+        [Binary Output]
+        Runs `adb exec-out {cmd}` and returns raw stdout bytes (e.g. screencap frames).
+        Raises on failure, since binary callers cannot use an empty-string fallback.
+        """
+        if GlobalConfig.ADB_BACKEND == "socket":
+            try:
+                return ADBHelper.get_client().exec_out(cmd, device_id)
+            except ADBConnectError as e:
+                # Nothing reached the device yet; any later error is raised, not re-run
+                logger.debug(f"adb server not reachable over socket ({e}), falling back to subprocess")
+        args = ["adb"] + (["-s", device_id] if device_id else []) + ["exec-out"] + shlex.split(cmd)
+        return subprocess.check_output(args, stderr=subprocess.DEVNULL)
+
+    @staticmethod
+    def _execute_via_socket(cmd: str, device_id: Optional[str] = None) -> Optional[str]:
+        """
+        [Socket Path]
+        Maps `devices`, `shell ...`, `exec-out ...`, `push` and `pull` onto adb host services.
+        Returns None when the command is not supported here or the server is unreachable,
+        so the caller can fall back to the subprocess path. Once the command has been
+        sent it is never re-run: later failures are logged and return "".
+        """
+        verb, _, rest = cmd.strip().partition(" ")
+        client = ADBHelper.get_client()
+        logger.debug(f"Executing ADB (socket): {cmd} on {device_id or 'any'}")
+        try:
+            if verb == "devices" and not rest:
+                lines = [f"{serial}\t{state}" for serial, state in client.devices()]
+                return "\n".join(["List of devices attached"] + lines)
+            if verb == "shell" and rest:
+                output = client.shell(rest, device_id)
+            elif verb == "exec-out" and rest:
+                output = client.exec_out(rest, device_id)
+            elif verb in ("push", "pull"):
+                args = shlex.split(rest)
+                if len(args) != 2:
+                    return None
+                if verb == "push":
+                    client.push(args[0], args[1], device_id)
+                else:
+                    client.pull(args[0], args[1], device_id)
+                return ""
+            else:
+                return None
+            return output.decode('utf-8', errors='replace').strip()
+        except ADBConnectError as e:
+            logger.debug(f"adb server not reachable over socket ({e}), falling back to subprocess")
+            return None
+        except (ADBError, OSError) as e:
+            logger.error(f"ADB Execution Failed: {e}")
+            return ""
+
     @staticmethod
     def get_connected_devices() -> List[str]:
         """
@@ -35,6 +111,11 @@ class ADBHelper:
         Returns a list of connected device IDs.
         """
         output = ADBHelper.execute_adb_command("devices")
+        return ADBHelper.parse_devices(output)
+
+    @staticmethod
+    def parse_devices(output: str) -> List[str]:
+        """[Parser] Extracts device IDs in 'device' state from `adb devices` output."""
         devices = []
         for line in output.split('\n'):
             if "\tdevice" in line:
@@ -45,6 +126,11 @@ class ADBHelper:
     @staticmethod
     def list_available_imes(device_id: Optional[str] = None) -> List[str]:
         output = ADBHelper.execute_adb_command("shell ime list -a", device_id)
+        return ADBHelper.parse_ime_list(output)
+
+    @staticmethod
+    def parse_ime_list(output: str) -> List[str]:
+        """[Parser] Extracts IME IDs from `ime list -a` output."""
         # Extract ImeId from output (parsing logic simplified for robustness)
         imes = []
         for line in output.splitlines():
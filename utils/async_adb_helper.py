@@ -0,0 +1,265 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from config.global_config import GlobalConfig
+from utils.adb_client import ADBConnectError, ADBError
+from utils.adb_helper import ADBHelper
+from utils.logger import logger
+
+# `shell:` has no exit status on the socket path, so replies are checked for these instead
+SHELL_ERROR_MARKERS = ("Unknown", "Error", "Exception", "cannot", "not found", "usage:")
+
+
+def _shell_failed(output: str) -> bool:
+    return any(marker in output for marker in SHELL_ERROR_MARKERS)
+
+
+class DeviceResult:
+    """
+    Outcome of one fleet operation on one device.
+    """
+
+    def __init__(self, device_id: str, ok: bool, value: Any = None,
+                 error: Optional[str] = None, duration: float = 0.0):
+        self.device_id = device_id
+        self.ok = ok
+        self.value = value
+        self.error = error
+        self.duration = duration
+
+    def __repr__(self) -> str:
+        state = f"value={self.value!r}" if self.ok else f"error={self.error!r}"
+        return f"DeviceResult({self.device_id}, ok={self.ok}, {state}, {self.duration:.2f}s)"
+
+
+class FleetResult(dict):
+    """
+    [Aggregated Results]
+    Maps device_id -> DeviceResult, with helpers for the common checks.
+    """
+
+    @property
+    def ok(self) -> bool:
+        return all(r.ok for r in self.values())
+
+    @property
+    def succeeded(self) -> List[str]:
+        return [d for d, r in self.items() if r.ok]
+
+    @property
+    def failed(self) -> Dict[str, str]:
+        return {d: r.error for d, r in self.items() if not r.ok}
+
+    def values_by_device(self) -> Dict[str, Any]:
+        return {d: r.value for d, r in self.items() if r.ok}
+
+    def raise_for_failures(self):
+        if not self.ok:
+            raise RuntimeError(f"Fleet operation failed on {len(self.failed)} device(s): {self.failed}")
+
+
+class AsyncADBHelper:
+    """
+    [Fleet Operations]
+    Asyncio counterpart of ADBHelper that runs the same commands on many devices at once,
+    with bounded concurrency, a timeout per device and per-device results/errors.
+
+    Usage:
+        fleet = AsyncADBHelper(concurrency=12, timeout=30)
+        results = asyncio.run(fleet.clear_app_data("com.example.app"))
+        results.raise_for_failures()
+    """
+
+    def __init__(self, concurrency: int = 8, timeout: float = 30.0):
+        self.concurrency = concurrency
+        self.timeout = timeout
+
+    # --- Executor ---
+    async def execute_adb_command(self, cmd: str, device_id: Optional[str] = None) -> str:
+        """
+        [Low-level Wrapper]
+        Async equivalent of ADBHelper.execute_adb_command. Unlike the sync version,
+        failures raise so that fan_out can record them per device.
+        """
+        verb, _, rest = cmd.strip().partition(" ")
+        if GlobalConfig.ADB_BACKEND == "socket" and verb in ("shell", "exec-out", "devices"):
+            try:
+                if verb == "devices":
+                    output = await self._host_query("host:devices")
+                    return "List of devices attached\n" + output.strip()
+                service = "shell:" if verb == "shell" else "exec:"
+                output = await self._device_service(service + rest, device_id)
+                return output.decode('utf-8', errors='replace').strip()
+            except ADBConnectError as e:
+                # Only a failed connect/handshake falls back; a sent command is never re-run
+                logger.debug(f"adb server not reachable over socket ({e}), falling back to subprocess")
+        return await self._execute_via_subprocess(cmd, device_id)
+
+    async def fan_out(self, operation: Callable[[str], Awaitable[Any]],
+                      devices: Optional[List[str]] = None,
+                      timeout: Optional[float] = None) -> FleetResult:
+        """
+        [Fan-out]
+        Runs operation(device_id) on every device (default: all connected),
+        at most `concurrency` at a time, each bounded by `timeout` seconds.
+        """
+        if devices is None:
+            devices = await self.get_connected_devices()
+        timeout = timeout or self.timeout
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run_one(device_id: str) -> DeviceResult:
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    value = await asyncio.wait_for(operation(device_id), timeout)
+                    return DeviceResult(device_id, True, value, duration=time.perf_counter() - start)
+                except asyncio.TimeoutError:
+                    error = f"timed out after {timeout}s"
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+                logger.error(f"[{device_id}] fleet operation failed: {error}")
+                return DeviceResult(device_id, False, error=error, duration=time.perf_counter() - start)
+
+        results = await asyncio.gather(*(run_one(d) for d in devices))
+        fleet = FleetResult((r.device_id, r) for r in results)
+        logger.info(f"Fleet operation finished: {len(fleet.succeeded)}/{len(fleet)} devices succeeded")
+        return fleet
+
+    async def run_on_all(self, cmd: str, devices: Optional[List[str]] = None) -> FleetResult:
+        """
+        [Raw Command] Runs the same ADB sub-command on every device.
+        Only transport errors count as failures: the reply is not inspected.
+        """
+        return await self.fan_out(lambda d: self.execute_adb_command(cmd, d), devices)
+
+    async def run_checked(self, cmd: str, accept: Callable[[str], bool],
+                          devices: Optional[List[str]] = None) -> FleetResult:
+        """
+        [Checked Command] Like run_on_all, but a device whose reply fails `accept(output)`
+        is recorded as failed with that reply as the error.
+        """
+        async def op(device_id: str) -> str:
+            output = await self.execute_adb_command(cmd, device_id)
+            if not accept(output):
+                raise RuntimeError(output or f"`{cmd}` returned no output")
+            return output
+        return await self.fan_out(op, devices)
+
+    # --- Device Check ---
+    async def get_connected_devices(self) -> List[str]:
+        output = await self.execute_adb_command("devices")
+        return ADBHelper.parse_devices(output)
+
+    # --- IME Management ---
+    async def list_available_imes(self, devices: Optional[List[str]] = None) -> FleetResult:
+        async def op(device_id: str) -> List[str]:
+            return ADBHelper.parse_ime_list(await self.execute_adb_command("shell ime list -a", device_id))
+        return await self.fan_out(op, devices)
+
+    async def get_current_ime(self, devices: Optional[List[str]] = None) -> FleetResult:
+        """A reply that is not an IME component name (e.g. "null") counts as failure."""
+        return await self.run_checked("shell settings get secure default_input_method",
+                                      lambda out: "/" in out and not _shell_failed(out), devices)
+
+    async def set_ime(self, ime_id: str, devices: Optional[List[str]] = None) -> FleetResult:
+        return await self.run_checked(f"shell ime set {ime_id}",
+                                      lambda out: "selected" in out and not _shell_failed(out), devices)
+
+    async def enable_ime(self, ime_id: str, devices: Optional[List[str]] = None) -> FleetResult:
+        return await self.run_checked(f"shell ime enable {ime_id}",
+                                      lambda out: "enabled" in out and not _shell_failed(out), devices)
+
+    # --- App Management ---
+    async def clear_app_data(self, package_name: str, devices: Optional[List[str]] = None) -> FleetResult:
+        """[Reset App] `pm clear` on every device; a non-'Success' reply counts as failure."""
+        logger.info(f"Clearing app data on fleet: {package_name}")
+        return await self.run_checked(f"shell pm clear {package_name}", lambda out: "Success" in out, devices)
+
+    async def stop_app(self, package_name: str, devices: Optional[List[str]] = None) -> FleetResult:
+        """`am force-stop` prints nothing on success; any reply counts as failure."""
+        return await self.run_checked(f"shell am force-stop {package_name}", lambda out: not out, devices)
+
+    async def is_app_installed(self, package_name: str, devices: Optional[List[str]] = None) -> FleetResult:
+        async def op(device_id: str) -> bool:
+            output = await self.execute_adb_command(f"shell pm list packages {package_name}", device_id)
+            return f"package:{package_name}" in output.split()
+        return await self.fan_out(op, devices)
+
+    # --- System Control ---
+    async def toggle_wifi(self, status: bool, devices: Optional[List[str]] = None) -> FleetResult:
+        state = "enable" if status else "disable"
+        return await self.run_checked(f"shell svc wifi {state}", lambda out: not out, devices)
+
+    # --- Transports ---
+    async def _open(self) -> tuple:
+        host, port = GlobalConfig.ADB_SERVER_HOST, GlobalConfig.ADB_SERVER_PORT
+        try:
+            return await asyncio.open_connection(host, port)
+        except OSError as e:
+            raise ADBConnectError(f"adb server {host}:{port} not reachable: {e}") from e
+
+    @staticmethod
+    async def _close(writer: asyncio.StreamWriter):
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+
+    @staticmethod
+    async def _request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, service: str):
+        data = service.encode("utf-8")
+        writer.write(b"%04x" % len(data) + data)
+        await writer.drain()
+        status = await reader.readexactly(4)
+        if status == b"FAIL":
+            length = int(await reader.readexactly(4), 16)
+            raise ADBError((await reader.readexactly(length)).decode("utf-8", errors="replace"))
+        if status != b"OKAY":
+            raise ADBError(f"Unexpected adb status: {status!r}")
+
+    async def _host_query(self, service: str) -> str:
+        reader, writer = await self._open()
+        try:
+            await self._request(reader, writer, service)
+            length = int(await reader.readexactly(4), 16)
+            return (await reader.readexactly(length)).decode("utf-8", errors="replace")
+        finally:
+            await self._close(writer)
+
+    async def _device_service(self, service: str, device_id: Optional[str]) -> bytes:
+        reader, writer = await self._open()
+        try:
+            try:
+                await self._request(reader, writer,
+                                    f"host:transport:{device_id}" if device_id else "host:transport-any")
+            except (OSError, asyncio.IncompleteReadError) as e:
+                raise ADBConnectError(f"adb transport handshake failed: {e}") from e
+            await self._request(reader, writer, service)
+            return await reader.read()
+        finally:
+            await self._close(writer)
+
+    @staticmethod
+    async def _execute_via_subprocess(cmd: str, device_id: Optional[str]) -> str:
+        target = f"-s {device_id} " if device_id else ""
+        full_cmd = f"adb {target}{cmd}"
+        logger.debug(f"Executing ADB (async): {full_cmd}")
+        proc = await asyncio.create_subprocess_shell(
+            full_cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT
+        )
+        try:
+            output, _ = await proc.communicate()
+        except asyncio.CancelledError:
+            # Per-device timeout: do not leave the adb client process behind
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+            await proc.wait()
+            raise
+        text = output.decode('utf-8', errors='replace').strip()
+        if proc.returncode != 0:
+            raise ADBError(text or f"adb exited with code {proc.returncode}")
+        return text
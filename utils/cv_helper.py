@@ -1,8 +1,104 @@
 import cv2
 import numpy as np
 import os
-from typing import Optional, Tuple, List
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple, List
+from config.global_config import GlobalConfig
 from utils.logger import logger
+from utils.screen_frame import ScreenFrame
+
+class TemplateCache:
+    """
+    [Decoded Template Cache]
+    Process-wide LRU of decoded template images keyed by (path, mode).
+    Entries are validated against the file's mtime and size on every lookup, so an
+    edited PNG is re-decoded; total decoded bytes are capped at `max_bytes`.
+    Cached arrays are shared and marked read-only.
+    """
+
+    MODES = ("color", "gray", "unchanged")
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Tuple[int, int], np.ndarray]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, path: str, mode: str = "color") -> Optional[np.ndarray]:
+        """Returns the decoded template, or None if the file is missing/unreadable."""
+        if mode not in self.MODES:
+            raise ValueError(f"Unsupported template mode: {mode}")
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        signature = (st.st_mtime_ns, st.st_size)
+        key = (path, mode)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        image = self._decode(path, mode)
+        if image is None:
+            return None
+        image.flags.writeable = False
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1].nbytes
+            if image.nbytes <= self.max_bytes:
+                self._entries[key] = (signature, image)
+                self._bytes += image.nbytes
+                while self._bytes > self.max_bytes:
+                    _, (_, evicted) = self._entries.popitem(last=False)
+                    self._bytes -= evicted.nbytes
+                    self.evictions += 1
+        return image
+
+    def preload(self, directory: str, modes: Tuple[str, ...] = ("color",),
+                extensions: Tuple[str, ...] = (".png", ".jpg", ".jpeg", ".bmp")) -> int:
+        """[Warm-up] Decodes every template under `directory`; returns the number loaded."""
+        loaded = 0
+        for root, _, files in os.walk(directory):
+            for name in files:
+                if name.lower().endswith(extensions):
+                    path = os.path.join(root, name)
+                    for mode in modes:
+                        if self.get(path, mode) is not None:
+                            loaded += 1
+        logger.info(f"Preloaded {loaded} templates from {directory} ({self._bytes / 1024 / 1024:.1f} MB)")
+        return loaded
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "entries": len(self._entries), "bytes": self._bytes}
+
+    @staticmethod
+    def _decode(path: str, mode: str) -> Optional[np.ndarray]:
+        if mode == "unchanged":
+            return cv2.imread(path, cv2.IMREAD_UNCHANGED)
+        image = cv2.imread(path, cv2.IMREAD_COLOR)
+        if image is not None and mode == "gray":
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        return image
+
 
 class CVHelper:
     """
@@ -10,6 +106,28 @@ class CVHelper:
     Dependencies: opencv-python, numpy
     """
 
+    template_cache = TemplateCache(GlobalConfig.TEMPLATE_CACHE_MAX_MB * 1024 * 1024)
+    _executor: Optional[ThreadPoolExecutor] = None
+    _executor_lock = threading.Lock()
+
+    @staticmethod
+    def load_template(template_path: str, mode: str = "color") -> Optional[np.ndarray]:
+        """
+        [Template Loading]
+        Returns the decoded template from the process-wide cache.
+        mode: "color" (BGR), "gray" or "unchanged" (keeps alpha).
+        """
+        return CVHelper.template_cache.get(template_path, mode)
+
+    @staticmethod
+    def preload_templates(directory: Optional[str] = None, modes: Tuple[str, ...] = ("color",)) -> int:
+        """[Warm-up] Preloads all templates (default: data/templates) into the cache."""
+        directory = directory or str(GlobalConfig.PROJECT_ROOT / "data" / "templates")
+        if not os.path.isdir(directory):
+            logger.warning(f"Template directory not found, nothing to preload: {directory}")
+            return 0
+        return CVHelper.template_cache.preload(directory, modes)
+
     @staticmethod
     def bytes_to_cv2(image_bytes: bytes) -> np.ndarray:
         """[Format Conversion]"""
@@ -17,47 +135,275 @@ class CVHelper:
         return cv2.imdecode(nparr, cv2.IMREAD_COLOR)
 
     @staticmethod
-    def find_image_center(target_img_path: str, source_img_content: bytes = None, threshold: float = 0.8) -> Optional[Tuple[int, int]]:
+    def to_cv2(source) -> Optional[np.ndarray]:
+        """[Format Conversion] Accepts encoded image bytes, a decoded BGR array or a ScreenFrame."""
+        if source is None:
+            return None
+        if isinstance(source, np.ndarray):
+            return source
+        if isinstance(source, ScreenFrame):
+            return source.bgr
+        return CVHelper.bytes_to_cv2(source)
+
+    @staticmethod
+    def roi_to_rect(roi: Tuple[float, float, float, float], width: int, height: int) -> Tuple[int, int, int, int]:
+        """
+        [ROI]
+        Converts a percent rectangle (left, top, right, bottom) in 0.0-1.0, the same
+        convention as tap_by_coordinates, into pixel (x, y, w, h).
+        """
+        left, top, right, bottom = roi
+        x1 = max(0, min(width, int(width * left)))
+        y1 = max(0, min(height, int(height * top)))
+        x2 = max(x1, min(width, int(round(width * right))))
+        y2 = max(y1, min(height, int(round(height * bottom))))
+        return x1, y1, x2 - x1, y2 - y1
+
+    @staticmethod
+    def find_image_center(target_img_path: str, source_img_content: bytes = None, threshold: float = 0.8,
+                          roi: Optional[Tuple[float, float, float, float]] = None,
+                          pyramid: Optional[bool] = None) -> Optional[Tuple[int, int]]:
         """
         [Core Positioning]
         Finds the center coordinates of target_img within source_img.
         :param target_img_path: Path to the template image.
-        :param source_img_content: Bytes of the screenshot.
-        :return: (x, y) or None
+        :param source_img_content: Bytes of the screenshot (or a decoded BGR array).
+        :param roi: Optional percent rectangle (left, top, right, bottom) to search in.
+        :param pyramid: Coarse-to-fine search; defaults to GlobalConfig.CV_PYRAMID.
+        :return: (x, y) in full-screen coordinates or None
         """
-        if not os.path.exists(target_img_path):
+        # Load images (template is decoded once and cached)
+        target = CVHelper.load_template(target_img_path)
+        if target is None:
             logger.error(f"Template image not found: {target_img_path}")
             return None
+        source = CVHelper.to_cv2(source_img_content)
 
-        # Load images
-        target = cv2.imread(target_img_path)
-        source = CVHelper.bytes_to_cv2(source_img_content)
+        offset_x, offset_y = 0, 0
+        if roi:
+            offset_x, offset_y, w, h = CVHelper.roi_to_rect(roi, source.shape[1], source.shape[0])
+            source = source[offset_y:offset_y + h, offset_x:offset_x + w]
 
-        # Template Matching
-        result = cv2.matchTemplate(source, target, cv2.TM_CCOEFF_NORMED)
-        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+        h, w = target.shape[:2]
+        if source.shape[0] < h or source.shape[1] < w:
+            logger.debug(f"Search area {source.shape[1]}x{source.shape[0]} smaller than template {w}x{h}")
+            return None
+
+        use_pyramid = GlobalConfig.CV_PYRAMID if pyramid is None else pyramid
+        match = None
+        if use_pyramid:
+            match = CVHelper._match_pyramid(source, target, target_img_path, threshold)
+        if match is None:
+            match = CVHelper._match_exhaustive(source, target)
+        max_val, max_loc = match
 
         if max_val >= threshold:
-            h, w = target.shape[:2]
-            center_x = max_loc[0] + w // 2
-            center_y = max_loc[1] + h // 2
+            center_x = offset_x + max_loc[0] + w // 2
+            center_y = offset_y + max_loc[1] + h // 2
             logger.debug(f"Image found at ({center_x}, {center_y}) with confidence {max_val:.2f}")
             return (center_x, center_y)
-        
+
         logger.debug(f"Image not found. Max confidence: {max_val:.2f}")
         return None
 
+    @staticmethod
+    def find_images(target_img_paths: List[str], source_img_content=None, threshold: float = 0.8,
+                    roi: Optional[Tuple[float, float, float, float]] = None,
+                    pyramid: Optional[bool] = None) -> Dict[str, Optional[Tuple[int, int]]]:
+        """
+        [Batch Positioning]
+        Matches several templates against one screenshot, decoded once.
+        Templates run in parallel on a shared thread pool (OpenCV releases the GIL).
+        :return: {template_path: (x, y) or None}
+        """
+        source = CVHelper.to_cv2(source_img_content)
+        if len(target_img_paths) <= 1:
+            return {p: CVHelper.find_image_center(p, source, threshold, roi=roi, pyramid=pyramid)
+                    for p in target_img_paths}
+
+        executor = CVHelper._get_executor()
+        futures = {p: executor.submit(CVHelper.find_image_center, p, source, threshold, roi, pyramid)
+                   for p in target_img_paths}
+        return {p: f.result() for p, f in futures.items()}
+
+    @staticmethod
+    def _get_executor() -> ThreadPoolExecutor:
+        with CVHelper._executor_lock:
+            if CVHelper._executor is None:
+                workers = GlobalConfig.CV_MATCH_WORKERS or min(8, os.cpu_count() or 1)
+                CVHelper._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cv-match")
+            return CVHelper._executor
+
+    @staticmethod
+    def _match_exhaustive(source: np.ndarray, target: np.ndarray) -> Tuple[float, Tuple[int, int]]:
+        """Full-resolution colour match (the original behaviour)."""
+        result = cv2.matchTemplate(source, target, cv2.TM_CCOEFF_NORMED)
+        _, max_val, _, max_loc = cv2.minMaxLoc(result)
+        return max_val, max_loc
+
+    @staticmethod
+    def _match_pyramid(source: np.ndarray, target: np.ndarray, target_img_path: str,
+                       threshold: float) -> Optional[Tuple[float, Tuple[int, int]]]:
+        """
+        [Coarse-to-Fine]
+        1. Match grayscale versions downscaled by CV_PYRAMID_SCALE to find candidates.
+        2. Re-match in colour at full resolution only in a small window around each.
+        Scores therefore stay comparable with the exhaustive search.
+        Returns None when the template is too small to downscale (caller falls back).
+        """
+        h, w = target.shape[:2]
+        scale = GlobalConfig.CV_PYRAMID_SCALE
+        min_side = GlobalConfig.CV_PYRAMID_MIN_TEMPLATE
+        # Do not shrink the template below min_side pixels
+        scale = max(scale, min_side / max(min(h, w), 1))
+        if scale >= 0.9:
+            return None
+
+        gray_target = CVHelper.load_template(target_img_path, "gray")
+        gray_source = source if source.ndim == 2 else cv2.cvtColor(source, cv2.COLOR_BGR2GRAY)
+        small_source = cv2.resize(gray_source, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        small_target = cv2.resize(gray_target, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        if small_source.shape[0] < small_target.shape[0] or small_source.shape[1] < small_target.shape[1]:
+            return None
+
+        coarse = cv2.matchTemplate(small_source, small_target, cv2.TM_CCOEFF_NORMED)
+        coarse_floor = threshold - GlobalConfig.CV_PYRAMID_MARGIN
+        pad = int(np.ceil(2 / scale))
+        sh, sw = small_target.shape[:2]
+
+        best_val, best_loc = -1.0, (0, 0)
+        for _ in range(GlobalConfig.CV_PYRAMID_CANDIDATES):
+            _, coarse_val, _, (cx, cy) = cv2.minMaxLoc(coarse)
+            if coarse_val < coarse_floor:
+                break
+            # Suppress this peak so the next iteration finds a different candidate
+            coarse[max(0, cy - sh // 2):cy + sh // 2 + 1, max(0, cx - sw // 2):cx + sw // 2 + 1] = -1.0
+
+            x0 = max(0, int(cx / scale) - pad)
+            y0 = max(0, int(cy / scale) - pad)
+            x1 = min(source.shape[1], int(cx / scale) + w + pad)
+            y1 = min(source.shape[0], int(cy / scale) + h + pad)
+            window = source[y0:y1, x0:x1]
+            if window.shape[0] < h or window.shape[1] < w:
+                continue
+            val, loc = CVHelper._match_exhaustive(window, target)
+            if val > best_val:
+                best_val, best_loc = val, (x0 + loc[0], y0 + loc[1])
+            if best_val >= threshold:
+                break
+        return best_val, best_loc
+
     @staticmethod
     def is_image_exist(target_img_path: str, source_img_content: bytes, threshold: float = 0.8) -> bool:
         """[Boolean Check]"""
         return CVHelper.find_image_center(target_img_path, source_img_content, threshold) is not None
 
     @staticmethod
-    def calculate_ssim(img1_path: str, img2_path: str) -> float:
+    def load_gray(image) -> Optional[np.ndarray]:
+        """[Format Conversion] Path, BGR/gray array, ScreenFrame or encoded bytes -> grayscale array."""
+        if isinstance(image, ScreenFrame):
+            return image.gray
+        if isinstance(image, str):
+            return cv2.imread(image, cv2.IMREAD_GRAYSCALE)
+        if isinstance(image, (bytes, bytearray)):
+            return cv2.imdecode(np.frombuffer(image, np.uint8), cv2.IMREAD_GRAYSCALE)
+        if isinstance(image, np.ndarray) and image.ndim == 3:
+            return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        return image
+
+    @staticmethod
+    def _prepare_pair(img1, img2, downscale: Optional[float]) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        gray1 = CVHelper.load_gray(img1)
+        gray2 = CVHelper.load_gray(img2)
+        if gray1 is None or gray2 is None:
+            return None, None
+        if gray2.shape != gray1.shape:
+            gray2 = cv2.resize(gray2, (gray1.shape[1], gray1.shape[0]), interpolation=cv2.INTER_AREA)
+        if downscale and downscale < 1.0:
+            gray1 = cv2.resize(gray1, None, fx=downscale, fy=downscale, interpolation=cv2.INTER_AREA)
+            gray2 = cv2.resize(gray2, None, fx=downscale, fy=downscale, interpolation=cv2.INTER_AREA)
+        return gray1.astype(np.float32), gray2.astype(np.float32)
+
+    @staticmethod
+    def _ssim_maps(x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Gaussian-windowed SSIM (Wang et al. 2004: 11x11 window, sigma 1.5).
+        Returns (ssim_map, cs_map); cs is the contrast-structure term used by MS-SSIM.
+        """
+        c1 = (0.01 * 255) ** 2
+        c2 = (0.03 * 255) ** 2
+        def blur(img: np.ndarray) -> np.ndarray:
+            return cv2.GaussianBlur(img, (11, 11), 1.5)
+
+        mu_x, mu_y = blur(x), blur(y)
+        mu_x2, mu_y2, mu_xy = mu_x * mu_x, mu_y * mu_y, mu_x * mu_y
+        sigma_x2 = blur(x * x) - mu_x2
+        sigma_y2 = blur(y * y) - mu_y2
+        sigma_xy = blur(x * y) - mu_xy
+
+        cs_map = (2 * sigma_xy + c2) / (sigma_x2 + sigma_y2 + c2)
+        ssim_map = ((2 * mu_xy + c1) / (mu_x2 + mu_y2 + c1)) * cs_map
+        return ssim_map, cs_map
+
+    @staticmethod
+    def calculate_ssim(img1, img2, downscale: Optional[float] = None,
+                       return_diff: bool = False, diff_threshold: float = 0.9):
+        """
+        [Structural Similarity]
+        Grayscale Gaussian SSIM, vectorized with OpenCV filters.
+        :param img1, img2: Paths, BGR/gray arrays, ScreenFrames or encoded bytes.
+        :param downscale: Optional factor (e.g. 0.5) applied to both images first, for speed.
+        :param return_diff: Also return a uint8 mask (255 = local SSIM below diff_threshold),
+                            at the compared resolution.
+        Returns 0.0 to 1.0 (1.0 = identical), or (score, mask) when return_diff.
+        """
+        x, y = CVHelper._prepare_pair(img1, img2, downscale)
+        if x is None:
+            logger.error("One of the images for comparison could not be loaded.")
+            return (0.0, None) if return_diff else 0.0
+
+        ssim_map, _ = CVHelper._ssim_maps(x, y)
+        score = float(ssim_map.mean())
+        if return_diff:
+            mask = np.where(ssim_map < diff_threshold, 255, 0).astype(np.uint8)
+            return score, mask
+        return score
+
+    @staticmethod
+    def calculate_ms_ssim(img1, img2, downscale: Optional[float] = None) -> float:
+        """
+        [Multi-Scale SSIM]
+        MS-SSIM over up to 5 dyadic scales with the standard weights; fewer scales are
+        used for images too small to halve further. Returns 0.0 to 1.0.
+        """
+        x, y = CVHelper._prepare_pair(img1, img2, downscale)
+        if x is None:
+            logger.error("One of the images for comparison could not be loaded.")
+            return 0.0
+
+        weights = [0.0448, 0.2856, 0.3001, 0.2363, 0.1333]
+        levels = 1
+        while levels < len(weights) and min(x.shape[:2]) >> levels >= 11:
+            levels += 1
+        weights = np.array(weights[:levels]) / sum(weights[:levels])
+
+        values = []
+        for level in range(levels):
+            ssim_map, cs_map = CVHelper._ssim_maps(x, y)
+            if level == levels - 1:
+                values.append(max(float(ssim_map.mean()), 0.0))
+            else:
+                values.append(max(float(cs_map.mean()), 0.0))
+                x = cv2.resize(x, None, fx=0.5, fy=0.5, interpolation=cv2.INTER_AREA)
+                y = cv2.resize(y, None, fx=0.5, fy=0.5, interpolation=cv2.INTER_AREA)
+        return float(np.prod(np.power(values, weights)))
+
+    @staticmethod
+    def calculate_hist_similarity(img1_path: str, img2_path: str) -> float:
         """
-        [Structural Similarity] - Simplified implementation using Histogram if skimage is missing,
-        or basic pixel diff. For robust SSIM, 'scikit-image' is needed.
-        Here we use a basic Histogram comparison (Correlation) as a fallback/simpler version standard in OpenCV.
+        [Histogram Comparison]
+        Compares HSV colour histograms (correlation). Ignores layout, so use it to check
+        colour distribution only; use calculate_ssim for structural changes.
         Returns 0.0 to 1.0 (1.0 = identical).
         """
         img1 = cv2.imread(img1_path)
@@ -85,6 +431,41 @@ class CVHelper:
         similarity = cv2.compareHist(hist1, hist2, cv2.HISTCMP_CORREL)
         return similarity
 
+    @staticmethod
+    def dhash(image, hash_size: int = 8) -> int:
+        """
+        [Perceptual Hash - Difference]
+        64-bit hash of horizontal gradients on a (hash_size+1) x hash_size thumbnail.
+        Robust to scaling and small colour shifts; Hamming distance ~0 for the same screen.
+        """
+        gray = CVHelper.load_gray(image)
+        small = cv2.resize(gray, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+        bits = (small[:, 1:] > small[:, :-1]).flatten()
+        return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+    @staticmethod
+    def phash(image, hash_size: int = 8) -> int:
+        """
+        [Perceptual Hash - DCT]
+        64-bit hash from the low-frequency DCT coefficients of a 32x32 thumbnail.
+        """
+        gray = CVHelper.load_gray(image)
+        small = cv2.resize(gray, (hash_size * 4, hash_size * 4), interpolation=cv2.INTER_AREA).astype(np.float32)
+        low = cv2.dct(small)[:hash_size, :hash_size].flatten()
+        bits = low > np.median(low[1:])
+        return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+    @staticmethod
+    def identify_screen(source, max_distance: Optional[int] = None) -> Optional[str]:
+        """
+        [Screen Identification]
+        Names the screen shown in `source` (bytes, array or ScreenFrame) by nearest
+        perceptual hash among the reference screenshots in GlobalConfig.SCREEN_INDEX_DIR.
+        Returns None when no reference is within max_distance.
+        """
+        from utils.screen_index import get_screen_index
+        return get_screen_index().identify(source, max_distance)
+
     @staticmethod
     def crop_image(image_path: str, rect: Tuple[int, int, int, int]) -> str:
         """
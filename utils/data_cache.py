@@ -0,0 +1,201 @@
+"""
+[Compiled Data Cache]
+Binary cache of parsed data files (YAML/JSON/CSV/XLSX) under .cache/data, so
+pytest workers skip the YAML/openpyxl parse during collection.
+
+Each entry is one file: an 8-byte header length, a pickled header (source path,
+mtime/size, SHA-256 of the source bytes) and the pickled parsed data. Entries
+are read through a memory map. A source whose mtime/size changed is re-hashed
+and only re-parsed when the content hash differs.
+
+Build ahead of a run (optional; entries are also written on first use):
+    python -m utils.data_cache build [paths ...]
+    python -m utils.data_cache clear
+"""
+import argparse
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+from config.global_config import GlobalConfig
+from utils.logger import logger
+
+FORMAT_VERSION = 1
+_HEADER_LEN = struct.Struct("<Q")
+DATA_EXTENSIONS = {".yaml": "yaml", ".yml": "yaml", ".json": "json", ".csv": "csv", ".xlsx": "excel"}
+
+stats: Dict[str, int] = {"hits": 0, "rehashed": 0, "misses": 0, "writes": 0, "errors": 0}
+
+
+def cache_dir() -> Path:
+    return GlobalConfig.CACHE_DIR / "data"
+
+
+def _entry_path(abs_path: str, kind: str, variant: Hashable) -> Path:
+    key = hashlib.sha1(f"{kind}|{variant!r}|{abs_path}".encode("utf-8")).hexdigest()
+    return cache_dir() / f"{key}.pkl"
+
+
+def _hash_file(abs_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(abs_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_entry(path: Path, accept: Callable[[dict], bool]) -> Tuple[Optional[dict], Any]:
+    """
+    Maps a cache file and unpickles its header; the data is only unpickled if
+    accept(header) is true. Returns (header, data), or (None, None) if the entry
+    is missing, unreadable or rejected.
+    """
+    try:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                (header_len,) = _HEADER_LEN.unpack_from(view, 0)
+                start = _HEADER_LEN.size
+                header = pickle.loads(view[start:start + header_len])
+                if not accept(header):
+                    return None, None
+                return header, pickle.loads(view[start + header_len:])
+            finally:
+                view.release()
+    except FileNotFoundError:
+        return None, None
+    except Exception as e:
+        stats["errors"] += 1
+        logger.debug(f"Ignoring unreadable data cache entry {path}: {e}")
+        return None, None
+
+
+def _write_entry(path: Path, header: dict, data: Any):
+    header_bytes = pickle.dumps(header, protocol=pickle.HIGHEST_PROTOCOL)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Atomic replace: several xdist workers may compile the same file at once
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER_LEN.pack(len(header_bytes)))
+        f.write(header_bytes)
+        pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    stats["writes"] += 1
+
+
+def load(abs_path: str, kind: str, parser: Callable[[str, Hashable], Any], variant: Hashable = None) -> Any:
+    """
+    [Cached Parse]
+    Parsed content of `abs_path`, served from the binary cache when the source is
+    unchanged; otherwise parsed with `parser(abs_path, variant)` and written back.
+    """
+    if not GlobalConfig.DATA_CACHE_ENABLED:
+        return parser(abs_path, variant)
+
+    stat = os.stat(abs_path)
+    entry_path = _entry_path(abs_path, kind, variant)
+    content_hash = None
+
+    def accept(header: dict) -> bool:
+        nonlocal content_hash
+        if header.get("version") != FORMAT_VERSION:
+            return False
+        if header["mtime_ns"] == stat.st_mtime_ns and header["size"] == stat.st_size:
+            return True
+        # Touched or re-checked-out but possibly identical: compare content hashes
+        content_hash = _hash_file(abs_path)
+        return header["sha256"] == content_hash
+
+    header, data = _read_entry(entry_path, accept)
+    if header is not None:
+        if header["mtime_ns"] == stat.st_mtime_ns and header["size"] == stat.st_size:
+            stats["hits"] += 1
+        else:
+            stats["rehashed"] += 1
+            _write_entry(entry_path, {**header, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}, data)
+        return data
+
+    stats["misses"] += 1
+    data = parser(abs_path, variant)
+    try:
+        _write_entry(entry_path, {
+            "version": FORMAT_VERSION,
+            "source": abs_path,
+            "kind": kind,
+            "variant": variant,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": content_hash or _hash_file(abs_path),
+        }, data)
+    except OSError as e:
+        logger.warning(f"Could not write data cache entry for {abs_path}: {e}")
+    return data
+
+
+def _iter_sources(paths: Iterable[str]) -> List[str]:
+    sources = []
+    for path in paths:
+        path = Path(path)
+        if not path.is_absolute():
+            path = GlobalConfig.PROJECT_ROOT / path
+        candidates = [path] if path.is_file() else sorted(p for p in path.rglob("*") if p.is_file())
+        sources.extend(str(p) for p in candidates if p.suffix.lower() in DATA_EXTENSIONS)
+    return sources
+
+
+def build(paths: Iterable[str] = ("data",)) -> Dict[str, int]:
+    """
+    [Build Step]
+    Compiles every supported data file under `paths` (Excel: the active sheet
+    and every named sheet) so the first test run starts from a warm cache.
+    """
+    from utils import data_loader
+
+    before = dict(stats)
+    for source in _iter_sources(paths):
+        kind = DATA_EXTENSIONS[Path(source).suffix.lower()]
+        variants: List[Hashable] = [None]
+        if kind == "excel" and data_loader.openpyxl:
+            workbook = data_loader.openpyxl.load_workbook(source, read_only=True)
+            variants += workbook.sheetnames
+            workbook.close()
+        for variant in variants:
+            try:
+                load(source, kind, data_loader.PARSERS[kind], variant)
+            except Exception as e:
+                stats["errors"] += 1
+                logger.error(f"Could not compile {source} ({variant or 'default'}): {e}")
+    result = {k: stats[k] - before[k] for k in stats}
+    logger.info(f"Data cache build: {result}")
+    return result
+
+
+def clear() -> int:
+    """Deletes all cache entries; returns how many were removed."""
+    removed = 0
+    if cache_dir().exists():
+        for entry in cache_dir().glob("*.pkl"):
+            entry.unlink(missing_ok=True)
+            removed += 1
+    return removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile test data files into the binary data cache.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build_parser = sub.add_parser("build", help="Compile data files (default: data/)")
+    build_parser.add_argument("paths", nargs="*", default=["data"])
+    sub.add_parser("clear", help="Delete all cache entries")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        result = build(args.paths)
+        raise SystemExit(1 if result["errors"] else 0)
+    print(f"Removed {clear()} cache entries from {cache_dir()}")
+
+
+if __name__ == "__main__":
+    main()
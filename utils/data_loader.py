@@ -1,10 +1,11 @@
 import yaml
 import json
 import csv
+import os
+import threading
 import logging
 from pathlib import Path
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Sequence, Tuple
 try:
     import openpyxl
 except ImportError:
@@ -12,39 +13,134 @@ except ImportError:
 
 from utils.logger import logger
 from utils.file_helper import get_absolute_path
+from utils.data_template import CompiledTemplate, _ReadOnlyDict, _ReadOnlyList, render_dynamic_values
+from utils import data_cache
+
+# libyaml-backed loader is several times faster than the pure-Python one
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Let yaml.safe_dump/yaml.dump write data loaded with frozen=True
+for _dumper in {yaml.SafeDumper, yaml.Dumper, getattr(yaml, "CSafeDumper", yaml.SafeDumper),
+                getattr(yaml, "CDumper", yaml.Dumper)}:
+    _dumper.add_representer(_ReadOnlyDict, yaml.representer.SafeRepresenter.represent_dict)
+    _dumper.add_representer(_ReadOnlyList, yaml.representer.SafeRepresenter.represent_list)
+
+
+class _ParsedFileCache:
+    """
+    [Parse Cache]
+    Compiled file contents keyed by (absolute path, variant), validated by the
+    file's mtime and size on every lookup. Entries are CompiledTemplates: each
+    access re-renders the dynamic leaves and, unless the caller asked for the
+    frozen view, copies the rest into plain dicts/lists.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, Hashable], Tuple[int, int, Any]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, abs_path: str, kind: str, variant: Hashable = None) -> CompiledTemplate:
+        """
+        Returns the compiled content, reloading only if the file changed. A reload
+        goes through the binary data cache before parsing. Parse errors are not cached.
+        """
+        stat = os.stat(abs_path)
+        key = (abs_path, variant)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+            if entry:
+                self.invalidations += 1
+        template = CompiledTemplate(data_cache.load(abs_path, kind, PARSERS[kind], variant))
+        with self._lock:
+            self._entries[key] = (stat.st_mtime_ns, stat.st_size, template)
+        return template
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.invalidations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            result = {"entries": len(self._entries), "hits": self.hits,
+                      "misses": self.misses, "invalidations": self.invalidations}
+        result["binary_cache"] = dict(data_cache.stats)
+        return result
+
+
+_file_cache = _ParsedFileCache()
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """[Diagnostics] Hit/miss counters of the shared parsed-file cache."""
+    return _file_cache.stats()
+
+
+def clear_cache():
+    """Drops all cached file contents (e.g. after generating data files in a fixture)."""
+    _file_cache.clear()
+
+
+def _parse_yaml(abs_path: str, _variant=None) -> Any:
+    with open(abs_path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=YAML_LOADER)
+
+
+def _parse_json(abs_path: str, _variant=None) -> Any:
+    with open(abs_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _parse_csv(abs_path: str, _variant=None) -> List[Dict[str, Any]]:
+    with open(abs_path, 'r', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def _parse_excel(abs_path: str, sheet_name: Optional[str]) -> List[Dict[str, Any]]:
+    workbook = openpyxl.load_workbook(abs_path, data_only=True)
+    sheet = workbook[sheet_name] if sheet_name else workbook.active
+
+    rows = list(sheet.iter_rows(values_only=True))
+    if not rows:
+        return []
+
+    headers = rows[0]
+    data = []
+    for row in rows[1:]:
+        # Zip headers with row data to create a dict
+        row_data = dict(zip(headers, row))
+        data.append(row_data)
+    return data
+
+PARSERS = {"yaml": _parse_yaml, "json": _parse_json, "csv": _parse_csv, "excel": _parse_excel}
 
 def _process_dynamic_values(data: Any) -> Any:
     """
     [Internal Helper]
-    Recursively traverses the data structure.
-    If a string contains '%', it attempts to format it using datetime.strftime.
-    Example: "User_%Y%m%d" -> "User_20231027"
-    """
-    if isinstance(data, dict):
-        return {k: _process_dynamic_values(v) for k, v in data.items()}
-    elif isinstance(data, list):
-        return [_process_dynamic_values(item) for item in data]
-    elif isinstance(data, str):
-        if "%" in data:
-            try:
-                return datetime.now().strftime(data)
-            except Exception:
-                return data
-        return data
-    else:
-        return data
-
-def load_yaml(file_path: str) -> Any:
+    Renders strftime placeholders against the run clock, e.g. "User_%Y%m%d" -> "User_20231027".
+    Only `%<directive>` is dynamic; `%%` is a literal '%'. See utils.data_template.
+    """
+    return render_dynamic_values(data)
+
+def load_yaml(file_path: str, frozen: bool = False) -> Any:
     """
     [Basic Reading]
     Loads a YAML file and returns its content.
+    :param frozen: Return the cached structure shared by all callers (read-only, no
+                   copy per call); the default is a fresh mutable copy.
     """
     abs_path = get_absolute_path(file_path)
     try:
-        with open(abs_path, 'r', encoding='utf-8') as f:
-            raw_data = yaml.safe_load(f)
-            # 处理动态参数
-            return _process_dynamic_values(raw_data)
+        template = _file_cache.get(abs_path, "yaml")
+        # 处理动态参数
+        return template.render(shared=frozen)
     except FileNotFoundError:
         logger.error(f"YAML file not found: {abs_path}")
         return {}
@@ -52,19 +148,20 @@ def load_yaml(file_path: str) -> Any:
         logger.error(f"Error parsing YAML file {abs_path}: {e}")
         return {}
 
-def get_account(role: str) -> Dict[str, str]:
+def get_account(role: str, frozen: bool = False) -> Dict[str, str]:
     """
     [Business Wrapper]
     Retrieves account details for a specific role from 'data/test_accounts.yaml'.
     """
-    data = load_yaml("data/test_accounts.yaml")
+    data = load_yaml("data/test_accounts.yaml", frozen=frozen)
     return data.get(role, {})
 
-def load_excel(file_path: str, sheet_name: Optional[str] = None) -> List[Dict[str, Any]]:
+def load_excel(file_path: str, sheet_name: Optional[str] = None, frozen: bool = False) -> List[Dict[str, Any]]:
     """
     [Core Reading]
     Loads an Excel file and returns a list of dictionaries.
     Requres 'openpyxl' installed.
+    :param frozen: See load_yaml.
     """
     if not openpyxl:
         logger.error("openpyxl library is not installed. Cannot read Excel files.")
@@ -72,22 +169,10 @@ def load_excel(file_path: str, sheet_name: Optional[str] = None) -> List[Dict[st
 
     abs_path = get_absolute_path(file_path)
     try:
-        workbook = openpyxl.load_workbook(abs_path, data_only=True)
-        sheet = workbook[sheet_name] if sheet_name else workbook.active
-
-        rows = list(sheet.iter_rows(values_only=True))
-        if not rows:
-            return []
-
-        headers = rows[0]
-        data = []
-        for row in rows[1:]:
-            # Zip headers with row data to create a dict
-            row_data = dict(zip(headers, row))
-            data.append(row_data)
+        template = _file_cache.get(abs_path, "excel", variant=sheet_name)
 
         # Excel 数据也同样支持动态替换
-        return _process_dynamic_values(data)
+        return template.render(shared=frozen)
     except FileNotFoundError:
         logger.error(f"Excel file not found: {abs_path}")
         return []
@@ -95,29 +180,125 @@ def load_excel(file_path: str, sheet_name: Optional[str] = None) -> List[Dict[st
         logger.error(f"Error reading Excel file {abs_path}: {e}")
         return []
 
-def load_json(file_path: str) -> Dict[str, Any]:
+def load_json(file_path: str, frozen: bool = False) -> Dict[str, Any]:
     """
     [JSON Reading]
+    :param frozen: See load_yaml.
     """
     abs_path = get_absolute_path(file_path)
     try:
-        with open(abs_path, 'r', encoding='utf-8') as f:
-            raw_data = json.load(f)
-            return _process_dynamic_values(raw_data)
+        template = _file_cache.get(abs_path, "json")
+        return template.render(shared=frozen)
     except Exception as e:
         logger.error(f"Error reading JSON file {abs_path}: {e}")
         return {}
 
-def load_csv(file_path: str) -> List[Dict[str, Any]]:
+def load_csv(file_path: str, frozen: bool = False) -> List[Dict[str, Any]]:
     """
     [CSV Reading]
+    :param frozen: See load_yaml.
     """
     abs_path = get_absolute_path(file_path)
     try:
-        with open(abs_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            raw_data = list(reader)
-            return _process_dynamic_values(raw_data)
+        template = _file_cache.get(abs_path, "csv")
+        return template.render(shared=frozen)
     except Exception as e:
         logger.error(f"Error reading CSV file {abs_path}: {e}")
-        return []
\ No newline at end of file
+        return []
+
+def _projection(headers: Sequence[Any], columns: Optional[Sequence[str]], abs_path: str) -> List[Tuple[Any, int]]:
+    """(header, index) pairs to keep; raises if a requested column does not exist."""
+    if columns is None:
+        return [(h, i) for i, h in enumerate(headers) if h is not None]
+    positions = {h: i for i, h in enumerate(headers)}
+    missing = [c for c in columns if c not in positions]
+    if missing:
+        raise ValueError(f"Columns {missing} not found in {abs_path} (available: {list(positions)})")
+    return [(c, positions[c]) for c in columns]
+
+def iter_excel(file_path: str, sheet_name: Optional[str] = None, columns: Optional[Sequence[str]] = None,
+               where: Optional[Callable[[Dict[str, Any]], bool]] = None,
+               limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    [Streaming Reading]
+    Yields rows of a large sheet one at a time. The workbook is opened with
+    read_only=True, so memory stays flat regardless of sheet size.
+    Dynamic values are applied per row; fully empty rows are skipped.
+    :param columns: Only these headers are kept (in this order).
+    :param where: Row filter, called with the processed row dict.
+    :param limit: Stop after this many matching rows.
+    Like load_excel, a missing file is logged and yields nothing; a missing column raises.
+    Usage:
+        for row in iter_excel("data/orders.xlsx", columns=["order_id", "qty"], where=lambda r: r["qty"]):
+            ...
+    pytest.mark.parametrize collects every row before the run, so streaming only
+    pays off there together with `where`/`limit`:
+        @pytest.mark.parametrize("row", iter_excel("data/login.xlsx", where=lambda r: r["smoke"], limit=20))
+    """
+    if not openpyxl:
+        logger.error("openpyxl library is not installed. Cannot read Excel files.")
+        return
+
+    abs_path = get_absolute_path(file_path)
+    try:
+        workbook = openpyxl.load_workbook(abs_path, read_only=True, data_only=True)
+    except FileNotFoundError:
+        logger.error(f"Excel file not found: {abs_path}")
+        return
+    try:
+        sheet = workbook[sheet_name] if sheet_name else workbook.active
+        rows = sheet.iter_rows(values_only=True)
+        headers = next(rows, None)
+        if headers is None:
+            return
+        projection = _projection(headers, columns, abs_path)
+        yielded = 0
+        for row in rows:
+            if not any(v is not None for v in row):
+                continue
+            # Read-only sheets may yield short rows when trailing cells are empty
+            row_data = {h: (row[i] if i < len(row) else None) for h, i in projection}
+            row_data = _process_dynamic_values(row_data)
+            if where is not None and not where(row_data):
+                continue
+            yield row_data
+            yielded += 1
+            if limit is not None and yielded >= limit:
+                return
+    finally:
+        # Read-only workbooks keep the file handle open until closed
+        workbook.close()
+
+def iter_csv(file_path: str, columns: Optional[Sequence[str]] = None,
+             where: Optional[Callable[[Dict[str, Any]], bool]] = None,
+             limit: Optional[int] = None, delimiter: str = ",") -> Iterator[Dict[str, Any]]:
+    """
+    [Streaming Reading]
+    CSV counterpart of iter_excel: reads and yields one row at a time with the
+    same column projection, filtering and per-row dynamic values. A missing file is
+    logged and yields nothing.
+    """
+    abs_path = get_absolute_path(file_path)
+    try:
+        f = open(abs_path, 'r', encoding='utf-8', newline='')
+    except FileNotFoundError:
+        logger.error(f"CSV file not found: {abs_path}")
+        return
+    with f:
+        reader = csv.reader(f, delimiter=delimiter)
+        headers = next(reader, None)
+        if headers is None:
+            return
+        projection = _projection(headers, columns, abs_path)
+        yielded = 0
+        for row in reader:
+            if not row:
+                continue
+            row_data = {h: (row[i] if i < len(row) else None) for h, i in projection}
+            row_data = _process_dynamic_values(row_data)
+            if where is not None and not where(row_data):
+                continue
+            yield row_data
+            yielded += 1
+            if limit is not None and yielded >= limit:
+                return
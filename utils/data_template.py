@@ -0,0 +1,227 @@
+import os
+import re
+from datetime import datetime
+from typing import Any, List, Optional, Set, Tuple
+
+from utils.logger import logger
+
+# Frozen per-run timestamp, exported so pytest-xdist workers render identical values
+RUN_CLOCK_ENV = "MAF_RUN_TIMESTAMP"
+
+# strftime directives treated as dynamic, optionally with a glibc flag ("%-d", "%_H");
+# "%%" is the escape for a literal percent sign. Any other '%' (e.g. "50% off") is plain text.
+SUPPORTED_DIRECTIVES = "aAbBcCdDeFfgGhHIjklmMpPrRsSTuUVwWxXyYzZ"
+_TOKEN_RE = re.compile(rf"%(%|[-_0^#]?[{SUPPORTED_DIRECTIVES}])")
+# Looks like a directive but is not supported: left literal, with a warning
+_UNKNOWN_RE = re.compile(r"%[-_0^#]?[A-Za-z]")
+_warned_values: Set[str] = set()
+
+_run_clock: Optional[datetime] = None
+
+
+def get_run_clock() -> datetime:
+    """
+    [Run Clock]
+    The timestamp every dynamic value renders against: taken once per run (from
+    MAF_RUN_TIMESTAMP when a controller process exported it) so values never drift
+    between files, workers or a clock tick mid-load.
+    """
+    global _run_clock
+    if _run_clock is None:
+        value = os.environ.get(RUN_CLOCK_ENV)
+        _run_clock = datetime.fromisoformat(value) if value else datetime.now()
+    return _run_clock
+
+
+def freeze_run_clock(moment: Optional[datetime] = None) -> datetime:
+    """
+    Fixes the run clock (now by default) and exports it to the environment so
+    subprocesses started afterwards, such as xdist workers, inherit it.
+    """
+    global _run_clock
+    _run_clock = moment or datetime.now()
+    os.environ[RUN_CLOCK_ENV] = _run_clock.isoformat()
+    return _run_clock
+
+
+class _ReadOnlyDict(dict):
+    """Static subtree shared between render(shared=True) calls. Use copy.deepcopy() for a mutable copy."""
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Loaded test data is shared and read-only (frozen=True); "
+                        "use copy.deepcopy() or load it without frozen=True to modify it")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        from copy import deepcopy
+        return {deepcopy(k, memo): deepcopy(v, memo) for k, v in self.items()}
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+
+class _ReadOnlyList(list):
+    """List counterpart of _ReadOnlyDict."""
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Loaded test data is shared and read-only (frozen=True); "
+                        "use copy.deepcopy() or load it without frozen=True to modify it")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        from copy import deepcopy
+        return [deepcopy(v, memo) for v in self]
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+class _DynamicString:
+    """Leaf holding a strftime format with stray '%' already escaped."""
+    __slots__ = ("fmt",)
+
+    def __init__(self, fmt: str):
+        self.fmt = fmt
+
+    def render(self, clock: datetime) -> str:
+        return clock.strftime(self.fmt)
+
+
+class _DictNode:
+    """Dict with at least one dynamic descendant; static values are kept as-is."""
+    __slots__ = ("items",)
+
+    def __init__(self, items: List[Tuple[Any, Any]]):
+        self.items = items
+
+    def render(self, clock: datetime) -> dict:
+        return {k: (v.render(clock) if isinstance(v, _NODE_TYPES) else v) for k, v in self.items}
+
+
+class _ListNode:
+    __slots__ = ("items",)
+
+    def __init__(self, items: List[Any]):
+        self.items = items
+
+    def render(self, clock: datetime) -> list:
+        return [v.render(clock) if isinstance(v, _NODE_TYPES) else v for v in self.items]
+
+
+_NODE_TYPES = (_DynamicString, _DictNode, _ListNode)
+
+
+def _thaw(value: Any) -> Any:
+    """Plain mutable copy of a rendered value: new dicts/lists throughout, leaves shared."""
+    if isinstance(value, dict):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_thaw(v) for v in value]
+    return value
+
+
+def _warn_unknown_directives(value: str, literals: List[str]):
+    """Unsupported directives (e.g. "%q") stay literal text; say so once per value."""
+    unknown = [token for text in literals for token in _UNKNOWN_RE.findall(text)]
+    if unknown and value not in _warned_values:
+        _warned_values.add(value)
+        logger.warning(f"Data value {value!r}: unsupported date directive(s) {', '.join(unknown)} "
+                       f"kept as literal text (supported: %{' %'.join(SUPPORTED_DIRECTIVES)}; '%%' for '%')")
+
+
+def _compile_string(value: str) -> Any:
+    if "%" not in value:
+        return value
+    has_directive = False
+    literals = []
+    parts = []
+    last = 0
+    for match in _TOKEN_RE.finditer(value):
+        literals.append(value[last:match.start()])
+        # Stray '%' in literal text must not reach strftime
+        parts.append(literals[-1].replace("%", "%%"))
+        parts.append(match.group(0))
+        has_directive = has_directive or match.group(1) != "%"
+        last = match.end()
+    literals.append(value[last:])
+    parts.append(literals[-1].replace("%", "%%"))
+    _warn_unknown_directives(value, literals)
+    fmt = "".join(parts)
+    if has_directive:
+        return _DynamicString(fmt)
+    # Only escapes: resolve "%%" once at compile time
+    return fmt.replace("%%", "%")
+
+
+def _compile(data: Any, freeze: bool) -> Any:
+    """Returns a node if the subtree contains dynamic strings, else the (frozen) static value."""
+    if isinstance(data, dict):
+        items = [(k, _compile(v, freeze)) for k, v in data.items()]
+        if any(isinstance(v, _NODE_TYPES) for _, v in items):
+            return _DictNode(items)
+        return _ReadOnlyDict(items) if freeze else dict(items)
+    if isinstance(data, list):
+        items = [_compile(v, freeze) for v in data]
+        if any(isinstance(v, _NODE_TYPES) for v in items):
+            return _ListNode(items)
+        return _ReadOnlyList(items) if freeze else items
+    if isinstance(data, str):
+        return _compile_string(data)
+    return data
+
+
+class CompiledTemplate:
+    """
+    [Compiled Data]
+    A loaded data structure analysed once for strftime placeholders.
+    Only strings containing a `%<directive>` from SUPPORTED_DIRECTIVES (e.g. "User_%Y%m%d") are dynamic;
+    `%%` renders a literal '%'. render() returns a plain mutable copy by default;
+    render(shared=True) rebuilds just the containers on the path to a dynamic leaf
+    and shares every static subtree, which is read-only.
+    """
+    __slots__ = ("_root", "dynamic_leaves")
+
+    def __init__(self, data: Any, freeze: bool = True):
+        """:param freeze: Make static subtrees read-only (they are shared between renders)."""
+        self._root = _compile(data, freeze)
+        self.dynamic_leaves = self._count(self._root)
+
+    @classmethod
+    def _count(cls, node: Any) -> int:
+        if isinstance(node, _DynamicString):
+            return 1
+        if isinstance(node, _DictNode):
+            return sum(cls._count(v) for _, v in node.items)
+        if isinstance(node, _ListNode):
+            return sum(cls._count(v) for v in node.items)
+        return 0
+
+    @property
+    def is_static(self) -> bool:
+        return self.dynamic_leaves == 0
+
+    def render(self, clock: Optional[datetime] = None, shared: bool = False) -> Any:
+        """:param shared: Skip the copy and return the shared, read-only static subtrees."""
+        if isinstance(self._root, _NODE_TYPES):
+            result = self._root.render(clock or get_run_clock())
+        else:
+            result = self._root
+        return result if shared else _thaw(result)
+
+
+def render_dynamic_values(data: Any, clock: Optional[datetime] = None) -> Any:
+    """One-shot compile and render, for data that is not reused (e.g. streamed rows)."""
+    return CompiledTemplate(data, freeze=False).render(clock, shared=True)
@@ -1,7 +1,9 @@
 import functools
 import time
-from typing import Callable, Type, Tuple, Optional, Any
+from typing import Callable, Type, Tuple, Optional, Any, Union
 from utils.logger import logger
+from utils.retry_policy import RetryPolicy, get_circuit_breaker, resolve_device_key
+from utils.tracer import tracer
 
 def log_step(msg: Optional[str] = None, level: str = "INFO"):
     """
@@ -15,7 +17,8 @@ def log_step(msg: Optional[str] = None, level: str = "INFO"):
             logger.log(level, f"[STEP START] {step_msg}")
             # Optional: Log args if needed, but keeping it clean for now
             try:
-                result = func(*args, **kwargs)
+                with tracer.span(step_msg, "step"):
+                    result = func(*args, **kwargs)
                 logger.log(level, f"[STEP END] {step_msg}")
                 return result
             except Exception as e:
@@ -31,34 +34,44 @@ def time_it(func: Callable):
     """
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         try:
             return func(*args, **kwargs)
         finally:
-            end_time = time.time()
-            duration = end_time - start_time
-            logger.info(f"Function '{func.__name__}' took {duration:.2f} seconds")
+            duration_ns = time.perf_counter_ns() - start_ns
+            tracer.complete(func.__qualname__, "timing", start_ns, duration_ns)
+            logger.info("Function '{}' took {:.3f} seconds", func.__name__, duration_ns / 1e9)
     return wrapper
 
-def retry(max_attempts: int = 3, delay: int = 1, exceptions: Tuple[Type[Exception], ...] = (Exception,)):
+def retry(max_attempts: int = 3, delay: float = 1, exceptions: Tuple[Type[Exception], ...] = (Exception,),
+          backoff: float = 1.0, max_delay: float = 30.0, jitter: float = 0.0,
+          deadline: Optional[float] = None, breaker: Union[None, str, Callable[..., str]] = None):
     """
     [Auto Retry]
     Retries the function upon encountering specified exceptions.
+    Defaults keep the original fixed `delay` between attempts; see utils.retry_policy.RetryPolicy.
+    Fatal errors (assertions, invalid selectors/sessions, open circuits) are not retried
+    unless listed in `exceptions` explicitly.
+    :param backoff: Delay multiplier per attempt (2.0 = exponential backoff).
+    :param jitter: Fraction (0..1) of each delay randomly taken off.
+    :param deadline: Overall time budget in seconds across all attempts.
+    :param breaker: "device" for the per-device circuit breaker of the call's page/driver,
+                    a fixed breaker key, or a callable(*args, **kwargs) returning the key.
     """
+    policy = RetryPolicy(max_attempts=max_attempts, base_delay=delay, multiplier=backoff,
+                         max_delay=max_delay, jitter=jitter, deadline=deadline, retry_on=exceptions)
+
     def decorator(func: Callable):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            last_exception = None
-            for i in range(max_attempts):
-                try:
-                    return func(*args, **kwargs)
-                except exceptions as e:
-                    last_exception = e
-                    logger.warning(f"Retrying {func.__name__}... ({i + 1}/{max_attempts}) due to: {e}")
-                    time.sleep(delay)
-            
-            logger.error(f"Function {func.__name__} failed after {max_attempts} attempts.")
-            raise last_exception
+            circuit = None
+            if breaker == "device":
+                circuit = get_circuit_breaker(resolve_device_key(args[0] if args else None))
+            elif callable(breaker):
+                circuit = get_circuit_breaker(breaker(*args, **kwargs))
+            elif breaker:
+                circuit = get_circuit_breaker(breaker)
+            return policy.call(func, args, kwargs, breaker=circuit, name=func.__name__)
         return wrapper
     return decorator
 
@@ -1,4 +1,6 @@
 import os
+import time
+from contextlib import contextmanager
 from pathlib import Path
 
 class FileHelper:
@@ -34,6 +36,39 @@ class FileHelper:
         """
         return str(FileHelper.get_project_root().joinpath(*args))
 
+    @staticmethod
+    @contextmanager
+    def file_lock(lock_path: str, timeout: float = 10.0, stale_after: float = 60.0):
+        """
+        [Cross-process Lock]
+        Holds `lock_path` (created exclusively, removed on exit) so that pytest-xdist
+        workers can read-modify-write a shared file one at a time. Works on any OS.
+        A lock older than `stale_after` seconds is assumed left by a crashed process
+        and broken; raises TimeoutError if not acquired within `timeout` seconds.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(lock_path) > stale_after:
+                        os.remove(lock_path)
+                        continue
+                except OSError:
+                    continue  # released (or broken) in the meantime
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Could not lock {lock_path} within {timeout}s")
+                time.sleep(0.05)
+        try:
+            yield
+        finally:
+            try:
+                os.remove(lock_path)
+            except OSError:
+                pass
+
 # For backward compatibility or direct function import if needed
 get_project_root = FileHelper.get_project_root
 resolve_path = FileHelper.resolve_path
@@ -1,39 +1,140 @@
+import atexit
+import copy
+import queue
 import sys
+import threading
 from loguru import logger
 from config.logging_config import LoggingConfig
 
-# Remove default handler
-logger.remove()
-
-# Add Console Handler
-logger.add(
-    sys.stdout,
-    level=LoggingConfig.CONSOLE_LEVEL,
-    format=LoggingConfig.LOG_FORMAT,
-    colorize=True
-)
-
-# Add File Handler (Runtime)
-logger.add(
-    str(LoggingConfig.RUN_LOG_FILE),
-    level=LoggingConfig.FILE_LEVEL,
-    format=LoggingConfig.LOG_FORMAT,
-    rotation=LoggingConfig.ROTATION,
-    retention=LoggingConfig.RETENTION,
-    encoding="utf-8"
-)
-
-# Add File Handler (Errors)
-logger.add(
-    str(LoggingConfig.ERROR_LOG_FILE),
-    level="ERROR",
-    format=LoggingConfig.LOG_FORMAT,
-    rotation=LoggingConfig.ROTATION,
-    retention=LoggingConfig.RETENTION,
-    encoding="utf-8",
-    backtrace=True,
-    diagnose=True
-)
+
+class _BackgroundWriter:
+    """
+    [Async Logging]
+    Loguru sink that only puts the record on an in-process queue; a daemon thread
+    formats it and writes it through the real sinks, which live on a separate
+    logger copy. Unlike loguru's enqueue=True, records are not pickled through a
+    multiprocessing pipe, so the hand-off is a cheap queue.put.
+    Pays off when a sink can block (CI console, network drives); pure CPU work
+    still shares the GIL with the caller.
+    """
+
+    def __init__(self, target):
+        self._target = target
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def __call__(self, message):
+        self._queue.put(message.record)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if isinstance(item, threading.Event):
+                item.set()
+                continue
+            try:
+                # Re-emit with the original record (time, caller, thread, exception)
+                self._target.patch(lambda r, rec=item: r.update(rec)).log(item["level"].name, item["message"])
+            except Exception as e:  # never let a bad record kill the writer
+                sys.stderr.write(f"Log writer error: {e}\n")
+
+    def flush(self, timeout: float = 10.0):
+        """Blocks until every record queued so far has been written."""
+        if self._thread.is_alive():
+            done = threading.Event()
+            self._queue.put(done)
+            done.wait(timeout)
+
+    def stop(self):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout=10.0)
+
+
+_writer = None
+
+
+def _add_sinks(target, run_log_file, error_log_file, console, console_sink, console_level, file_level, diagnose):
+    # Add Console Handler
+    if console:
+        target.add(
+            console_sink or sys.stdout,
+            level=console_level,
+            format=LoggingConfig.LOG_FORMAT,
+            colorize=True
+        )
+
+    # Add File Handler (Runtime)
+    target.add(
+        str(run_log_file or LoggingConfig.RUN_LOG_FILE),
+        level=file_level,
+        format=LoggingConfig.LOG_FORMAT,
+        rotation=LoggingConfig.ROTATION,
+        retention=LoggingConfig.RETENTION,
+        encoding="utf-8"
+    )
+
+    # Add File Handler (Errors)
+    target.add(
+        str(error_log_file or LoggingConfig.ERROR_LOG_FILE),
+        level="ERROR",
+        format=LoggingConfig.LOG_FORMAT,
+        rotation=LoggingConfig.ROTATION,
+        retention=LoggingConfig.RETENTION,
+        encoding="utf-8",
+        backtrace=True,
+        diagnose=diagnose
+    )
+
+
+def setup_logger(run_log_file=None, error_log_file=None, console: bool = True, console_sink=None,
+                 console_level: str = None, file_level: str = None,
+                 mode: str = None, diagnose: bool = None):
+    """
+    [Sink Setup]
+    (Re)installs the console, runtime and error sinks. Defaults come from LoggingConfig;
+    arguments exist so benchmarks and tools can redirect or retune the sinks.
+    :param mode: "sync" writes in the calling thread, "async" hands records to a background writer.
+    """
+    global _writer
+    console_level = console_level or LoggingConfig.CONSOLE_LEVEL
+    file_level = file_level or LoggingConfig.FILE_LEVEL
+    mode = (mode or LoggingConfig.LOG_MODE).lower()
+    diagnose = LoggingConfig.DIAGNOSE if diagnose is None else diagnose
+
+    # Remove default handler (and a previous background writer)
+    logger.remove()
+    if _writer is not None:
+        _writer.stop()
+        _writer = None
+
+    if mode != "async":
+        _add_sinks(logger, run_log_file, error_log_file, console, console_sink, console_level, file_level, diagnose)
+        return
+
+    # Separate handler set for the writer thread; the front logger keeps only the queue
+    target = copy.deepcopy(logger)
+    _add_sinks(target, run_log_file, error_log_file, console, console_sink, console_level, file_level, diagnose)
+    _writer = _BackgroundWriter(target)
+    # Filter at the lowest sink level so dropped records never reach the queue
+    levels = [logger.level(file_level).no, logger.level("ERROR").no]
+    if console:
+        levels.append(logger.level(console_level).no)
+    logger.add(_writer, level=min(levels), format="{message}", catch=False)
+
+
+def flush_logs():
+    """Waits until queued records are written (no-op in sync mode)."""
+    if _writer is not None:
+        _writer.flush()
+    logger.complete()
+
+
+setup_logger()
+atexit.register(flush_logs)
 
 # Expose the configured logger
-__all__ = ["logger"]
+__all__ = ["logger", "setup_logger", "flush_logs"]
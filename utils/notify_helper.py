@@ -1,9 +1,278 @@
 import requests
 import json
-from typing import Dict, Any
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, Deque, Hashable, Optional
+from requests.adapters import HTTPAdapter
 from utils.logger import logger
+from utils.retry_policy import RetryPolicy
 from config.global_config import GlobalConfig
 
+
+class WebhookError(Exception):
+    """Delivery failed; `retryable` is False for errors a resend cannot fix (bad URL, 4xx)."""
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, WebhookError):
+        return exc.retryable
+    return isinstance(exc, (requests.ConnectionError, requests.Timeout))
+
+
+def _deliver(url: str, payload: Dict[str, Any], timeout: float, session: Optional[requests.Session] = None):
+    """One POST; raises WebhookError/requests errors for the retry policy to classify."""
+    response = (session or requests).post(url, json=payload, timeout=timeout)
+    if response.status_code == 429 or response.status_code >= 500:
+        raise WebhookError(f"HTTP {response.status_code} from webhook")
+    if response.status_code >= 400:
+        raise WebhookError(f"HTTP {response.status_code} from webhook", retryable=False)
+    try:
+        body = response.json()
+    except ValueError:
+        return
+    # Lark answers {"code": 0}, DingTalk {"errcode": 0}; rate limits arrive as HTTP 200 too
+    code = body.get("code", body.get("errcode", 0)) if isinstance(body, dict) else 0
+    if code:
+        raise WebhookError(f"Webhook rejected message: {body.get('msg') or body.get('errmsg') or code}")
+
+
+class _Message:
+    __slots__ = ("url", "payload", "key", "persist", "created_at", "spilled")
+
+    def __init__(self, url: str, payload: Dict[str, Any], key: Optional[Hashable], persist: bool):
+        self.url = url
+        self.payload = payload
+        self.key = key
+        self.persist = persist
+        self.created_at = time.time()
+        self.spilled = False
+
+
+class NotificationDispatcher:
+    """
+    [Background Sender]
+    Delivers webhook messages from a daemon thread so the caller (a test hook, the
+    session teardown) never waits on Lark/DingTalk.
+
+    - One pooled requests.Session: keep-alive connections are reused across messages.
+    - Bounded queue: when full, new messages are spilled instead of blocking the caller.
+    - Coalescing: a message submitted with a `key` replaces a still-queued message with
+      the same url+key (e.g. only the latest progress update is sent).
+    - Rate limit: at least `min_interval` seconds between messages to the same webhook.
+    - Retry: connection errors, timeouts, 429/5xx and non-zero API codes are retried with
+      exponential backoff and jitter (RetryPolicy).
+    - Spill file: persistent messages that still could not be delivered (or were left
+      queued or mid-send at close) are appended as JSON lines and resent by the next
+      dispatcher. Delivery is at-least-once: a message spilled at close whose retry
+      then succeeds is sent again by the next run.
+    """
+
+    def __init__(self, timeout: float = 5.0, max_queue: int = 100, min_interval: float = 2.0,
+                 max_attempts: int = 4, base_delay: float = 1.0, spill_path: Optional[str] = None,
+                 replay_spill: bool = True):
+        self.timeout = timeout
+        self.max_queue = max_queue
+        self.min_interval = min_interval
+        self.spill_path = spill_path
+        self.policy = RetryPolicy(max_attempts=max_attempts, base_delay=base_delay, jitter=0.5,
+                                  max_delay=30.0, deadline=60.0, retry_if=_is_retryable)
+        self.session = requests.Session()
+        self.session.headers.update({"Content-Type": "application/json"})
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.stats = {"sent": 0, "failed": 0, "coalesced": 0, "spilled": 0, "replayed": 0}
+
+        self._queue: Deque[_Message] = deque()
+        self._pending: Dict[tuple, _Message] = {}
+        self._inflight = 0
+        self._current: Optional[_Message] = None
+        self._last_sent: Dict[str, float] = {}
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._spill_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="notify-dispatcher", daemon=True)
+        self._thread.start()
+        if replay_spill:
+            self.replay_spill()
+
+    # --- Producer side ---
+    def submit(self, url: str, payload: Dict[str, Any], key: Optional[Hashable] = None,
+               persist: bool = True) -> bool:
+        """
+        Queues a message and returns immediately. False if it could not be queued
+        (dispatcher closed or queue full); a persistent message is then spilled.
+        :param key: Coalescing key; a queued message with the same url+key is replaced.
+        :param persist: Spill the message if it cannot be delivered (progress updates pass False).
+        """
+        with self._cond:
+            if key is not None:
+                queued = self._pending.get((url, key))
+                if queued is not None:
+                    queued.payload = payload
+                    self.stats["coalesced"] += 1
+                    return True
+            if not self._stop.is_set() and len(self._queue) < self.max_queue:
+                message = _Message(url, payload, key, persist)
+                self._queue.append(message)
+                if key is not None:
+                    self._pending[(url, key)] = message
+                self._inflight += 1
+                self._cond.notify_all()
+                return True
+        logger.warning("Notification queue full or closed; message not queued")
+        self._spill([_Message(url, payload, key, persist)], "not queued")
+        return False
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Waits until every queued message was sent or given up on; False on timeout."""
+        end = time.monotonic() + timeout
+        with self._cond:
+            while self._inflight:
+                remaining = end - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 10.0):
+        """
+        Flushes for at most `timeout` seconds, then stops the worker. Messages still
+        queued are spilled, and so is one the worker is still sending (or retrying):
+        the daemon thread does not outlive the interpreter.
+        """
+        delivered = self.flush(timeout)
+        with self._cond:
+            self._stop.set()
+            leftover = list(self._queue)
+            self._queue.clear()
+            self._pending.clear()
+            self._inflight -= len(leftover)
+            current = self._current
+            if current is not None and not current.spilled:
+                current.spilled = True
+                leftover.insert(0, current)
+            self._cond.notify_all()
+        if leftover:
+            self._spill(leftover, "dispatcher closed")
+        if delivered:
+            self._thread.join(timeout=1.0)
+            self.session.close()
+        logger.debug("Notification dispatcher closed: {}", self.stats)
+
+    # --- Worker side ---
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._stop.is_set():
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                message = self._queue[0]
+            # Wait for the rate-limit slot while the message stays coalescable
+            delay = self._last_sent.get(message.url, 0.0) + self.min_interval - time.monotonic()
+            if delay > 0 and self._stop.wait(delay):
+                return
+            with self._cond:
+                if not self._queue or self._queue[0] is not message:
+                    continue  # removed by close()
+                self._queue.popleft()
+                if message.key is not None:
+                    self._pending.pop((message.url, message.key), None)
+                self._current = message
+            try:
+                self._send(message)
+            finally:
+                with self._cond:
+                    self._current = None
+                    self._inflight -= 1
+                    self._cond.notify_all()
+
+    def _send(self, message: _Message):
+        try:
+            self.policy.call(self._deliver, (message.url, message.payload), name="webhook notification")
+            self.stats["sent"] += 1
+        except Exception as e:
+            self.stats["failed"] += 1
+            logger.error(f"Failed to send webhook notification: {e}")
+            with self._cond:
+                # close() may already have spilled it while the retries were running
+                spill, message.spilled = not message.spilled, True
+            if spill:
+                self._spill([message], str(e))
+        finally:
+            self._last_sent[message.url] = time.monotonic()
+
+    def _deliver(self, url: str, payload: Dict[str, Any]):
+        _deliver(url, payload, self.timeout, self.session)
+
+    # --- Spill file ---
+    def _spill(self, messages, reason: str):
+        persistent = [m for m in messages if m.persist]
+        if not persistent or not self.spill_path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.spill_path)), exist_ok=True)
+        with self._spill_lock, open(self.spill_path, "a", encoding="utf-8") as f:
+            for m in persistent:
+                f.write(json.dumps({"url": m.url, "payload": m.payload, "created_at": m.created_at,
+                                    "reason": reason}, ensure_ascii=False) + "\n")
+            self.stats["spilled"] += len(persistent)
+        logger.warning("Spilled {} undelivered notification(s) to {}", len(persistent), self.spill_path)
+
+    def replay_spill(self) -> int:
+        """Re-queues messages spilled by an earlier run (the file is consumed)."""
+        if not self.spill_path or not os.path.exists(self.spill_path):
+            return 0
+        replay_path = self.spill_path + ".replay"
+        os.replace(self.spill_path, replay_path)
+        count = 0
+        with open(replay_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                count += self.submit(entry["url"], entry["payload"])
+        os.remove(replay_path)
+        self.stats["replayed"] += count
+        if count:
+            logger.info("Re-sending {} spilled notification(s)", count)
+        return count
+
+
+_dispatcher: Optional[NotificationDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher() -> NotificationDispatcher:
+    """Process-wide NotificationDispatcher configured from GlobalConfig."""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = NotificationDispatcher(
+                timeout=GlobalConfig.NOTIFY_TIMEOUT,
+                max_queue=GlobalConfig.NOTIFY_QUEUE_SIZE,
+                min_interval=GlobalConfig.NOTIFY_MIN_INTERVAL,
+                max_attempts=GlobalConfig.NOTIFY_MAX_ATTEMPTS,
+                spill_path=GlobalConfig.NOTIFY_SPILL_FILE,
+            )
+        return _dispatcher
+
+
+def close_dispatcher(timeout: Optional[float] = None):
+    """Flushes (bounded by NOTIFY_FLUSH_TIMEOUT) and stops the dispatcher, if one was started."""
+    global _dispatcher
+    with _dispatcher_lock:
+        dispatcher, _dispatcher = _dispatcher, None
+    if dispatcher is not None:
+        dispatcher.close(GlobalConfig.NOTIFY_FLUSH_TIMEOUT if timeout is None else timeout)
+
 class NotifyHelper:
     """
     Message Notification Center.
@@ -12,22 +281,19 @@ class NotifyHelper:
 
     @staticmethod
     def _post_webhook(url: str, payload: Dict[str, Any]) -> bool:
-        """[Low-level Sender]"""
-        headers = {"Content-Type": "application/json"}
+        """[Low-level Sender] Synchronous send, no retry; does not start the dispatcher."""
         try:
-            response = requests.post(url, json=payload, headers=headers, timeout=10)
-            response.raise_for_status()
+            _deliver(url, payload, GlobalConfig.NOTIFY_TIMEOUT)
             return True
         except Exception as e:
             logger.error(f"Failed to send webhook notification: {e}")
             return False
 
     @staticmethod
-    def _format_lark_card(summary: Dict[str, Any]) -> Dict[str, Any]:
+    def _format_lark_card(summary: Dict[str, Any], title: str = "UI Automation Report") -> Dict[str, Any]:
         """[Feishu/Lark Card]"""
         failed_count = summary.get('failed', 0)
         color = "red" if failed_count > 0 else "green"
-        title = "UI Automation Report"
         
         elements = [
             {"tag": "div", "text": {"tag": "lark_md", "content": f"**Environment:** {GlobalConfig.PLATFORM_NAME}"}},
@@ -35,6 +301,9 @@ class NotifyHelper:
             {"tag": "div", "text": {"tag": "lark_md", "content": f"**Passed:** {summary.get('passed', 0)}"}},
             {"tag": "div", "text": {"tag": "lark_md", "content": f"**Failed:** {failed_count}"}},
         ]
+        if 'done' in summary:
+            elements.insert(1, {"tag": "div", "text": {"tag": "lark_md",
+                                                       "content": f"**Progress:** {summary['done']}/{summary.get('total', 0)}"}})
 
         card = {
             "msg_type": "interactive",
@@ -50,11 +319,12 @@ class NotifyHelper:
         return card
 
     @staticmethod
-    def _format_dingtalk_md(summary: Dict[str, Any]) -> Dict[str, Any]:
+    def _format_dingtalk_md(summary: Dict[str, Any], title: str = "UI Automation Report") -> Dict[str, Any]:
         """[DingTalk Markdown]"""
-        title = "UI Automation Report"
         text = f"### {title}\n"
         text += f"- **Environment**: {GlobalConfig.PLATFORM_NAME}\n"
+        if 'done' in summary:
+            text += f"- **Progress**: {summary['done']}/{summary.get('total', 0)}\n"
         text += f"- **Total**: {summary.get('total', 0)}\n"
         text += f"- **Passed**: {summary.get('passed', 0)}\n"
         text += f"- **Failed**: {summary.get('failed', 0)}\n"
@@ -71,29 +341,83 @@ class NotifyHelper:
         }
 
     @staticmethod
-    def send_test_report(summary_data: Dict[str, Any], webhook_url: str = None):
+    def _build_payload(target_url: str, summary_data: Dict[str, Any], title: str) -> Dict[str, Any]:
+        # Determine type based on URL (simple heuristic)
+        if "feishu" in target_url or "lark" in target_url:
+            return NotifyHelper._format_lark_card(summary_data, title)
+        return NotifyHelper._format_dingtalk_md(summary_data, title)
+
+    @staticmethod
+    def send_test_report(summary_data: Dict[str, Any], webhook_url: str = None) -> bool:
         """
         [Main Entry Point]
-        Sends test report to the configured webhook.
+        Sends test report to the configured webhook (WEBHOOK_URL unless given).
+        With NOTIFY_ASYNC the report is queued on the background dispatcher and this
+        returns at once; call close_dispatcher() before exiting to deliver it.
         """
-        # Ideally, getting URL from config if not provided
-        # For now, we assume it's passed in or we check config
-        target_url = webhook_url
-        
-        # NOTE: Since GlobalConfig doesn't have WEBHOOK_URL defined in our skeleton yet, 
-        # we would typically fetch it here.
-        # target_url = target_url or GlobalConfig.WEBHOOK_URL
-        
+        target_url = webhook_url or GlobalConfig.WEBHOOK_URL
         if not target_url:
             logger.warning("No Webhook URL provided. Skipping notification.")
-            return
+            return False
+
+        payload = NotifyHelper._build_payload(target_url, summary_data, "UI Automation Report")
+        if GlobalConfig.NOTIFY_ASYNC:
+            queued = get_dispatcher().submit(target_url, payload, key="report")
+            if queued:
+                logger.info("Test report queued for group chat.")
+            return queued
 
-        # Determine type based on URL (simple heuristic)
-        if "feishu" in target_url or "lark" in target_url:
-            payload = NotifyHelper._format_lark_card(summary_data)
-        else:
-            payload = NotifyHelper._format_dingtalk_md(summary_data)
-            
         success = NotifyHelper._post_webhook(target_url, payload)
         if success:
             logger.info("Test report pushed to group chat.")
+        return success
+
+    @staticmethod
+    def send_progress(summary_data: Dict[str, Any], webhook_url: str = None) -> bool:
+        """
+        [Progress Update]
+        Queues an in-run status message. Updates coalesce: if an earlier one is still
+        waiting (rate limit, slow webhook) it is replaced, and undelivered updates are
+        dropped rather than spilled.
+        """
+        target_url = webhook_url or GlobalConfig.WEBHOOK_URL
+        if not target_url:
+            return False
+        payload = NotifyHelper._build_payload(target_url, summary_data, "UI Automation Progress")
+        return get_dispatcher().submit(target_url, payload, key="progress", persist=False)
+
+
+class RunProgress:
+    """
+    [Run Counter]
+    Outcome counts of the current session, fed from pytest reports, in the summary
+    format NotifyHelper expects.
+    """
+
+    def __init__(self, total: int = 0):
+        self.total = total
+        self.passed = 0
+        self.failed = 0
+        self.skipped = 0
+        self.started_at = time.monotonic()
+
+    @property
+    def done(self) -> int:
+        return self.passed + self.failed + self.skipped
+
+    def record(self, when: str, outcome: str) -> bool:
+        """Counts one report phase; True when it finished a test (call, or a failed/skipped setup)."""
+        if when == "call" or (when == "setup" and outcome != "passed"):
+            if outcome == "passed":
+                self.passed += 1
+            elif outcome == "skipped":
+                self.skipped += 1
+            else:
+                self.failed += 1
+            return True
+        return False
+
+    def summary(self) -> Dict[str, Any]:
+        return {"total": max(self.total, self.done), "passed": self.passed,
+                "failed": self.failed, "skipped": self.skipped,
+                "duration": round(time.monotonic() - self.started_at, 1)}
@@ -0,0 +1,224 @@
+import re
+import time
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Optional
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+from utils.logger import logger
+
+_BOUNDS_RE = re.compile(r"\[(-?\d+),(-?\d+)\]\[(-?\d+),(-?\d+)\]")
+
+# Locator strategies (values of AppiumBy / By)
+BY_ID = "id"
+BY_ACCESSIBILITY_ID = "accessibility id"
+BY_CLASS_NAME = "class name"
+BY_XPATH = "xpath"
+
+
+class UnsupportedLocatorError(Exception):
+    """The locator cannot be resolved from a page-source snapshot."""
+
+
+class SnapshotElement:
+    """
+    [Offline Element]
+    Read-only view of one node in a page-source snapshot.
+    Mirrors the parts of WebElement that only read state.
+    """
+    __slots__ = ("tag", "attributes")
+
+    def __init__(self, tag: str, attributes: Dict[str, str]):
+        self.tag = tag
+        self.attributes = attributes
+
+    @property
+    def text(self) -> str:
+        """Text, falling back to content-desc (same rule as BasePage.get_text)."""
+        return (self.attributes.get("text") or self.attributes.get("content-desc")
+                or self.attributes.get("label") or "")
+
+    @property
+    def bounds(self) -> Optional[Dict[str, int]]:
+        """Element rect as {'x', 'y', 'width', 'height'} (same shape as WebElement.rect)."""
+        raw = self.attributes.get("bounds")
+        if raw:
+            match = _BOUNDS_RE.match(raw)
+            if match:
+                x1, y1, x2, y2 = (int(v) for v in match.groups())
+                return {"x": x1, "y": y1, "width": x2 - x1, "height": y2 - y1}
+        if "x" in self.attributes and "width" in self.attributes:
+            try:
+                return {k: int(float(self.attributes[k])) for k in ("x", "y", "width", "height")}
+            except (KeyError, ValueError):
+                return None
+        return None
+
+    @property
+    def center(self) -> Optional[tuple]:
+        rect = self.bounds
+        if not rect:
+            return None
+        return rect["x"] + rect["width"] // 2, rect["y"] + rect["height"] // 2
+
+    def get_attribute(self, name: str) -> str:
+        if name == "className":
+            name = "class"
+        return self.attributes.get(name, "")
+
+    def __repr__(self) -> str:
+        return f"SnapshotElement({self.tag}, text={self.text!r})"
+
+
+class PageSnapshot:
+    """
+    [Page Snapshot]
+    Parses one `driver.page_source` dump and resolves locators locally, so reading
+    many fields costs a single WebDriver round trip.
+    Supports ID, accessibility id, class name and XPath (full XPath with lxml,
+    ElementTree's subset otherwise).
+    """
+
+    def __init__(self, page_source: str):
+        self.created_at = time.monotonic()
+        data = page_source.encode("utf-8") if isinstance(page_source, str) else page_source
+        if lxml_etree is not None:
+            self._lxml_root = lxml_etree.fromstring(data, parser=lxml_etree.XMLParser(huge_tree=True))
+            nodes = list(self._lxml_root.iter())
+        else:
+            self._lxml_root = None
+            self._et_root = ET.fromstring(data)
+            nodes = list(self._et_root.iter())
+
+        self._elements: Dict[int, SnapshotElement] = {}
+        self._by_id: Dict[str, List[SnapshotElement]] = {}
+        self._by_desc: Dict[str, List[SnapshotElement]] = {}
+        self._by_class: Dict[str, List[SnapshotElement]] = {}
+        for node in nodes:
+            if not isinstance(node.tag, str):
+                continue  # lxml comments / processing instructions
+            element = SnapshotElement(node.tag, dict(node.attrib))
+            self._elements[id(node)] = element
+            attrs = element.attributes
+            if attrs.get("resource-id"):
+                self._by_id.setdefault(attrs["resource-id"], []).append(element)
+            desc = attrs.get("content-desc") or attrs.get("name")
+            if desc:
+                self._by_desc.setdefault(desc, []).append(element)
+            self._by_class.setdefault(attrs.get("class") or attrs.get("type") or node.tag, []).append(element)
+        # Hold the node objects so their id() keys stay valid (lxml reuses live proxies)
+        self._nodes = nodes
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.created_at
+
+    def find_all(self, locator: tuple) -> List[SnapshotElement]:
+        """[Local Lookup] Returns all matching elements in document order."""
+        by, value = locator
+        if by == BY_ID:
+            found = self._by_id.get(value)
+            if found is None and ":id/" not in value:
+                # Appium accepts bare ids and prefixes the app package
+                suffix = f":id/{value}"
+                found = [e for rid, els in self._by_id.items() if rid.endswith(suffix) for e in els]
+            return list(found or [])
+        if by == BY_ACCESSIBILITY_ID:
+            return list(self._by_desc.get(value, []))
+        if by == BY_CLASS_NAME:
+            return list(self._by_class.get(value, []))
+        if by == BY_XPATH:
+            return self._xpath(value)
+        raise UnsupportedLocatorError(f"Strategy '{by}' cannot be resolved from page source")
+
+    def find(self, locator: tuple) -> Optional[SnapshotElement]:
+        found = self.find_all(locator)
+        return found[0] if found else None
+
+    def _xpath(self, expression: str) -> List[SnapshotElement]:
+        try:
+            if self._lxml_root is not None:
+                nodes = self._lxml_root.xpath(expression)
+            else:
+                # ElementTree only supports relative paths from the root element
+                if expression.startswith("//"):
+                    expression = "." + expression
+                elif expression.startswith("/"):
+                    root_tag, _, rest = expression[1:].partition("/")
+                    if root_tag != self._et_root.tag:
+                        return []
+                    expression = "./" + rest if rest else "."
+                nodes = self._et_root.findall(expression)
+        except Exception as e:
+            logger.debug(f"XPath not supported by snapshot parser ({e}): {expression}")
+            raise UnsupportedLocatorError(str(e))
+        return [self._elements[id(n)] for n in nodes if id(n) in self._elements]
+
+
+# W3C/Appium commands that only read state; every other command (clicks, keys,
+# actions, back, app switches, scripts, ...) may change the screen
+READ_ONLY_COMMANDS = frozenset({
+    "findElement", "findElements", "findChildElement", "findChildElements", "getPageSource",
+    "getElementText", "getElementTagName", "getElementAttribute", "getElementProperty",
+    "getElementRect", "getElementValueOfCssProperty", "isElementDisplayed", "isElementEnabled",
+    "isElementSelected", "getWindowRect", "screenshot", "elementScreenshot", "getTimeouts",
+    "getLog", "getAvailableLogTypes", "getSession", "getStatus", "getCapabilities",
+    "getCurrentContext", "getCurrentContextHandle", "getContexts", "getContextHandles",
+    "getCurrentActivity", "getCurrentPackage", "getScreenOrientation", "getSettings",
+    "getClipboard", "isKeyboardShown", "getDisplayDensity", "getSystemBars", "queryAppState",
+    "isAppInstalled", "getNetworkConnection", "getDeviceTimeGet",
+})
+
+
+class SnapshotCache:
+    """
+    [Per-driver Cache]
+    The page-source snapshot shared by every page object on one driver. `generation`
+    is bumped by each UI-changing command the driver sends, so a snapshot is only
+    served while nothing could have changed the screen since it was fetched.
+    """
+
+    def __init__(self):
+        self.generation = 0
+        self._entry = None
+
+    def get(self) -> Optional[PageSnapshot]:
+        entry = self._entry
+        if entry is not None and entry[0] == self.generation:
+            return entry[1]
+        return None
+
+    def put(self, generation: int, snapshot: PageSnapshot):
+        """Stores a snapshot fetched at `generation` (read before the fetch started)."""
+        self._entry = (generation, snapshot)
+
+    def invalidate(self):
+        self.generation += 1
+
+
+def snapshot_cache(driver) -> SnapshotCache:
+    """
+    Returns the driver's SnapshotCache, wrapping its command executor on first use
+    (instance attributes only, like CommandMetrics.instrument).
+    """
+    executor = getattr(driver, "command_executor", None)
+    owner = executor if executor is not None else driver
+    cache = getattr(owner, "_maf_snapshot_cache", None)
+    if cache is not None:
+        return cache
+    cache = SnapshotCache()
+    if executor is not None:
+        original_execute = executor.execute
+
+        def execute(command, params):
+            try:
+                return original_execute(command, params)
+            finally:
+                if command not in READ_ONLY_COMMANDS:
+                    cache.invalidate()
+
+        executor.execute = execute
+    owner._maf_snapshot_cache = cache
+    return cache
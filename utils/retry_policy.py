@@ -0,0 +1,258 @@
+"""
+[Retry Engine]
+Exponential backoff with jitter under an overall deadline, exception
+classification, and per-device circuit breakers that fail fast while a device or
+the Appium server is down. utils.decorators.retry is the decorator front-end.
+"""
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+
+from selenium.common.exceptions import (InvalidArgumentException, InvalidSelectorException,
+                                        InvalidSessionIdException, SessionNotCreatedException,
+                                        WebDriverException)
+from urllib3.exceptions import MaxRetryError, NewConnectionError, ProtocolError
+
+from config.global_config import GlobalConfig
+from utils.logger import logger
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling through while a breaker is open."""
+
+    def __init__(self, key: str, retry_after: float):
+        super().__init__(f"Circuit '{key}' is open after repeated outages; retry in {retry_after:.1f}s")
+        self.key = key
+        self.retry_after = retry_after
+
+
+# Never retried: caller bugs, failed assertions and errors a retry cannot fix
+FATAL_EXCEPTIONS: Tuple[Type[BaseException], ...] = (
+    AssertionError, TypeError, ValueError, KeyError, AttributeError, NameError, NotImplementedError,
+    InvalidSelectorException, InvalidArgumentException, InvalidSessionIdException, CircuitOpenError,
+)
+
+# Device/server unavailability: these (and only these) count towards a circuit breaker
+OUTAGE_EXCEPTIONS: Tuple[Type[BaseException], ...] = (
+    ConnectionError, TimeoutError, MaxRetryError, NewConnectionError, ProtocolError,
+    InvalidSessionIdException, SessionNotCreatedException,
+)
+OUTAGE_MESSAGES = ("device offline", "device not found", "device unauthorized",
+                   "instrumentation process is not running", "socket hang up", "ECONNREFUSED", "ECONNRESET")
+
+
+def is_outage(exc: BaseException) -> bool:
+    """[Classification] True if the error means the device or Appium server is unreachable."""
+    if isinstance(exc, OUTAGE_EXCEPTIONS):
+        return True
+    if isinstance(exc, (WebDriverException, RuntimeError)):
+        message = str(exc)
+        return any(marker in message for marker in OUTAGE_MESSAGES)
+    return False
+
+
+class CircuitBreaker:
+    """
+    [Circuit Breaker]
+    Closed: calls pass; consecutive outage failures are counted and any success resets
+    the count. Open (count reached `failure_threshold`): calls fail immediately with
+    CircuitOpenError for `cooldown` seconds. Half-open: after the cooldown one probe
+    call is let through; if the device answers (success, or any non-outage error) the
+    circuit closes, an outage failure re-opens it.
+    `clock` (default time.monotonic) can be replaced in tests.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, key: str, failure_threshold: int = 5, cooldown: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.key = key
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self.clock() - self._opened_at >= self.cooldown:
+                return self.HALF_OPEN
+            return self._state
+
+    def before_call(self):
+        """Raises CircuitOpenError if the call must not go through."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            remaining = self.cooldown - (self.clock() - self._opened_at)
+            if self._state == self.OPEN and remaining > 0:
+                raise CircuitOpenError(self.key, remaining)
+            # Cooldown over: allow a single probe, reject the rest until it reports back
+            if self._probe_in_flight:
+                raise CircuitOpenError(self.key, max(remaining, 0.0))
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info("Circuit '{}' closed", self.key)
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self, exc: BaseException):
+        """
+        Counts outage failures. Other errors leave the count alone, except that one
+        ending a probe closes the circuit: the device answered, so it is back.
+        """
+        with self._lock:
+            probing = self._probe_in_flight
+            self._probe_in_flight = False
+            if not is_outage(exc):
+                if probing:
+                    logger.info("Circuit '{}' closed: probe reached the device ({})", self.key, type(exc).__name__)
+                    self._state = self.CLOSED
+                    self._failures = 0
+                return
+            self._failures += 1
+            if probing or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = self.clock()
+                logger.warning("Circuit '{}' opened after {} consecutive outage(s): {}",
+                               self.key, self._failures, exc)
+
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        self.before_call()
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as e:
+            self.record_failure(e)
+            raise
+        self.record_success()
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(key: str) -> CircuitBreaker:
+    """Process-wide breaker for `key` (a device id or server URL), configured from GlobalConfig."""
+    with _breakers_lock:
+        breaker = _breakers.get(key)
+        if breaker is None:
+            breaker = _breakers[key] = CircuitBreaker(
+                key, GlobalConfig.CIRCUIT_BREAKER_THRESHOLD, GlobalConfig.CIRCUIT_BREAKER_COOLDOWN)
+        return breaker
+
+
+def reset_circuit_breakers():
+    with _breakers_lock:
+        _breakers.clear()
+
+
+def resolve_device_key(instance: Any = None) -> str:
+    """
+    Breaker key for the device a call talks to: a page's or driver's capabilities
+    (udid, then deviceName), the parallel-mode assignment, or the configured device.
+    """
+    if instance is not None:
+        caps = getattr(getattr(instance, "driver", instance), "capabilities", None)
+        if isinstance(caps, dict):
+            device = caps.get("udid") or caps.get("deviceUDID") or caps.get("deviceName")
+            if device:
+                return str(device)
+    from drivers.device_allocator import DeviceAllocator
+    assignment = DeviceAllocator.get_assignment()
+    if assignment:
+        return assignment.device_id
+    return str(GlobalConfig.UDID or GlobalConfig.DEVICE_NAME)
+
+
+class RetryPolicy:
+    """
+    [Backoff Policy]
+    Attempt n (0-based) waits min(max_delay, base_delay * multiplier**n), reduced by up
+    to `jitter` (0..1) of itself at random so parallel workers do not retry in lockstep.
+    No attempt starts, and no sleep is taken, past `deadline` seconds from the first call.
+
+    An exception is retried if it matches `retry_on` and is not fatal. Types listed in
+    `fatal` are never retried unless the caller named them (or a parent other than
+    Exception/BaseException) in `retry_on` explicitly. `retry_if`, when given, decides
+    instead (e.g. is_outage to retry only unavailability errors).
+    `clock` and `sleep` (default time.monotonic/time.sleep) can be replaced in tests.
+    """
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 1.0, multiplier: float = 2.0,
+                 max_delay: float = 30.0, jitter: float = 0.5, deadline: Optional[float] = None,
+                 retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+                 fatal: Tuple[Type[BaseException], ...] = FATAL_EXCEPTIONS,
+                 retry_if: Optional[Callable[[BaseException], bool]] = None,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.multiplier = multiplier
+        self.max_delay = max_delay
+        self.jitter = min(max(jitter, 0.0), 1.0)
+        self.deadline = deadline
+        self.retry_on = retry_on
+        self.fatal = fatal
+        self.retry_if = retry_if
+        self.clock = clock
+        self.sleep = sleep
+        self._named = tuple(t for t in retry_on if t not in (Exception, BaseException))
+
+    def compute_delay(self, attempt: int) -> float:
+        delay = min(self.max_delay, self.base_delay * self.multiplier ** attempt)
+        if self.jitter:
+            delay *= 1 - self.jitter * random.random()
+        return delay
+
+    def should_retry(self, exc: BaseException) -> bool:
+        if self.retry_if is not None:
+            return self.retry_if(exc)
+        if not isinstance(exc, self.retry_on):
+            return False
+        return not isinstance(exc, self.fatal) or (bool(self._named) and isinstance(exc, self._named))
+
+    def call(self, func: Callable, args: Tuple = (), kwargs: Optional[Dict[str, Any]] = None, *,
+             breaker: Optional[CircuitBreaker] = None, name: Optional[str] = None) -> Any:
+        """
+        Runs func(*args, **kwargs) under the policy (and breaker, if given); re-raises
+        the last error. Arguments are passed as containers so that func may take
+        `breaker`/`name` keywords of its own.
+        """
+        kwargs = kwargs or {}
+        name = name or getattr(func, "__name__", repr(func))
+        start = self.clock()
+        for attempt in range(self.max_attempts):
+            try:
+                if breaker is None:
+                    return func(*args, **kwargs)
+                return breaker.call(func, *args, **kwargs)
+            except Exception as e:
+                if not self.should_retry(e):
+                    raise
+                if attempt + 1 >= self.max_attempts:
+                    logger.error("Function {} failed after {} attempts.", name, self.max_attempts)
+                    raise
+                delay = self.compute_delay(attempt)
+                if self.deadline is not None and self.clock() - start + delay > self.deadline:
+                    logger.error("Function {} gave up after {} attempt(s): retry deadline of {}s reached",
+                                 name, attempt + 1, self.deadline)
+                    raise
+                logger.warning("Retrying {}... ({}/{}) in {:.2f}s due to: {}",
+                               name, attempt + 1, self.max_attempts, delay, e)
+                self.sleep(delay)
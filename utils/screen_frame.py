@@ -0,0 +1,122 @@
+import struct
+import time
+from typing import Dict, Optional
+import cv2
+import numpy as np
+from utils.adb_helper import ADBHelper
+from utils.logger import logger
+
+# android.graphics.PixelFormat values emitted by `screencap` (raw mode)
+_RGBA_8888 = 1
+_RGBX_8888 = 2
+_BGRA_8888 = 5
+
+
+class ScreenFrame:
+    """
+    [Captured Frame]
+    One screen capture with lazily derived views. Raw `screencap` frames wrap the
+    adb output buffer directly (np.frombuffer, no copy); BGR, grayscale and
+    downscaled views are computed on first access and cached.
+    """
+
+    def __init__(self, rgba: Optional[np.ndarray] = None, bgr: Optional[np.ndarray] = None,
+                 channel_order: str = "RGBA"):
+        if rgba is None and bgr is None:
+            raise ValueError("ScreenFrame needs pixel data")
+        self.timestamp = time.monotonic()
+        self._raw = rgba
+        self._channel_order = channel_order
+        self._bgr = bgr
+        self._gray: Optional[np.ndarray] = None
+        self._scaled: Dict[tuple, np.ndarray] = {}
+
+    # --- Constructors ---
+    @classmethod
+    def from_raw_screencap(cls, data: bytes) -> "ScreenFrame":
+        """
+        [Raw Decode]
+        Parses `screencap` raw output: a 12-byte (pre-Android 9) or 16-byte header
+        (width, height, format[, colorspace]) followed by 4 bytes per pixel.
+        """
+        if len(data) < 12:
+            raise ValueError(f"screencap output too short ({len(data)} bytes)")
+        width, height, pixel_format = struct.unpack_from("<III", data, 0)
+        if pixel_format not in (_RGBA_8888, _RGBX_8888, _BGRA_8888):
+            raise ValueError(f"Unsupported screencap pixel format: {pixel_format}")
+        pixel_bytes = width * height * 4
+        header = len(data) - pixel_bytes
+        if header not in (12, 16):
+            raise ValueError(f"Unexpected screencap size {len(data)} for {width}x{height}")
+        pixels = np.frombuffer(data, dtype=np.uint8, count=pixel_bytes, offset=header)
+        order = "BGRA" if pixel_format == _BGRA_8888 else "RGBA"
+        return cls(rgba=pixels.reshape(height, width, 4), channel_order=order)
+
+    @classmethod
+    def from_png(cls, image_bytes: bytes) -> "ScreenFrame":
+        """[Encoded Decode] Wraps an Appium PNG screenshot."""
+        nparr = np.frombuffer(image_bytes, np.uint8)
+        return cls(bgr=cv2.imdecode(nparr, cv2.IMREAD_COLOR))
+
+    @classmethod
+    def capture_adb(cls, device_id: Optional[str] = None) -> "ScreenFrame":
+        """
+        [Raw Capture]
+        Streams an unencoded frame via `adb exec-out screencap`. Skips PNG encode on the
+        device, base64 in Appium and PNG decode on the host; the transfer is larger, so
+        it pays off most on emulators and USB 3 links.
+        """
+        data = ADBHelper.exec_out_bytes("screencap", device_id)
+        return cls.from_raw_screencap(data)
+
+    # --- Views ---
+    @property
+    def width(self) -> int:
+        return (self._raw if self._raw is not None else self._bgr).shape[1]
+
+    @property
+    def height(self) -> int:
+        return (self._raw if self._raw is not None else self._bgr).shape[0]
+
+    @property
+    def bgr(self) -> np.ndarray:
+        """BGR view for OpenCV (the format CVHelper.bytes_to_cv2 returns)."""
+        if self._bgr is None:
+            code = cv2.COLOR_BGRA2BGR if self._channel_order == "BGRA" else cv2.COLOR_RGBA2BGR
+            self._bgr = cv2.cvtColor(self._raw, code)
+        return self._bgr
+
+    @property
+    def gray(self) -> np.ndarray:
+        """Single-channel view, converted straight from the source pixels."""
+        if self._gray is None:
+            if self._raw is not None:
+                code = cv2.COLOR_BGRA2GRAY if self._channel_order == "BGRA" else cv2.COLOR_RGBA2GRAY
+                self._gray = cv2.cvtColor(self._raw, code)
+            else:
+                self._gray = cv2.cvtColor(self._bgr, cv2.COLOR_BGR2GRAY)
+        return self._gray
+
+    def downscale(self, scale: float, gray: bool = True) -> np.ndarray:
+        """Cached downscaled view (INTER_AREA), e.g. for pyramid search or frame differencing."""
+        key = (scale, gray)
+        if key not in self._scaled:
+            source = self.gray if gray else self.bgr
+            self._scaled[key] = cv2.resize(source, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        return self._scaled[key]
+
+    def __repr__(self) -> str:
+        return f"ScreenFrame({self.width}x{self.height})"
+
+
+def capture_frame(driver, backend: str = "appium", device_id: Optional[str] = None) -> ScreenFrame:
+    """
+    [Capture Entry Point]
+    backend "adb" uses raw screencap and falls back to the Appium screenshot on failure.
+    """
+    if backend == "adb":
+        try:
+            return ScreenFrame.capture_adb(device_id)
+        except Exception as e:
+            logger.warning(f"Raw adb capture failed, falling back to Appium screenshot: {e}")
+    return ScreenFrame.from_png(driver.get_screenshot_as_png())
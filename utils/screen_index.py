@@ -0,0 +1,207 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from config.global_config import GlobalConfig
+from utils.cv_helper import CVHelper
+from utils.logger import logger
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+INDEX_VERSION = 1
+
+
+def _popcount64(values: np.ndarray) -> np.ndarray:
+    """Set bits per uint64 element."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values).astype(np.int64)
+    return np.unpackbits(values.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1).astype(np.int64)
+
+
+class ScreenIndex:
+    """
+    [Screen Identification]
+    Perceptual-hash index of labelled reference screenshots. Each reference is
+    reduced to a dHash + pHash pair (128 bits); identifying the current screen is
+    one capture, two hashes and a vectorised Hamming nearest-neighbour scan.
+
+    Reference layout: `<reference_dir>/<screen_name>/*.png` (several variants per
+    screen) or `<reference_dir>/<screen_name>.png`.
+    The index persists as JSON with each file's mtime/size, so `update()` only
+    rehashes references that were added or changed. The default index file is
+    named after `reference_dir`, and an index built for another directory is ignored.
+    """
+
+    def __init__(self, reference_dir: Optional[str] = None, index_path: Optional[str] = None,
+                 region: Tuple[float, float, float, float] = (0.0, 0.05, 1.0, 1.0)):
+        """
+        :param region: Percent rectangle hashed from every image; the default skips
+                       the status bar so the clock and notification icons do not count.
+        """
+        reference_dir = reference_dir or GlobalConfig.SCREEN_INDEX_DIR
+        if not os.path.isabs(reference_dir):
+            reference_dir = str(GlobalConfig.PROJECT_ROOT / reference_dir)
+        self.reference_dir = os.path.normpath(reference_dir)
+        dir_key = hashlib.sha1(self.reference_dir.encode("utf-8")).hexdigest()[:12]
+        self.index_path = index_path or str(GlobalConfig.CACHE_DIR / f"screen_index_{dir_key}.json")
+        self.region = tuple(region)
+
+        self._entries: Dict[str, dict] = {}
+        self._labels: List[str] = []
+        self._hashes = np.zeros((0, 2), dtype=np.uint64)
+        self._lock = threading.Lock()
+        self._load()
+
+    # --- Hashing ---
+    def hash_image(self, image) -> Tuple[int, int]:
+        """[Fingerprint] (dhash, phash) of the indexed region of a path, array, bytes or ScreenFrame."""
+        gray = CVHelper.load_gray(image)
+        if gray is None:
+            raise ValueError(f"Could not read image: {image if isinstance(image, str) else type(image)}")
+        x, y, w, h = CVHelper.roi_to_rect(self.region, gray.shape[1], gray.shape[0])
+        crop = gray[y:y + h, x:x + w]
+        return CVHelper.dhash(crop), CVHelper.phash(crop)
+
+    @staticmethod
+    def _label_for(rel_path: str) -> str:
+        parts = rel_path.replace(os.sep, "/").split("/")
+        return parts[0] if len(parts) > 1 else os.path.splitext(parts[0])[0]
+
+    # --- Build / Update ---
+    def update(self) -> Dict[str, int]:
+        """
+        [Incremental Update]
+        Rescans the reference directory, rehashing only new or modified files and
+        dropping deleted ones. Saves the index when anything changed.
+        :return: Counts of added, updated, removed and unchanged references.
+        """
+        counts = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+        seen = set()
+        with self._lock:
+            for root, _, files in os.walk(self.reference_dir):
+                for file_name in sorted(files):
+                    if not file_name.lower().endswith(IMAGE_EXTENSIONS):
+                        continue
+                    path = os.path.join(root, file_name)
+                    rel_path = os.path.relpath(path, self.reference_dir)
+                    seen.add(rel_path)
+                    stat = os.stat(path)
+                    entry = self._entries.get(rel_path)
+                    if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                        counts["unchanged"] += 1
+                        continue
+                    try:
+                        dhash, phash = self.hash_image(path)
+                    except ValueError as e:
+                        logger.warning(f"Skipping reference screenshot: {e}")
+                        continue
+                    counts["updated" if entry else "added"] += 1
+                    self._entries[rel_path] = {
+                        "label": self._label_for(rel_path),
+                        "mtime_ns": stat.st_mtime_ns,
+                        "size": stat.st_size,
+                        "dhash": dhash,
+                        "phash": phash,
+                    }
+            for rel_path in set(self._entries) - seen:
+                del self._entries[rel_path]
+                counts["removed"] += 1
+            self._rebuild_arrays()
+
+        if counts["added"] or counts["updated"] or counts["removed"]:
+            self.save()
+            logger.info(f"Screen index updated: {counts} ({len(self._entries)} references)")
+        return counts
+
+    def _rebuild_arrays(self):
+        items = sorted(self._entries.items())
+        self._labels = [entry["label"] for _, entry in items]
+        self._hashes = np.array([[entry["dhash"], entry["phash"]] for _, entry in items],
+                                dtype=np.uint64).reshape(-1, 2)
+
+    # --- Lookup ---
+    def nearest(self, image, k: int = 3) -> List[Tuple[str, int]]:
+        """
+        [Nearest Neighbours]
+        Best k distinct screen labels with their combined Hamming distance (0-128).
+        """
+        if not self._labels:
+            return []
+        dhash, phash = self.hash_image(image)
+        query = np.array([dhash, phash], dtype=np.uint64)
+        distances = _popcount64(np.bitwise_xor(self._hashes, query).reshape(-1)).reshape(-1, 2).sum(axis=1)
+        best: Dict[str, int] = {}
+        for index in np.argsort(distances, kind="stable"):
+            label = self._labels[index]
+            if label not in best:
+                best[label] = int(distances[index])
+                if len(best) >= k:
+                    break
+        return list(best.items())
+
+    def identify(self, image, max_distance: Optional[int] = None) -> Optional[str]:
+        """
+        [Identify]
+        Screen label of the closest reference, or None if nothing is within max_distance.
+        """
+        max_distance = GlobalConfig.SCREEN_INDEX_MAX_DISTANCE if max_distance is None else max_distance
+        candidates = self.nearest(image, k=2)
+        if not candidates or candidates[0][1] > max_distance:
+            logger.debug(f"Screen not identified (nearest: {candidates})")
+            return None
+        logger.debug(f"Identified screen '{candidates[0][0]}' (distance {candidates[0][1]}, next: {candidates[1:]})")
+        return candidates[0][0]
+
+    @property
+    def labels(self) -> List[str]:
+        return sorted(set(self._labels))
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    # --- Persistence ---
+    def save(self):
+        """[Persist] Writes the index atomically (hashes as hex, since JSON has no uint64)."""
+        with self._lock:
+            entries = {rel: {**entry, "dhash": f"{entry['dhash']:016x}", "phash": f"{entry['phash']:016x}"}
+                       for rel, entry in self._entries.items()}
+        data = {"version": INDEX_VERSION, "reference_dir": self.reference_dir,
+                "region": list(self.region), "entries": entries}
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.index_path)
+
+    def _load(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable screen index {self.index_path}: {e}")
+            return
+        if data.get("version") != INDEX_VERSION or tuple(data.get("region", ())) != self.region:
+            logger.info("Screen index settings changed, rebuilding on next update")
+            return
+        if data.get("reference_dir") != self.reference_dir:
+            logger.info(f"Screen index {self.index_path} was built for {data.get('reference_dir')}, "
+                        f"rebuilding for {self.reference_dir} on next update")
+            return
+        for rel_path, entry in data.get("entries", {}).items():
+            self._entries[rel_path] = {**entry, "dhash": int(entry["dhash"], 16), "phash": int(entry["phash"], 16)}
+        self._rebuild_arrays()
+
+
+_screen_index: Optional[ScreenIndex] = None
+
+
+def get_screen_index() -> ScreenIndex:
+    """Process-wide ScreenIndex over GlobalConfig.SCREEN_INDEX_DIR, brought up to date on first use."""
+    global _screen_index
+    if _screen_index is None:
+        _screen_index = ScreenIndex()
+        _screen_index.update()
+    return _screen_index
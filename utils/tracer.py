@@ -0,0 +1,148 @@
+"""
+[Timeline Tracer]
+Nested spans (steps, waits, driver commands) recorded with perf_counter_ns into
+an in-memory ring buffer, flushed to one compact file per test and exported in
+Chrome trace-event format (open in https://ui.perfetto.dev or chrome://tracing).
+
+Export a run (all per-test files) or a single test:
+    python -m utils.tracer export reports/traces -o reports/trace.json
+"""
+import argparse
+import functools
+import glob
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional
+from config.global_config import GlobalConfig
+from utils.logger import logger
+
+# Event tuple layout in the buffer and the per-test files:
+# (name, category, start_ns, duration_ns, thread_id, args)
+
+
+class Tracer:
+    """
+    [Span Recorder]
+    Appending to a bounded deque is atomic under the GIL, so spans from any thread
+    are recorded without a lock; the oldest events are dropped once `capacity` is hit.
+    """
+
+    def __init__(self, capacity: int = 200_000, enabled: bool = True):
+        self.enabled = enabled
+        self._events: deque = deque(maxlen=capacity)
+        self._test_id: Optional[str] = None
+        self._test_start_ns = 0
+
+    @contextmanager
+    def span(self, name: str, category: str = "step", **args):
+        """Records the enclosed block as one complete ("X") event; nesting follows from the timings."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter_ns()
+        try:
+            yield
+        except BaseException as e:
+            args["error"] = type(e).__name__
+            raise
+        finally:
+            self._events.append((name, category, start, time.perf_counter_ns() - start,
+                                 threading.get_ident(), args or None))
+
+    def complete(self, name: str, category: str, start_ns: int, duration_ns: int, args: Optional[dict] = None):
+        """Adds an already-timed span (e.g. from instrumentation that measures anyway)."""
+        if self.enabled:
+            self._events.append((name, category, start_ns, duration_ns, threading.get_ident(), args))
+
+    def traced(self, name: Optional[str] = None, category: str = "step"):
+        """Decorator form of span()."""
+        def decorator(func):
+            span_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self.span(span_name, category):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    # --- Test scoping ---
+    def start_test(self, test_id: str):
+        self._events.clear()
+        self._test_id = test_id
+        self._test_start_ns = time.perf_counter_ns()
+
+    def flush_test(self, directory: str) -> Optional[str]:
+        """
+        Writes the test's events to `<directory>/<test>.trace.json` (compact tuples,
+        converted to Chrome format on export) and empties the buffer.
+        """
+        events = list(self._events)
+        self._events.clear()
+        if not events or self._test_id is None:
+            return None
+        safe_name = "".join(c if c.isalnum() or c in "-_." else "_" for c in self._test_id)[-150:]
+        path = os.path.join(directory, f"{safe_name}.trace.json")
+        os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"test": self._test_id, "pid": os.getpid(),
+                       "start_ns": self._test_start_ns, "events": events}, f, separators=(",", ":"))
+        self._test_id = None
+        return path
+
+
+def to_chrome_events(trace: Dict[str, Any], pid: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Converts one per-test trace into Chrome trace events (timestamps in microseconds)."""
+    pid = trace.get("pid", 0) if pid is None else pid
+    result = [{"ph": "M", "name": "process_name", "pid": pid, "tid": 0, "args": {"name": trace["test"]}}]
+    for name, category, start_ns, duration_ns, tid, args in trace["events"]:
+        event = {"ph": "X", "name": name, "cat": category, "ts": start_ns / 1000,
+                 "dur": duration_ns / 1000, "pid": pid, "tid": tid}
+        if args:
+            event["args"] = args
+        result.append(event)
+    return result
+
+
+def export_chrome(trace_files: Iterable[str], output_path: str) -> int:
+    """
+    [Export]
+    Merges per-test trace files into one Chrome trace-event JSON file. Each test
+    becomes its own process track so tests from different xdist workers line up.
+    """
+    events: List[Dict[str, Any]] = []
+    for index, path in enumerate(sorted(trace_files), start=1):
+        with open(path, "r", encoding="utf-8") as f:
+            events.extend(to_chrome_events(json.load(f), pid=index))
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, separators=(",", ":"))
+    logger.info(f"Chrome trace written: {output_path} ({len(events)} events)")
+    return len(events)
+
+
+tracer = Tracer(capacity=GlobalConfig.TRACE_BUFFER_SIZE, enabled=GlobalConfig.TRACE_ENABLED)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export per-test trace files as a Chrome trace-event file.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export_parser = sub.add_parser("export")
+    export_parser.add_argument("source", help="A .trace.json file or a directory of them")
+    export_parser.add_argument("-o", "--output", default="reports/trace.json")
+    args = parser.parse_args()
+
+    files = [args.source] if os.path.isfile(args.source) else glob.glob(os.path.join(args.source, "*.trace.json"))
+    if not files:
+        raise SystemExit(f"No trace files found in {args.source}")
+    export_chrome(files, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+import cv2
+from utils.cv_helper import CVHelper
+from utils.logger import logger
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+def _compare_pair(task: Tuple[str, str, str, float, Optional[float], Optional[str]]) -> Dict[str, Any]:
+    """
+    [Worker]
+    Compares one screenshot against its baseline. Top-level so it pickles into the
+    process pool; each image is read exactly once.
+    """
+    name, actual_path, baseline_path, threshold, downscale, diff_dir = task
+    start = time.perf_counter()
+    try:
+        score, mask = CVHelper.calculate_ssim(actual_path, baseline_path, downscale=downscale, return_diff=True)
+        passed = score >= threshold
+        result = {"name": name, "score": round(score, 5), "passed": passed}
+        if not passed and diff_dir and mask is not None:
+            diff_path = os.path.join(diff_dir, f"diff_{os.path.splitext(name)[0].replace(os.sep, '_')}.png")
+            cv2.imwrite(diff_path, mask)
+            result["diff"] = diff_path
+    except Exception as e:
+        result = {"name": name, "score": 0.0, "passed": False, "error": str(e)}
+    result["ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return result
+
+
+def _collect(directory: str) -> Dict[str, str]:
+    images = {}
+    for root, _, files in os.walk(directory):
+        for file_name in files:
+            if file_name.lower().endswith(IMAGE_EXTENSIONS):
+                path = os.path.join(root, file_name)
+                images[os.path.relpath(path, directory)] = path
+    return images
+
+
+def compare_directories(actual_dir: str, baseline_dir: str, threshold: float = 0.98,
+                        downscale: Optional[float] = 0.5, workers: Optional[int] = None,
+                        summary_path: Optional[str] = None, diff_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    [Batch Visual Regression]
+    Diffs every screenshot in `actual_dir` against the same relative path in
+    `baseline_dir` with SSIM, spread over a process pool.
+    :param threshold: Minimum SSIM for a screenshot to pass.
+    :param downscale: Factor applied before comparing (None = full resolution).
+    :param summary_path: If given, writes the compact JSON summary there.
+    :param diff_dir: If given, writes a diff mask PNG for each failing screenshot.
+    :return: Summary dict with counts and per-image results (failures first).
+    """
+    start = time.perf_counter()
+    actual = _collect(actual_dir)
+    baseline = _collect(baseline_dir)
+    if diff_dir:
+        os.makedirs(diff_dir, exist_ok=True)
+
+    tasks = [(name, path, baseline[name], threshold, downscale, diff_dir)
+             for name, path in sorted(actual.items()) if name in baseline]
+    missing_baseline = sorted(set(actual) - set(baseline))
+    missing_actual = sorted(set(baseline) - set(actual))
+
+    results: List[Dict[str, Any]] = []
+    if tasks:
+        workers = workers or os.cpu_count() or 1
+        chunksize = max(1, len(tasks) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_compare_pair, tasks, chunksize=chunksize))
+    results.sort(key=lambda r: (r["passed"], r["score"]))
+
+    failed = [r for r in results if not r["passed"]]
+    summary = {
+        "threshold": threshold,
+        "downscale": downscale,
+        "compared": len(results),
+        "passed": len(results) - len(failed),
+        "failed": len(failed),
+        "missing_baseline": missing_baseline,
+        "missing_actual": missing_actual,
+        "duration_s": round(time.perf_counter() - start, 2),
+        "results": results,
+    }
+    logger.info(f"Visual regression: {summary['passed']}/{summary['compared']} passed, "
+                f"{len(missing_baseline)} without baseline ({summary['duration_s']}s)")
+
+    if summary_path:
+        os.makedirs(os.path.dirname(os.path.abspath(summary_path)), exist_ok=True)
+        with open(summary_path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, separators=(",", ":"))
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare a screenshot directory against baselines (SSIM).")
+    parser.add_argument("actual_dir")
+    parser.add_argument("baseline_dir")
+    parser.add_argument("--threshold", type=float, default=0.98)
+    parser.add_argument("--downscale", type=float, default=0.5)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--summary", default="reports/visual_summary.json")
+    parser.add_argument("--diff-dir", default=None)
+    args = parser.parse_args()
+
+    summary = compare_directories(args.actual_dir, args.baseline_dir, args.threshold, args.downscale,
+                                  args.workers, args.summary, args.diff_dir)
+    raise SystemExit(1 if summary["failed"] or summary["missing_baseline"] else 0)
+
+
+if __name__ == "__main__":
+    main()
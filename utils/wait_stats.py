@@ -0,0 +1,206 @@
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+from config.global_config import GlobalConfig
+from utils.file_helper import FileHelper
+from utils.logger import logger
+
+
+def _percentile(sorted_samples: List[float], pct: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    index = min(int(round(pct / 100 * (len(sorted_samples) - 1))), len(sorted_samples) - 1)
+    return sorted_samples[index]
+
+
+class WaitStats:
+    """
+    [Adaptive Wait]
+    Records how long each locator took to appear, per page class and device,
+    and derives a poll interval and fail-fast timeout from those latencies:
+        timeout = clamp(p99 * safety_factor, min_timeout, max_timeout)
+        poll    = clamp(p50 / 4, min_poll, max_poll)
+    Misses under the learned timeout keep the samples, since optional elements
+    (popups, banners) are often legitimately absent. After `miss_streak` consecutive
+    misses the locator may have got slower, so the timeout doubles with every further
+    miss (up to max_timeout) until it appears again. Miss streaks are per process.
+    Stats persist as JSON between runs; new samples are merged into the file on save,
+    under a lock file so parallel workers do not overwrite each other.
+    """
+
+    MAX_SAMPLES = 200
+
+    def __init__(self, path: str, min_samples: int = 5, safety_factor: float = 2.0,
+                 min_timeout: float = 2.0, max_timeout: float = 20.0,
+                 min_poll: float = 0.05, max_poll: float = 0.5, miss_streak: int = 3):
+        self.path = path
+        self.min_samples = min_samples
+        self.safety_factor = safety_factor
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.min_poll = min_poll
+        self.max_poll = max_poll
+        self.miss_streak = miss_streak
+
+        self._samples: Dict[str, List[float]] = {}
+        self._misses: Dict[str, int] = {}
+        self._new_samples: Dict[str, List[float]] = {}
+        self._new_misses: Dict[str, int] = {}
+        self._streaks: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def make_key(page: str, device: str, locator: tuple) -> str:
+        return f"{page}|{device}|{locator[0]}={locator[1]}"
+
+    def record(self, page: str, device: str, locator: tuple, seconds: float):
+        """[Sample] Stores how long the locator took to appear."""
+        key = self.make_key(page, device, locator)
+        with self._lock:
+            samples = self._samples.setdefault(key, [])
+            samples.append(seconds)
+            del samples[:-self.MAX_SAMPLES]
+            self._new_samples.setdefault(key, []).append(seconds)
+            self._streaks.pop(key, None)
+
+    def record_miss(self, page: str, device: str, locator: tuple, learned: bool = True):
+        """
+        [Miss] Counts a timeout. With `learned` (the wait used the learned timeout),
+        it also extends the locator's streak of consecutive misses.
+        """
+        key = self.make_key(page, device, locator)
+        with self._lock:
+            self._misses[key] = self._misses.get(key, 0) + 1
+            self._new_misses[key] = self._new_misses.get(key, 0) + 1
+            if learned:
+                self._streaks[key] = self._streaks.get(key, 0) + 1
+
+    def get_wait(self, page: str, device: str, locator: tuple) -> Tuple[float, float]:
+        """
+        [Strategy]
+        Returns (timeout, poll_interval). Falls back to (max_timeout, max_poll)
+        until the locator has min_samples recorded appearances.
+        """
+        key = self.make_key(page, device, locator)
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+            streak = self._streaks.get(key, 0)
+        if len(samples) < self.min_samples:
+            return self.max_timeout, self.max_poll
+        timeout, poll = self._derive(samples)
+        if streak >= self.miss_streak:
+            timeout = min(timeout * 2 ** (streak - self.miss_streak + 1), self.max_timeout)
+        return timeout, poll
+
+    def _derive(self, sorted_samples: List[float]) -> Tuple[float, float]:
+        timeout = _percentile(sorted_samples, 99) * self.safety_factor
+        poll = _percentile(sorted_samples, 50) / 4
+        return (min(max(timeout, self.min_timeout), self.max_timeout),
+                min(max(poll, self.min_poll), self.max_poll))
+
+    def report(self) -> Dict[str, dict]:
+        """[Report] Learned stats per page/device/locator."""
+        with self._lock:
+            keys = set(self._samples) | set(self._misses)
+            snapshot = {k: sorted(self._samples.get(k, ())) for k in keys}
+            misses = dict(self._misses)
+            streaks = dict(self._streaks)
+        result = {}
+        for key, samples in sorted(snapshot.items()):
+            page, device, locator = key.split("|", 2)
+            timeout, poll = self._derive(samples) if len(samples) >= self.min_samples else (None, None)
+            result[key] = {
+                "page": page,
+                "device": device,
+                "locator": locator,
+                "samples": len(samples),
+                "misses": misses.get(key, 0),
+                "miss_streak": streaks.get(key, 0),
+                "p50": round(_percentile(samples, 50), 3),
+                "p95": round(_percentile(samples, 95), 3),
+                "p99": round(_percentile(samples, 99), 3),
+                "max": round(samples[-1], 3) if samples else 0.0,
+                "timeout": round(timeout, 3) if timeout else None,
+                "poll_interval": round(poll, 3) if poll else None,
+            }
+        return result
+
+    def write_report(self, report_path: str):
+        os.makedirs(os.path.dirname(report_path), exist_ok=True)
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+        logger.info(f"Wait stats report written: {report_path}")
+
+    def save(self):
+        """
+        [Persist]
+        Merges this process's new samples into the stats file (other pytest workers
+        may have saved in the meantime) and writes it atomically. The read-merge-write
+        runs under a lock file; if it cannot be taken, the samples wait for the next save.
+        """
+        with self._lock:
+            new_samples, self._new_samples = self._new_samples, {}
+            new_misses, self._new_misses = self._new_misses, {}
+        if not new_samples and not new_misses:
+            return
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        try:
+            with FileHelper.file_lock(self.path + ".lock"):
+                self._merge_into_file(new_samples, new_misses)
+        except TimeoutError as e:
+            logger.warning(f"Wait stats not saved this time: {e}")
+            with self._lock:
+                for key, values in new_samples.items():
+                    self._new_samples[key] = values + self._new_samples.get(key, [])
+                for key, count in new_misses.items():
+                    self._new_misses[key] = self._new_misses.get(key, 0) + count
+
+    def _merge_into_file(self, new_samples: Dict[str, List[float]], new_misses: Dict[str, int]):
+        stored = self._read_file()
+        for key, values in new_samples.items():
+            entry = stored.setdefault(key, {"samples": [], "misses": 0})
+            entry["samples"] = (entry["samples"] + values)[-self.MAX_SAMPLES:]
+        for key, count in new_misses.items():
+            entry = stored.setdefault(key, {"samples": [], "misses": 0})
+            entry["misses"] += count
+
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(stored, f)
+        os.replace(tmp_path, self.path)
+
+    def _read_file(self) -> Dict[str, dict]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable wait stats file {self.path}: {e}")
+            return {}
+
+    def _load(self):
+        for key, entry in self._read_file().items():
+            self._samples[key] = list(entry.get("samples", []))[-self.MAX_SAMPLES:]
+            self._misses[key] = int(entry.get("misses", 0))
+
+
+_wait_stats: Optional[WaitStats] = None
+
+
+def get_wait_stats() -> WaitStats:
+    """Process-wide WaitStats configured from GlobalConfig."""
+    global _wait_stats
+    if _wait_stats is None:
+        _wait_stats = WaitStats(
+            path=str(GlobalConfig.CACHE_DIR / "wait_stats.json"),
+            min_samples=GlobalConfig.ADAPTIVE_WAIT_MIN_SAMPLES,
+            safety_factor=GlobalConfig.ADAPTIVE_WAIT_SAFETY_FACTOR,
+            min_timeout=GlobalConfig.ADAPTIVE_WAIT_MIN_TIMEOUT,
+            max_timeout=GlobalConfig.EXPLICIT_WAIT,
+            miss_streak=GlobalConfig.ADAPTIVE_WAIT_MISS_STREAK,
+        )
+    return _wait_stats
@@ -1,6 +1,15 @@
 from selenium.webdriver.remote.webdriver import WebDriver
 from utils.logger import logger
+from utils.tracer import tracer
 
 class BaseWorkflow:
     def __init__(self, driver: WebDriver):
-        self.driver = driver
\ No newline at end of file
+        self.driver = driver
+
+    def step(self, name: str):
+        """
+        Marks a workflow step: a named span in the test timeline around the block.
+        Usage: with self.step("Login as VIP"): ...
+        """
+        logger.info("[WORKFLOW] {}", name)
+        return tracer.span(f"{type(self).__name__}: {name}", "workflow")